@@ -0,0 +1,76 @@
+"""Synthetic GradeVision datasets for benchmarks.
+
+    python benchmarks/generate.py --courses 500 --assignments 10 --students 200 -o grades.csv
+"""
+import argparse
+
+import numpy as np
+
+
+def generate_dataset(courses=100, assignments=10, students=0, missing_ratio=0.1, seed=0):
+    """Return a grade DataFrame in the CSV layout DataManager loads.
+
+    Every student takes every course, and every course has ``assignments``
+    assignments whose weights sum to 100. With ``students=0`` there is no
+    student_id column (single-student file). A ``missing_ratio`` share of
+    scores is left ungraded (NaN).
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    segments = courses * max(students, 1)
+    rows = segments * assignments
+
+    course_index = np.tile(np.repeat(np.arange(courses), assignments), max(students, 1))
+    assignment_index = np.tile(np.arange(assignments), segments)
+    course_names = np.array([f'COURSE {i:05d}' for i in range(courses)], dtype=object)
+    assignment_names = np.array([f'Assignment {i}' for i in range(assignments)], dtype=object)
+
+    max_score = rng.choice([10.0, 20.0, 50.0, 100.0], size=rows)
+    score = np.round(max_score * rng.beta(5, 1.5, size=rows), 1)
+    score[rng.random(rows) < missing_ratio] = np.nan
+
+    data = {}
+    if students:
+        student_index = np.repeat(np.arange(students), courses * assignments)
+        data['student_id'] = np.array([f'S{i:06d}' for i in range(students)], dtype=object)[student_index]
+    data['course'] = course_names[course_index]
+    data['assignment'] = assignment_names[assignment_index]
+    data['weight'] = np.full(rows, 100.0 / assignments)
+    data['score'] = score
+    data['max_score'] = max_score
+    return pd.DataFrame(data)
+
+
+def write_dataset(filename, **params):
+    df = generate_dataset(**params)
+    df.to_csv(filename, index=False)
+    return len(df)
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--courses', type=int, default=100, help='distinct courses')
+    parser.add_argument('--assignments', type=int, default=10, help='assignments per course')
+    parser.add_argument('--students', type=int, default=0,
+                        help='students taking every course (0: single-student file)')
+    parser.add_argument('--missing', type=float, default=0.1, dest='missing_ratio',
+                        help='share of ungraded scores')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def dataset_params(args):
+    return {'courses': args.courses, 'assignments': args.assignments, 'students': args.students,
+            'missing_ratio': args.missing_ratio, 'seed': args.seed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic grade CSV.')
+    add_dataset_arguments(parser)
+    parser.add_argument('-o', '--output', default='grade_data.csv')
+    args = parser.parse_args(argv)
+    rows = write_dataset(args.output, **dataset_params(args))
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Benchmarks for the load, calculate, save and render hot paths.
+
+    python benchmarks/run_benchmarks.py --courses 2000 --students 20 -o after.json
+    python benchmarks/run_benchmarks.py --courses 2000 --students 20 --compare before.json
+
+Each benchmark is timed ``--repeat`` times and reports throughput (items
+per second at the median), p50/p95/p99 latency and the peak memory
+allocated during one extra run (measured separately under tracemalloc so
+it does not skew the timings). ``--compare`` flags benchmarks whose median
+is slower than in an earlier JSON report by more than ``--threshold``.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from generate import add_dataset_arguments, dataset_params, write_dataset
+
+# Median slowdown (0.2 = 20%) beyond which --compare reports a regression
+DEFAULT_THRESHOLD = 0.2
+CHART_TYPES = ('course_grades', 'assignment_performance', 'grade_distribution',
+               'weight_distribution', 'gpa')
+
+
+def measure(function, items, repeat=5, memory=True):
+    """Time ``function()`` ``repeat`` times; ``items`` is the work per call"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    result = {
+        'items': items,
+        'repeat': repeat,
+        'p50_ms': float(np.percentile(timings, 50)) * 1000,
+        'p95_ms': float(np.percentile(timings, 95)) * 1000,
+        'p99_ms': float(np.percentile(timings, 99)) * 1000,
+    }
+    median = result['p50_ms'] / 1000
+    result['throughput'] = items / median if median > 0 else float('inf')
+
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(csv_file, repeat=5, charts=CHART_TYPES, memory=True, all_courses=False):
+    """Run every benchmark against ``csv_file``; returns {name: result}.
+    
+    Charts that can be limited to one course are drawn for the first course,
+    as the UI does, unless ``all_courses`` is set.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from data_manager import DataManager
+    from grade_calculator import GradeCalculator
+    from visualizer import COURSE_PLOT_TYPES, GradeVisualizer
+
+    dm = DataManager()
+    dm.load_from_csv(csv_file)
+    rows = dm.store.num_rows
+    courses = list(dm.courses)
+    results = {}
+
+    def load():
+        DataManager().load_from_csv(csv_file)
+    results['load_from_csv'] = measure(load, rows, repeat, memory)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, 'out.csv')
+        results['save_to_csv'] = measure(lambda: dm.save_to_csv(output), rows, repeat, memory)
+
+    def course_grades():
+        for course in courses:
+            GradeCalculator.calculate_course_grade(course['assignments'])
+    results['calculate_course_grade'] = measure(course_grades, len(courses), repeat, memory)
+    results['calculate_course_grades_batch'] = measure(
+        lambda: GradeCalculator.calculate_course_grades_batch(dm), len(courses), repeat, memory)
+    results['calculate_gpa'] = measure(
+        lambda: GradeCalculator.calculate_gpa(courses), len(courses), repeat, memory)
+    results['calculate_gpa_batch'] = measure(
+        lambda: GradeCalculator.calculate_gpa_batch(dm), len(courses), repeat, memory)
+
+    figure = Figure(figsize=(10, 6), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    first_course = courses[0]['name'] if courses else None
+    for viz_type in charts:
+        course_name = first_course if viz_type in COURSE_PLOT_TYPES and not all_courses else None
+        def render(viz_type=viz_type, course_name=course_name):
+            GradeVisualizer.plot(viz_type, dm, course_name, figure)
+            canvas.draw()
+        results[f'plot_{viz_type}'] = measure(render, 1, repeat, memory)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (name, baseline p50, current p50, ratio) for every regression"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None or before['p50_ms'] <= 0:
+            continue
+        ratio = result['p50_ms'] / before['p50_ms']
+        if ratio > 1 + threshold:
+            regressions.append((name, before['p50_ms'], result['p50_ms'], ratio))
+    return regressions
+
+
+def format_results(results):
+    lines = [f"{'benchmark':34} {'items/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak MiB':>9}"]
+    for name, result in results.items():
+        peak = result.get('peak_memory_bytes')
+        peak = f"{peak / 2**20:9.1f}" if peak is not None else f"{'-':>9}"
+        lines.append(f"{name:34} {result['throughput']:12.1f} {result['p50_ms']:10.2f} "
+                     f"{result['p95_ms']:10.2f} {result['p99_ms']:10.2f} {peak}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark GradeVision hot paths.')
+    add_dataset_arguments(parser)
+    parser.add_argument('--data', help='benchmark an existing CSV instead of generating one')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark')
+    parser.add_argument('--charts', nargs='*', choices=CHART_TYPES, default=list(CHART_TYPES))
+    parser.add_argument('--all-courses', action='store_true',
+                        help='draw per-course charts over every course (slow on large data)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc peak memory run')
+    parser.add_argument('-o', '--output', help='write the report as JSON')
+    parser.add_argument('--compare', help='earlier JSON report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed median slowdown before flagging (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.data:
+            csv_file, params = args.data, {'data': args.data}
+        else:
+            csv_file, params = os.path.join(temp_dir, 'grades.csv'), dataset_params(args)
+            write_dataset(csv_file, **params)
+        # Keep DataManager's load/save messages out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_suite(csv_file, args.repeat, args.charts, args.memory, args.all_courses)
+
+    report = {'params': params, 'python': platform.python_version(),
+              'machine': platform.machine(), 'results': results}
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: p50 {before:.2f} ms -> {after:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
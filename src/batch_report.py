@@ -0,0 +1,175 @@
+"""Headless batch rendering of GradeVisualizer charts.
+
+Renders the chosen chart types for every course or every student to image
+files without the UI, e.g.::
+
+    python src/batch_report.py grade_data.csv --by student --format pdf -o reports
+    python src/batch_report.py grade_data.csv --grading data/grading_scales.json
+
+The dataset is loaded once; worker processes open it as a memory-mapped
+snapshot (written to a temporary file unless the input already is one) and
+each worker reuses a single Agg figure for every chart it draws.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_manager import DataManager
+from process_pool import spawn_pool
+from snapshot import SNAPSHOT_EXTENSION, open_snapshot
+from visualizer import COURSE_PLOT_TYPES, GradeVisualizer
+
+# Chart types available per report subject; course charts are limited to
+# one course, student charts are drawn over one student's courses. The
+# simulated outlook is left out: it would start a process pool per worker.
+COURSE_CHARTS = tuple(chart for chart in COURSE_PLOT_TYPES if chart != 'grade_simulation')
+STUDENT_CHARTS = ('course_grades', 'assignment_performance', 'grade_distribution',
+                  'weight_distribution', 'gpa')
+DEFAULT_STUDENT_CHARTS = ('course_grades', 'grade_distribution', 'gpa')
+FORMATS = ('png', 'svg', 'pdf')
+# Courses or students handed to a worker per task
+BATCH_SIZE = 16
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _safe_filename(name):
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or 'unnamed'
+
+
+def _student_data(data_manager, student_id):
+    """DataManager holding only one student's courses"""
+    subset = DataManager()
+    subset.grading = data_manager.grading
+    for course in data_manager.get_student_courses(student_id):
+        subset.add_course(course['name'], course['assignments'])
+    return subset
+
+
+def _init_worker(snapshot, by, charts, output_dir, file_format, figsize, dpi, grading=None):
+    data_manager = DataManager()
+    data_manager.store = open_snapshot(snapshot)
+    if grading is not None:
+        data_manager.set_grading(grading)
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    _worker.update(data_manager=data_manager, by=by, charts=charts, output_dir=output_dir,
+                   file_format=file_format, figure=figure)
+
+
+def _render_batch(names):
+    """Render every chart for ``names``; returns (files written, failures)"""
+    data_manager, figure = _worker['data_manager'], _worker['figure']
+    written = 0
+    failures = []
+
+    for name in names:
+        if _worker['by'] == 'course':
+            data, course_name = data_manager, name
+        else:
+            data, course_name = _student_data(data_manager, name), None
+
+        for viz_type in _worker['charts']:
+            path = os.path.join(_worker['output_dir'],
+                                f"{_safe_filename(name)}_{viz_type}.{_worker['file_format']}")
+            try:
+                GradeVisualizer.plot(viz_type, data, course_name, figure)
+                figure.savefig(path, format=_worker['file_format'])
+                written += 1
+            except Exception as e:
+                failures.append((name, viz_type, str(e)))
+    return written, failures
+
+
+def render_reports(filename, output_dir, by='course', charts=None, file_format='png',
+                   workers=None, figsize=(10, 6), dpi=100, grading=None):
+    """Render charts for every course (``by='course'``) or student to ``output_dir``.
+
+    ``workers`` is the number of processes (default: all cores); 1 renders
+    in this process. ``grading`` names a grading scales JSON file to grade
+    courses with. Returns (number of files written, list of
+    (name, chart, error) failures), or None if the data or grading scales
+    could not be loaded or ``by='student'`` data has no student ids.
+    """
+    if charts is None:
+        charts = COURSE_CHARTS if by == 'course' else DEFAULT_STUDENT_CHARTS
+
+    data_manager = DataManager()
+    if grading is not None and not data_manager.load_grading(grading):
+        return None
+    if not data_manager.load(filename):
+        return None
+    policy = data_manager.grading if grading is not None else None
+    if by == 'course':
+        names = list(dict.fromkeys(data_manager.get_course_names()))
+    else:
+        names = data_manager.get_student_ids()
+        if not names:
+            print(f"{filename} has no student ids; use --by course")
+            return None
+    os.makedirs(output_dir, exist_ok=True)
+    batches = [names[i:i + BATCH_SIZE] for i in range(0, len(names), BATCH_SIZE)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if os.path.splitext(filename)[1].lower() == SNAPSHOT_EXTENSION:
+            snapshot = filename
+        else:
+            snapshot = os.path.join(temp_dir, 'data' + SNAPSHOT_EXTENSION)
+            data_manager.save_snapshot(snapshot)
+        initargs = (snapshot, by, tuple(charts), output_dir, file_format, figsize, dpi, policy)
+
+        if workers == 1:
+            _init_worker(*initargs)
+            results = [_render_batch(batch) for batch in batches]
+        else:
+            with spawn_pool(workers, initializer=_init_worker, initargs=initargs) as executor:
+                results = list(executor.map(_render_batch, batches))
+
+    written = sum(count for count, _ in results)
+    failures = [failure for _, batch_failures in results for failure in batch_failures]
+    return written, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render GradeVision charts for every course or student.')
+    parser.add_argument('data', help='CSV, binary (.npz/.parquet/.feather) or snapshot (.gvs) file')
+    parser.add_argument('-o', '--output-dir', default='reports', help='directory for the chart files')
+    parser.add_argument('--by', choices=('course', 'student'), default='course',
+                        help='render charts per course or per student')
+    parser.add_argument('--charts', nargs='+', choices=STUDENT_CHARTS,
+                        help='chart types to render (default depends on --by)')
+    parser.add_argument('--format', dest='file_format', choices=FORMATS, default='png')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--grading', help='grading scales JSON file (default: the built-in scale)')
+    args = parser.parse_args(argv)
+
+    if args.by == 'course' and args.charts:
+        invalid = [chart for chart in args.charts if chart not in COURSE_CHARTS]
+        if invalid:
+            parser.error(f"per-course charts must be among {', '.join(COURSE_CHARTS)}")
+
+    result = render_reports(args.data, args.output_dir, args.by, args.charts,
+                            args.file_format, args.workers, dpi=args.dpi, grading=args.grading)
+    if result is None:
+        return 1
+
+    written, failures = result
+    for name, viz_type, error in failures:
+        print(f"Failed to render {viz_type} for {name}: {error}")
+    print(f"Rendered {written} charts to {args.output_dir}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
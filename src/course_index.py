@@ -0,0 +1,51 @@
+from bisect import bisect_left
+
+import numpy as np
+
+# Matches returned when no limit is given
+DEFAULT_MATCH_LIMIT = 50
+
+
+class CoursePrefixIndex:
+    """Case-insensitive type-ahead lookup over course names.
+
+    Every name is indexed under its full text and under each word after
+    the first, so "37" finds "CPSC 3720" as well as "3720 Seminar". Keys
+    are kept in one sorted list and a query is two binary searches plus
+    a slice, whatever the number of courses.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(set(names), key=lambda name: (name.casefold(), name))
+        entries = []
+        for index, name in enumerate(self.names):
+            folded = name.casefold()
+            entries.append((folded, index))
+            start = folded.find(' ')
+            while start != -1:
+                if start + 1 < len(folded) and folded[start + 1] != ' ':
+                    entries.append((folded[start + 1:], index))
+                start = folded.find(' ', start + 1)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = np.array([index for _, index in entries], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _range(self, prefix):
+        prefix = prefix.lstrip().casefold()
+        low = bisect_left(self._keys, prefix)
+        # Every key starting with prefix sorts below prefix + the last code point
+        high = bisect_left(self._keys, prefix + '\U0010ffff', low)
+        return low, high
+
+    def matches(self, prefix, limit=DEFAULT_MATCH_LIMIT):
+        """Return up to ``limit`` names with a word starting with ``prefix``,
+        in name order, and how many names match in total"""
+        if not prefix.strip():
+            return self.names[:limit], len(self.names)
+
+        low, high = self._range(prefix)
+        ids = np.unique(self._ids[low:high])
+        return [self.names[index] for index in ids[:limit].tolist()], len(ids)
@@ -0,0 +1,389 @@
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class CourseStore:
+    """Columnar backing store for course and assignment data.
+
+    Assignment rows are kept grouped by course: the rows of course ``i`` are
+    ``offsets[i]:offsets[i + 1]`` in every per-row array. Course and assignment
+    names are dictionary-encoded into integer codes, and ungraded scores are
+    stored as NaN.
+
+    For multi-student datasets each course segment also carries a student
+    code; segments without a student have code -1.
+    """
+
+    def __init__(self):
+        self.course_table = []
+        self.assignment_table = []
+        self.student_table = []
+        self._course_lookup = {}
+        self._assignment_lookup = {}
+        self._student_lookup = {}
+        # Name lookups, built on first use by _build_index and dropped when
+        # courses are appended: segments sorted by course code with each
+        # code's start in that order, and the sorted (course, student) keys
+        # with the first segment of each
+        self._segment_order = None
+        self._code_starts = None
+        self._pair_keys = None
+        self._pair_segments = None
+
+        self._course_codes = np.empty(0, dtype=np.int32)
+        self._student_codes = np.empty(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._assignment_codes = np.empty(0, dtype=np.int32)
+        self._weight = np.empty(0, dtype=np.float64)
+        self._score = np.empty(0, dtype=np.float64)
+        self._max_score = np.empty(0, dtype=np.float64)
+
+        # Courses added one at a time are buffered and concatenated on first
+        # column access so that repeated add_course calls stay linear.
+        self._pending = []
+
+    def __len__(self):
+        return len(self._course_codes) + len(self._pending)
+
+    @classmethod
+    def from_columns(cls, course_table, assignment_table, student_table, course_codes,
+                     student_codes, offsets, assignment_codes, weight, score, max_score):
+        """Build a store around existing column arrays without copying them.
+
+        The arrays may be read-only or memory-mapped; they are only replaced
+        (never written in place) when courses are appended. Nothing is read
+        from them until a lookup needs it.
+        """
+        store = cls()
+        for name in course_table:
+            store.intern_course(name)
+        for name in assignment_table:
+            store.intern_assignment(name)
+        for student_id in student_table:
+            store.intern_student(student_id)
+
+        store._course_codes = course_codes
+        store._student_codes = student_codes
+        store._offsets = offsets
+        store._assignment_codes = assignment_codes
+        store._weight = weight
+        store._score = score
+        store._max_score = max_score
+        return store
+
+    @property
+    def num_rows(self):
+        return int(self.offsets[-1])
+
+    @property
+    def course_codes(self):
+        self._flush()
+        return self._course_codes
+
+    @property
+    def student_codes(self):
+        self._flush()
+        return self._student_codes
+
+    @property
+    def has_students(self):
+        return len(self.student_table) > 0
+
+    @property
+    def offsets(self):
+        self._flush()
+        return self._offsets
+
+    @property
+    def assignment_codes(self):
+        self._flush()
+        return self._assignment_codes
+
+    @property
+    def weight(self):
+        self._flush()
+        return self._weight
+
+    @property
+    def score(self):
+        self._flush()
+        return self._score
+
+    @property
+    def max_score(self):
+        self._flush()
+        return self._max_score
+
+    def clear(self):
+        self.__init__()
+
+    def course_code(self, name):
+        return self._course_lookup.get(name)
+
+    def _build_index(self):
+        codes = self.course_codes
+        self._segment_order = np.argsort(codes, kind='stable')
+        self._code_starts = np.searchsorted(codes[self._segment_order], np.arange(len(self.course_table) + 1))
+        keys = self._pair_key(codes, self.student_codes)
+        self._pair_keys, self._pair_segments = np.unique(keys, return_index=True)
+
+    def _pair_key(self, course_codes, student_codes):
+        # Student codes start at -1, so shift them to be non-negative
+        return np.asarray(course_codes, dtype=np.int64) * (len(self.student_table) + 1) + student_codes + 1
+
+    def _drop_index(self):
+        self._segment_order = None
+        self._code_starts = None
+        self._pair_keys = None
+        self._pair_segments = None
+
+    def _segment_range(self, name):
+        """(start, stop) of the segments named ``name`` in the sorted segment order"""
+        code = self._course_lookup.get(name)
+        if self._segment_order is None:
+            self._build_index()
+        if code is None or code + 1 >= len(self._code_starts):
+            return 0, 0
+        return int(self._code_starts[code]), int(self._code_starts[code + 1])
+
+    def segments_for(self, name):
+        """Return the indices of every course segment named ``name``."""
+        start, stop = self._segment_range(name)
+        return self._segment_order[start:stop].tolist()
+
+    def first_segment(self, name):
+        """Return the first course segment named ``name``, or None."""
+        start, stop = self._segment_range(name)
+        return int(self._segment_order[start]) if start < stop else None
+
+    def find_segment(self, name, student_id=None):
+        """Return the first course segment named ``name`` belonging to
+        ``student_id`` (None: the segment without a student), or None."""
+        code = self._course_lookup.get(name)
+        student_code = -1 if student_id is None else self._student_lookup.get(student_id)
+        if code is None or student_code is None:
+            return None
+        if self._pair_keys is None:
+            self._build_index()
+        key = self._pair_key(code, student_code)
+        position = int(np.searchsorted(self._pair_keys, key))
+        if position < len(self._pair_keys) and self._pair_keys[position] == key:
+            return int(self._pair_segments[position])
+        return None
+
+    def segment_rows(self, segment):
+        """Return the (start, stop) row range of course segment ``segment``."""
+        offsets = self.offsets
+        return int(offsets[segment]), int(offsets[segment + 1])
+
+    def intern_course(self, name):
+        code = self._course_lookup.get(name)
+        if code is None:
+            code = len(self.course_table)
+            self.course_table.append(name)
+            self._course_lookup[name] = code
+        return code
+
+    def intern_student(self, student_id):
+        code = self._student_lookup.get(student_id)
+        if code is None:
+            code = len(self.student_table)
+            self.student_table.append(student_id)
+            self._student_lookup[student_id] = code
+        return code
+
+    def student_code(self, student_id):
+        return self._student_lookup.get(student_id)
+
+    def intern_assignment(self, name):
+        code = self._assignment_lookup.get(name)
+        if code is None:
+            code = len(self.assignment_table)
+            self.assignment_table.append(name)
+            self._assignment_lookup[name] = code
+        return code
+
+    def append_course(self, course_name, assignments, student_id=None):
+        """Append one course given as a list of assignment dicts."""
+        n = len(assignments)
+        assignment_codes = np.empty(n, dtype=np.int32)
+        weight = np.empty(n, dtype=np.float64)
+        score = np.empty(n, dtype=np.float64)
+        max_score = np.empty(n, dtype=np.float64)
+
+        for i, assignment in enumerate(assignments):
+            assignment_codes[i] = self.intern_assignment(assignment['name'])
+            weight[i] = assignment['weight']
+            score[i] = np.nan if assignment['score'] is None else assignment['score']
+            max_score[i] = assignment['max_score']
+
+        student_code = -1 if student_id is None else self.intern_student(student_id)
+        course_code = self.intern_course(course_name)
+        self._drop_index()
+        self._pending.append((course_code, assignment_codes,
+                              weight, score, max_score, student_code))
+
+    def extend_columns(self, course_codes, course_names, counts, assignment_codes,
+                       assignment_names, weight, score, max_score,
+                       student_codes=None, student_ids=None):
+        """Append many courses at once from columns already grouped by course.
+
+        ``course_codes`` and ``counts`` give the course and row count of each
+        new course segment, in row order. Code columns index into the caller's
+        name tables (``course_names``, ``assignment_names``, ``student_ids``)
+        and are re-coded against this store's tables; a student code of -1
+        means the segment has no student.
+        """
+        self._flush()
+
+        course_remap = self._remap(self.intern_course, course_names)
+        assignment_remap = self._remap(self.intern_assignment, assignment_names)
+        counts = np.asarray(counts, dtype=np.int64)
+
+        if student_codes is None:
+            new_students = np.full(len(counts), -1, dtype=np.int32)
+        else:
+            # Append -1 so that code -1 indexes to itself
+            student_remap = np.append(self._remap(self.intern_student, student_ids), -1)
+            new_students = student_remap[student_codes]
+
+        new_courses = course_remap[course_codes]
+        self._drop_index()
+        self._course_codes = np.concatenate([self._course_codes, new_courses])
+        self._student_codes = np.concatenate([self._student_codes, new_students.astype(np.int32)])
+        self._offsets = np.concatenate([self._offsets, self._offsets[-1] + np.cumsum(counts)])
+        self._assignment_codes = np.concatenate(
+            [self._assignment_codes, assignment_remap[assignment_codes]])
+        self._weight = np.concatenate([self._weight, np.asarray(weight, dtype=np.float64)])
+        self._score = np.concatenate([self._score, np.asarray(score, dtype=np.float64)])
+        self._max_score = np.concatenate([self._max_score, np.asarray(max_score, dtype=np.float64)])
+
+    @staticmethod
+    def _remap(intern, names):
+        return np.array([intern(name) for name in names], dtype=np.int32)
+
+    def _flush(self):
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+
+        lengths = np.array([len(p[1]) for p in pending], dtype=np.int64)
+        self._course_codes = np.concatenate(
+            [self._course_codes, np.array([p[0] for p in pending], dtype=np.int32)])
+        self._student_codes = np.concatenate(
+            [self._student_codes, np.array([p[5] for p in pending], dtype=np.int32)])
+        self._offsets = np.concatenate(
+            [self._offsets, self._offsets[-1] + np.cumsum(lengths)])
+        self._assignment_codes = np.concatenate([self._assignment_codes] + [p[1] for p in pending])
+        self._weight = np.concatenate([self._weight] + [p[2] for p in pending])
+        self._score = np.concatenate([self._score] + [p[3] for p in pending])
+        self._max_score = np.concatenate([self._max_score] + [p[4] for p in pending])
+
+    def row_course_index(self):
+        """Return the course (segment) index of every assignment row."""
+        offsets = self.offsets
+        return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    def course_name(self, index):
+        return self.course_table[self.course_codes[index]]
+
+    def find_row(self, segment, assignment_name):
+        """Return the row of the first assignment named ``assignment_name`` in
+        course segment ``segment``, or None."""
+        code = self._assignment_lookup.get(assignment_name)
+        if code is None:
+            return None
+        start, stop = self.segment_rows(segment)
+        matches = np.flatnonzero(self.assignment_codes[start:stop] == code)
+        return start + int(matches[0]) if len(matches) else None
+
+    def insert_row(self, segment, assignment):
+        """Append an assignment dict to the end of course segment ``segment``.
+
+        np.insert copies every row column, so this costs O(total rows).
+        """
+        row = self.segment_rows(segment)[1]
+        score = np.nan if assignment['score'] is None else assignment['score']
+        self._assignment_codes = np.insert(self._assignment_codes, row,
+                                           self.intern_assignment(assignment['name']))
+        self._weight = np.insert(self._weight, row, assignment['weight'])
+        self._score = np.insert(self._score, row, score)
+        self._max_score = np.insert(self._max_score, row, assignment['max_score'])
+        self._offsets = self._offsets.copy()
+        self._offsets[segment + 1:] += 1
+        return row
+
+    def delete_row(self, segment, row):
+        """Remove ``row`` from course segment ``segment``; like insert_row,
+        this copies every row column"""
+        self._flush()
+        self._assignment_codes = np.delete(self._assignment_codes, row)
+        self._weight = np.delete(self._weight, row)
+        self._score = np.delete(self._score, row)
+        self._max_score = np.delete(self._max_score, row)
+        self._offsets = self._offsets.copy()
+        self._offsets[segment + 1:] -= 1
+
+    def student_id(self, index):
+        """Return the student of course segment ``index``, or None."""
+        code = self.student_codes[index]
+        return None if code < 0 else self.student_table[code]
+
+    def course_dict(self, index):
+        """Materialize course ``index`` as the legacy dict representation."""
+        start, stop = self.segment_rows(index)
+        names = self.assignment_table
+        codes = self.assignment_codes[start:stop].tolist()
+        weight = self.weight[start:stop].tolist()
+        score = self.score[start:stop].tolist()
+        max_score = self.max_score[start:stop].tolist()
+
+        assignments = [
+            {
+                'name': names[code],
+                'weight': w,
+                'score': None if math.isnan(s) else s,
+                'max_score': m
+            }
+            for code, w, s, m in zip(codes, weight, score, max_score)
+        ]
+        course = {'name': self.course_name(index), 'assignments': assignments}
+        student_id = self.student_id(index)
+        if student_id is not None:
+            course['student_id'] = student_id
+        return course
+
+
+class CourseListView(Sequence):
+    """Read-only list-of-dicts view over a CourseStore.
+
+    Course dicts are built on access, so edits made to them are not written
+    back to the store.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('course index out of range')
+        return self._store.course_dict(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, CourseListView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CourseListView({len(self)} courses)"
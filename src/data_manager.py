@@ -1,66 +1,580 @@
-import pandas as pd
+import numpy as np
+import glob
+import importlib.util
 import json
 import os
+from concurrent.futures import as_completed
+
+import instrumentation
+from course_store import CourseStore, CourseListView
+from snapshot import SNAPSHOT_EXTENSION, open_snapshot, write_snapshot
+from grade_calculator import DISTRIBUTION_BINS, GradeAccumulator, GradeTotals
+from grading_scales import GradingPolicy, load_policy
+from metrics_cache import MetricsCache
+from process_pool import spawn_pool
+
+# pandas is imported inside the methods that parse or build DataFrames, so
+# code that only computes grades does not pay for importing it.
+
+# Explicit column types so pd.read_csv skips per-column type inference
+CSV_DTYPES = {
+    'course': str,
+    'assignment': str,
+    'weight': np.float64,
+    'score': np.float64,
+    'max_score': np.float64,
+    'student_id': str
+}
+
+# Columnar binary formats; Parquet/Feather need pyarrow, .npz only NumPy
+ARROW_EXTENSIONS = ('.parquet', '.feather')
+BINARY_EXTENSIONS = ('.npz',) + ARROW_EXTENSIONS
+
+# Rows per chunk when streaming; bounds peak memory of accumulate_from_csv
+DEFAULT_CHUNKSIZE = 100_000
+
+# Columns every grade file must have; student_id is optional
+REQUIRED_COLUMNS = ('course', 'assignment', 'weight', 'score', 'max_score')
+
+# Columns compared when the same assignment appears in several merged files
+MERGE_VALUE_COLUMNS = ('weight', 'score', 'max_score')
+
+
+def expand_paths(source):
+    """Turn a directory, glob pattern or list of paths into a sorted file list.
+    
+    A directory expands to the .csv files directly inside it.
+    """
+    if isinstance(source, (list, tuple)):
+        return list(source)
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    return sorted(glob.glob(source))
+
+
+def _read_csv_file(filename):
+    """Parse one CSV in a worker process (module level so it can be pickled);
+    raises ValueError if it lacks any of REQUIRED_COLUMNS"""
+    import pandas as pd
+    df = pd.read_csv(filename, dtype=CSV_DTYPES)
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"missing column(s) {', '.join(missing)}")
+    return df
 
 class DataManager:
     def __init__(self):
-        self.courses = []
+        self.store = CourseStore()
+        self._totals = None
+        # Bumped on every change so derived results can tell they are stale
+        self.version = 0
+        # Assignments that disagreed between files in the last load_many
+        self.merge_conflicts = []
+        # Scale and credit hours of each course; kept when new data is loaded
+        self.grading = GradingPolicy()
+        self.metrics = MetricsCache(self)
     
-    def add_course(self, course_name, assignments):
-        course = {
-            'name': course_name,
-            'assignments': assignments
-        }
-        self.courses.append(course)
+    @property
+    def courses(self):
+        """Lazy list-of-dicts view over the columnar store"""
+        return CourseListView(self.store)
+    
+    @courses.setter
+    def courses(self, courses):
+        self.store.clear()
+        self._data_changed()
+        for course in courses:
+            self.add_course(course['name'], course['assignments'], course.get('student_id'))
+    
+    def add_course(self, course_name, assignments, student_id=None):
+        self.store.append_course(course_name, assignments, student_id)
+        self._data_changed()
+    
+    def _data_changed(self):
+        """Drop derived state after courses are added or reloaded"""
+        self._totals = None
+        self.version += 1
+    
+    def set_grading(self, policy):
+        """Grade courses with ``policy`` from now on"""
+        self.grading = policy
+        self._data_changed()
+    
+    def load_grading(self, filename):
+        """Load grading scales and course credit hours from a JSON file"""
+        if not os.path.exists(filename):
+            print(f"File {filename} not found")
+            return False
+        try:
+            policy = load_policy(filename)
+        except ValueError as e:
+            print(f"Could not load grading scales: {e}")
+            return False
+        self.set_grading(policy)
+        print(f"Grading scales loaded from {filename}")
+        return True
+    
+    def _to_frame(self, categorical=False):
+        """Flatten the store into one row per assignment.
+        
+        With ``categorical`` the name columns stay dictionary-encoded as
+        pandas Categoricals instead of being expanded to strings.
+        """
+        import pandas as pd
+        
+        store = self.store
+        row_segments = store.row_course_index()
+        
+        def names(table, codes):
+            if categorical:
+                return pd.Categorical.from_codes(codes, categories=pd.Index(table, dtype=object))
+            # Code -1 (missing) indexes the trailing None
+            return np.asarray(list(table) + [None], dtype=object)[codes]
+        
+        columns = {}
+        if store.has_students:
+            columns['student_id'] = names(store.student_table, store.student_codes[row_segments])
+        columns.update({
+            'course': names(store.course_table, store.course_codes[row_segments]),
+            'assignment': names(store.assignment_table, store.assignment_codes),
+            'weight': store.weight,
+            'score': store.score,
+            'max_score': store.max_score
+        })
+        return pd.DataFrame(columns)
     
     def save_to_csv(self, filename='grade_data.csv'):
-        data = []
-        for course in self.courses:
-            for assignment in course['assignments']:
-                data.append({
-                    'course': course['name'],
-                    'assignment': assignment['name'],
-                    'weight': assignment['weight'],
-                    'score': assignment['score'],
-                    'max_score': assignment['max_score']
-                })
-        
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False)
+        with instrumentation.span('save_to_csv', file=os.path.basename(filename)):
+            df = self._to_frame()
+            df.to_csv(filename, index=False)
+        instrumentation.count('rows_written', len(df))
+        print(f"Data saved to {filename}")
+    
+    def save_binary(self, filename='grade_data.npz'):
+        """Save the store in a columnar binary format chosen by extension.
+        
+        .parquet and .feather are written through pyarrow; without pyarrow,
+        or for any other extension, the NumPy .npz layout is written instead
+        (with the extension changed to .npz). Returns the path written.
+        """
+        base, ext = os.path.splitext(filename)
+        ext = ext.lower()
+        
+        if ext in ARROW_EXTENSIONS:
+            if importlib.util.find_spec('pyarrow') is not None:
+                df = self._to_frame(categorical=True)
+                if ext == '.parquet':
+                    df.to_parquet(filename, index=False)
+                else:
+                    df.to_feather(filename)
+                print(f"Data saved to {filename}")
+                return filename
+            print("pyarrow is not installed, falling back to .npz")
+        
+        if ext != '.npz':
+            filename = base + '.npz'
+        
+        store = self.store
+        np.savez(
+            filename,
+            course_table=np.array(store.course_table, dtype=str),
+            assignment_table=np.array(store.assignment_table, dtype=str),
+            student_table=np.array(store.student_table, dtype=str),
+            course_codes=store.course_codes,
+            student_codes=store.student_codes,
+            offsets=store.offsets,
+            assignment_codes=store.assignment_codes,
+            weight=store.weight,
+            score=store.score,
+            max_score=store.max_score
+        )
         print(f"Data saved to {filename}")
+        return filename
+    
+    def load_binary(self, filename='grade_data.npz'):
+        if not os.path.exists(filename):
+            print(f"File {filename} not found")
+            return False
+        
+        with instrumentation.span('load_binary', file=os.path.basename(filename)):
+            ext = os.path.splitext(filename)[1].lower()
+            self.store.clear()
+            if ext in ARROW_EXTENSIONS:
+                import pandas as pd
+                read = pd.read_parquet if ext == '.parquet' else pd.read_feather
+                self._load_frame(read(filename))
+            else:
+                with np.load(filename, allow_pickle=False) as data:
+                    self.store = CourseStore.from_columns(
+                        data['course_table'].tolist(),
+                        data['assignment_table'].tolist(),
+                        data['student_table'].tolist(),
+                        data['course_codes'], data['student_codes'], data['offsets'],
+                        data['assignment_codes'], data['weight'], data['score'],
+                        data['max_score']
+                    )
+                self._data_changed()
+        print(f"Data loaded from {filename}")
+        return True
+    
+    def save_snapshot(self, filename='grade_data.gvs'):
+        """Save a memory-mappable GradeVision snapshot"""
+        write_snapshot(self.store, filename)
+        print(f"Snapshot saved to {filename}")
     
-    def load_from_csv(self, filename='grade_data.csv'):
+    def open_snapshot(self, filename='grade_data.gvs'):
+        """Open a snapshot without copying its columns into memory"""
+        if not os.path.exists(filename):
+            print(f"File {filename} not found")
+            return False
+        
+        with instrumentation.span('open_snapshot', file=os.path.basename(filename)):
+            self.store = open_snapshot(filename)
+        self._data_changed()
+        print(f"Snapshot opened from {filename}")
+        return True
+    
+    def load(self, filename, progress=None, cancel=None):
+        """Load a CSV, binary or snapshot file, picking the reader by extension.
+        
+        ``progress`` and ``cancel`` are passed to load_from_csv.
+        """
+        ext = os.path.splitext(filename)[1].lower()
+        if ext == SNAPSHOT_EXTENSION:
+            return self.open_snapshot(filename)
+        if ext in BINARY_EXTENSIONS:
+            return self.load_binary(filename)
+        return self.load_from_csv(filename, progress=progress, cancel=cancel)
+    
+    def load_from_csv(self, filename='grade_data.csv', progress=None, cancel=None,
+                      chunksize=DEFAULT_CHUNKSIZE):
+        """Load a CSV file, replacing the current courses.
+        
+        With ``progress`` or ``cancel`` the file is parsed in chunks of
+        ``chunksize`` rows: ``progress(rows, fraction)`` is called after each
+        chunk with the rows parsed so far and the fraction of the file read,
+        and loading stops (returning False, current data untouched) once the
+        ``cancel`` threading.Event is set.
+        """
+        import pandas as pd
+        
         if os.path.exists(filename):
-            df = pd.read_csv(filename)
-            self.courses = []
-            
-            for course_name in df['course'].unique():
-                course_data = df[df['course'] == course_name]
-                assignments = []
-                
-                for _, row in course_data.iterrows():
-                    assignments.append({
-                        'name': row['assignment'],
-                        'weight': row['weight'],
-                        'score': row['score'],
-                        'max_score': row['max_score']
-                    })
-                
-                self.add_course(course_name, assignments)
+            with instrumentation.span('load_from_csv', file=os.path.basename(filename)):
+                with instrumentation.span('parse_csv'):
+                    if progress is None and cancel is None:
+                        df = pd.read_csv(filename, dtype=CSV_DTYPES)
+                    else:
+                        df = self._read_csv_chunked(filename, progress, cancel, chunksize)
+                if df is None:
+                    print(f"Loading {filename} cancelled")
+                    return False
+                instrumentation.count('rows_parsed', len(df))
+                self.store.clear()
+                self._load_frame(df)
             print(f"Data loaded from {filename}")
             return True
         else:
             print(f"File {filename} not found")
             return False
     
+    @staticmethod
+    def _read_csv_chunked(filename, progress, cancel, chunksize):
+        import pandas as pd
+        
+        size = os.path.getsize(filename) or 1
+        chunks = []
+        rows = 0
+        with open(filename, 'rb') as f:
+            for chunk in pd.read_csv(f, dtype=CSV_DTYPES, chunksize=chunksize):
+                if cancel is not None and cancel.is_set():
+                    return None
+                chunks.append(chunk)
+                rows += len(chunk)
+                if progress is not None:
+                    progress(rows, min(f.tell() / size, 1.0))
+        if cancel is not None and cancel.is_set():
+            return None
+        if not chunks:
+            return pd.read_csv(filename, dtype=CSV_DTYPES)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def load_many(self, source, workers=None, progress=None, cancel=None, base=None):
+        """Load and merge many CSV files, parsing them in parallel.
+        
+        ``source`` is a directory, a glob pattern or a list of paths. Files
+        are parsed by a pool of ``workers`` processes (default: all cores;
+        1 parses in this process) and merged in path order. The courses of
+        ``base`` (another DataManager, or ``self`` to add files to what is
+        already loaded) are merged ahead of the files.
+        
+        A (student, course, assignment) found in more than one file is kept
+        once, from the first file. If the later copy has a different
+        weight, score or max score it is recorded in ``merge_conflicts``.
+        Courses from different files are otherwise combined, so a course
+        split across files gets the assignments of all of them.
+        ``progress(rows, fraction)`` is called as files finish. Returns
+        False if no file could be read or loading was cancelled.
+        """
+        import pandas as pd
+        
+        filenames = expand_paths(source)
+        if not filenames:
+            print(f"No CSV files found for {source}")
+            return False
+        
+        with instrumentation.span('load_many', files=len(filenames)):
+            frames = self._parse_files(filenames, workers, progress, cancel)
+            if frames is None:
+                print("Loading cancelled")
+                return False
+            
+            sources = [name for name, frame in zip(filenames, frames) if frame is not None]
+            frames = [frame for frame in frames if frame is not None]
+            if base is not None and len(base.store):
+                sources.insert(0, '(current data)')
+                frames.insert(0, base._to_frame())
+            if not frames:
+                return False
+            
+            for index, frame in enumerate(frames):
+                frame['_source'] = index
+            df = pd.concat(frames, ignore_index=True)
+            df = df[df['course'].notna()]
+            df, conflicts = self._merge_duplicates(df, sources)
+            
+            self.store.clear()
+            self._load_frame(df.drop(columns='_source'))
+        
+        self.merge_conflicts = conflicts
+        print(f"Merged {len(sources)} file(s): {len(df)} rows, {len(conflicts)} conflict(s)")
+        return True
+    
+    @staticmethod
+    def _parse_files(filenames, workers, progress, cancel):
+        """Parse every file, returning DataFrames (None for files that cannot
+        be read or lack REQUIRED_COLUMNS) in ``filenames`` order, or None if
+        cancelled"""
+        frames = [None] * len(filenames)
+        rows = 0
+        
+        def finished(index, frame, done):
+            nonlocal rows
+            frames[index] = frame
+            if frame is not None:
+                rows += len(frame)
+            if progress is not None:
+                progress(rows, done / len(filenames))
+        
+        if workers == 1:
+            for index, filename in enumerate(filenames):
+                if cancel is not None and cancel.is_set():
+                    return None
+                try:
+                    frame = _read_csv_file(filename)
+                except Exception as e:
+                    print(f"Could not read {filename}: {e}")
+                    frame = None
+                finished(index, frame, index + 1)
+            return frames
+        
+        with spawn_pool(workers) as executor:
+            futures = {executor.submit(_read_csv_file, filename): index
+                       for index, filename in enumerate(filenames)}
+            for done, future in enumerate(as_completed(futures), 1):
+                if cancel is not None and cancel.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    return None
+                index = futures[future]
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    print(f"Could not read {filenames[index]}: {e}")
+                    frame = None
+                finished(index, frame, done)
+        return frames
+    
+    @staticmethod
+    def _merge_duplicates(df, sources):
+        """Drop rows whose (student, course, assignment) already came from an
+        earlier file; returns the remaining rows and the conflicts found"""
+        keys = [column for column in ('student_id', 'course', 'assignment') if column in df.columns]
+        group = df.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+        first_rows = np.unique(group, return_index=True)[1][group]
+        source = df['_source'].to_numpy()
+        duplicate = source != source[first_rows]
+        if not duplicate.any():
+            return df, []
+        
+        # NaN (ungraded) scores compare equal to each other
+        differs = np.zeros(len(df), dtype=bool)
+        for column in MERGE_VALUE_COLUMNS:
+            values = df[column].to_numpy(dtype=np.float64)
+            kept = values[first_rows]
+            differs |= (values != kept) & ~(np.isnan(values) & np.isnan(kept))
+        
+        conflicts = []
+        for row in np.flatnonzero(duplicate & differs).tolist():
+            first = first_rows[row]
+            student_id = df['student_id'].iat[row] if 'student_id' in df.columns else None
+            conflicts.append({
+                'student_id': None if student_id is None or student_id != student_id else student_id,
+                'course': df['course'].iat[row],
+                'assignment': df['assignment'].iat[row],
+                'kept_file': sources[source[first]],
+                'dropped_file': sources[source[row]],
+                'kept': {column: float(df[column].iat[first]) for column in MERGE_VALUE_COLUMNS},
+                'dropped': {column: float(df[column].iat[row]) for column in MERGE_VALUE_COLUMNS}
+            })
+        return df[~duplicate], conflicts
+    
+    @staticmethod
+    def accumulate_from_csv(filename='grade_data.csv', chunksize=DEFAULT_CHUNKSIZE, bins=DISTRIBUTION_BINS):
+        """Stream a CSV in chunks into a GradeAccumulator.
+        
+        Only ``chunksize`` rows are held at a time, so course grades and GPA
+        can be computed for files larger than memory. Grade distribution
+        counts use ``bins`` (e.g. a grading scale's chart_bins()). Returns
+        None if the file does not exist.
+        """
+        import pandas as pd
+        
+        if not os.path.exists(filename):
+            print(f"File {filename} not found")
+            return None
+        
+        accumulator = GradeAccumulator(bins)
+        for chunk in pd.read_csv(filename, dtype=CSV_DTYPES, chunksize=chunksize):
+            chunk = chunk[chunk['course'].notna()]
+            if 'student_id' in chunk.columns:
+                students = chunk['student_id'].astype(object).where(chunk['student_id'].notna(), None)
+                codes, keys = pd.factorize(pd.MultiIndex.from_arrays([students, chunk['course']]))
+            else:
+                codes, keys = pd.factorize(chunk['course'])
+            accumulator.add_chunk(
+                codes, keys.tolist(),
+                chunk['weight'].to_numpy(dtype=np.float64),
+                chunk['score'].to_numpy(dtype=np.float64),
+                chunk['max_score'].to_numpy(dtype=np.float64)
+            )
+        print(f"Data streamed from {filename}")
+        return accumulator
+    
+    def _load_frame(self, df):
+        """Append the rows of a grade DataFrame to the store in one pass"""
+        with instrumentation.span('build_store'):
+            self._extend_from_frame(df)
+        self._data_changed()
+    
+    def _extend_from_frame(self, df):
+        import pandas as pd
+        
+        df = df[df['course'].notna()]
+        course_codes, course_names = pd.factorize(df['course'])
+        assignment_codes, assignment_names = pd.factorize(df['assignment'], use_na_sentinel=False)
+        
+        if 'student_id' in df.columns:
+            # One segment per (student, course) pair; rows without a student
+            # id get student code -1
+            student_codes, student_ids = pd.factorize(df['student_id'])
+            num_courses = max(len(course_names), 1)
+            pair_keys = (student_codes.astype(np.int64) + 1) * num_courses + course_codes
+            segment_codes, segment_keys = pd.factorize(pair_keys)
+            segment_courses = segment_keys % num_courses
+            segment_students = segment_keys // num_courses - 1
+            student_ids = student_ids.tolist()
+        else:
+            segment_codes = course_codes
+            segment_courses = np.arange(len(course_names))
+            segment_students = student_ids = None
+        
+        # Stable sort keeps segments in first-appearance order and assignments
+        # in file order within each segment
+        order = np.argsort(segment_codes, kind='stable')
+        counts = np.bincount(segment_codes, minlength=len(segment_courses))
+        
+        self.store.extend_columns(
+            segment_courses, course_names.tolist(), counts,
+            assignment_codes[order], assignment_names.tolist(),
+            df['weight'].to_numpy(dtype=np.float64)[order],
+            df['score'].to_numpy(dtype=np.float64)[order],
+            df['max_score'].to_numpy(dtype=np.float64)[order],
+            segment_students, student_ids
+        )
+    
     def get_course_names(self):
-        return [course['name'] for course in self.courses]
+        table = self.store.course_table
+        return [table[code] for code in self.store.course_codes.tolist()]
     
     def get_course_data(self, course_name):
-        for course in self.courses:
-            if course['name'] == course_name:
-                return course
-        return None
-
-
+        segment = self.store.first_segment(course_name)
+        if segment is None:
+            return None
+        return self.store.course_dict(segment)
+    
+    def get_courses_by_name(self, course_name):
+        """Return every course with this name (one per student in cohort data)"""
+        return [self.store.course_dict(index) for index in self.store.segments_for(course_name)]
+    
+    def get_student_ids(self):
+        """Return every student id in order of first appearance"""
+        return list(self.store.student_table)
+    
+    def get_course_students(self):
+        """Return the student id of each course, aligned with get_course_names()"""
+        students = self.store.student_table
+        return [students[code] if code >= 0 else None for code in self.store.student_codes.tolist()]
+    
+    def get_student_courses(self, student_id):
+        code = self.store.student_code(student_id)
+        if code is None:
+            return []
+        indices = np.flatnonzero(self.store.student_codes == code)
+        return [self.store.course_dict(index) for index in indices.tolist()]
 
+    def grade_totals(self):
+        """Per-course sums and GPA totals, built on first use and then
+        kept current by update_score/add_assignment/remove_assignment"""
+        if self._totals is None:
+            with instrumentation.span('grade_totals'):
+                self._totals = GradeTotals.from_data(self.store, self.grading)
+            instrumentation.count('courses_computed', len(self.store))
+        return self._totals
+    
+    def _segment_changed(self, segment):
+        self.version += 1
+        if self._totals is not None:
+            self._totals.update(segment, self.store)
+    
+    def update_score(self, course_name, assignment_name, score, student_id=None):
+        """Set one assignment's score (None marks it ungraded).
+        
+        Returns False if the course or assignment does not exist.
+        """
+        segment = self.store.find_segment(course_name, student_id)
+        row = None if segment is None else self.store.find_row(segment, assignment_name)
+        if row is None:
+            return False
+        
+        self.store.score[row] = np.nan if score is None else score
+        self._segment_changed(segment)
+        return True
+    
+    def add_assignment(self, course_name, assignment, student_id=None):
+        """Append an assignment dict to an existing course"""
+        segment = self.store.find_segment(course_name, student_id)
+        if segment is None:
+            return False
+        
+        self.store.insert_row(segment, assignment)
+        self._segment_changed(segment)
+        return True
+    
+    def remove_assignment(self, course_name, assignment_name, student_id=None):
+        segment = self.store.find_segment(course_name, student_id)
+        row = None if segment is None else self.store.find_row(segment, assignment_name)
+        if row is None:
+            return False
+        
+        self.store.delete_row(segment, row)
+        self._segment_changed(segment)
+        return True
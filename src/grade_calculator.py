@@ -1,3 +1,31 @@
+from bisect import bisect_right
+
+import numpy as np
+
+import instrumentation
+from grading_scales import DEFAULT_SCALE
+
+# Lower percentage bound of each grade band (ascending) and the grade points
+# awarded in each band of the built-in scale; GRADE_POINTS[0] applies below
+# the first cutoff. Other scales are configured through a GradingPolicy.
+GRADE_CUTOFFS = DEFAULT_SCALE.cutoffs
+GRADE_POINTS = DEFAULT_SCALE.points
+GRADE_LETTERS = DEFAULT_SCALE.letters
+
+# Percentage bins of the grade distribution chart (F, D, C, B, A). As with
+# np.histogram the last bin includes 100 and values outside 0-100 are dropped.
+DISTRIBUTION_BINS = DEFAULT_SCALE.chart_bins()
+
+# Scenario values handled per block by scenario_grades_batch; bounds the
+# temporary (scenarios x ungraded rows) arrays
+SCENARIO_BLOCK_SIZE = 4_000_000
+# Largest number of score combinations scenario_grid will enumerate
+MAX_GRID_COMBINATIONS = 1_000_000
+
+_CUTOFF_LIST = GRADE_CUTOFFS.tolist()
+_POINTS_LIST = GRADE_POINTS.tolist()
+
+
 class GradeCalculator:
     @staticmethod
     def _calculate_percentage(score, max_score):
@@ -38,16 +66,164 @@ class GradeCalculator:
     
     @staticmethod
     def _grade_to_points(percentage):
-        if percentage >= 90: return 4.0
-        elif percentage >= 85: return 3.7
-        elif percentage >= 80: return 3.3
-        elif percentage >= 75: return 3.0
-        elif percentage >= 70: return 2.7
-        elif percentage >= 65: return 2.3
-        elif percentage >= 60: return 2.0
-        elif percentage >= 55: return 1.7
-        elif percentage >= 50: return 1.0
-        else: return 0.0
+        return _POINTS_LIST[bisect_right(_CUTOFF_LIST, percentage)]
+    
+    @staticmethod
+    def _columns(data):
+        """Return (score, weight, max_score, offsets) from a DataManager, a
+        CourseStore or a tuple of those arrays"""
+        if isinstance(data, tuple):
+            return data
+        store = getattr(data, 'store', data)
+        return store.score, store.weight, store.max_score, store.offsets
+    
+    @staticmethod
+    def _row_segments(offsets):
+        """Segment index of every row"""
+        lengths = np.diff(offsets)
+        return np.repeat(np.arange(len(lengths)), lengths)
+    
+    @staticmethod
+    def _segment_sum(values, offsets):
+        """Sum ``values`` over each ``offsets[i]:offsets[i + 1]`` segment.
+        
+        np.bincount adds strictly in row order, so each sum is bit-for-bit the
+        running total the per-dict loops produce (np.add.reduceat uses
+        pairwise summation and can differ in the last ulp). Empty segments
+        sum to 0.
+        """
+        return np.bincount(GradeCalculator._row_segments(offsets), weights=values, minlength=len(offsets) - 1)
+    
+    @staticmethod
+    def assignment_percentages(score, max_score):
+        """Vectorized _calculate_percentage; ungraded (NaN) scores stay NaN"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage = (score / max_score) * 100
+        return np.where(max_score == 0, 0.0, percentage)
+    
+    @staticmethod
+    def grade_distribution_counts(percentages, bins=DISTRIBUTION_BINS):
+        """Count graded percentages per bin (e.g. a scale's chart_bins()); NaN is skipped"""
+        percentages = np.asarray(percentages, dtype=np.float64)
+        return np.histogram(percentages[~np.isnan(percentages)], bins=bins)[0]
+    
+    @staticmethod
+    def merge_distribution_counts(counts, bins=DISTRIBUTION_BINS):
+        """Combine distribution counts computed over separate data partitions
+        with the same ``bins``"""
+        merged = np.zeros(len(bins) - 1, dtype=np.int64)
+        for partition in counts:
+            merged += partition
+        return merged
+    
+    @staticmethod
+    def course_sums_batch(data):
+        """Return per-course (weighted percentage sum, graded weight) arrays"""
+        score, weight, max_score, offsets = GradeCalculator._columns(data)
+        graded = ~np.isnan(score)
+        percentage = GradeCalculator.assignment_percentages(score, max_score)
+        weighted = np.where(graded, percentage * (weight / 100), 0.0)
+        graded_weight = np.where(graded, weight, 0.0)
+        return (GradeCalculator._segment_sum(weighted, offsets),
+                GradeCalculator._segment_sum(graded_weight, offsets))
+    
+    @staticmethod
+    def grades_from_sums(weighted_score, total_weight):
+        """Vectorized final step of calculate_course_grade"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grades = weighted_score / (total_weight / 100)
+        return np.where(total_weight == 0, 0.0, grades)
+    
+    @staticmethod
+    def calculate_course_grades_batch(data):
+        """Calculate the grade of every course at once.
+        
+        ``data`` is a DataManager, a CourseStore or a (score, weight,
+        max_score, offsets) tuple of columns; results match
+        calculate_course_grade for each course.
+        """
+        with instrumentation.span('course_grades_batch'):
+            weighted_score, total_weight = GradeCalculator.course_sums_batch(data)
+            grades = GradeCalculator.grades_from_sums(weighted_score, total_weight)
+        instrumentation.count('courses_computed', len(grades))
+        return grades
+    
+    @staticmethod
+    def grades_to_points_batch(grades, policy=None, scale_codes=None):
+        """Vectorized _grade_to_points; with a GradingPolicy each grade is
+        looked up on the scale its ``scale_codes`` entry names"""
+        if policy is None:
+            return GRADE_POINTS[np.searchsorted(GRADE_CUTOFFS, grades, side='right')]
+        return policy.points(grades, scale_codes)
+    
+    @staticmethod
+    def weighted_gpa(points, credits=None):
+        """Credit-weighted mean of grade points (plain mean without credits)"""
+        if len(points) == 0:
+            return 0
+        # cumsum accumulates in order, matching calculate_gpa's running total;
+        # unit credits leave both sums unchanged
+        if credits is None:
+            return float(np.cumsum(points)[-1] / len(points))
+        total_credits = np.cumsum(credits)[-1]
+        return float(np.cumsum(points * credits)[-1] / total_credits) if total_credits > 0 else 0
+    
+    @staticmethod
+    def gpa_from_grades(grades, policy=None, scale_codes=None, credits=None):
+        """GPA of per-course grades; ``scale_codes`` and ``credits`` give each
+        course's scale under ``policy`` and its credit hours"""
+        counted = grades >= 0
+        points = GradeCalculator.grades_to_points_batch(
+            grades[counted], policy, None if scale_codes is None else scale_codes[counted])
+        return GradeCalculator.weighted_gpa(points, None if credits is None else credits[counted])
+    
+    @staticmethod
+    def calculate_gpa_batch(data, policy=None):
+        """Calculate the overall GPA of all courses in ``data`` at once.
+        
+        With a GradingPolicy every course is graded on its own scale and
+        weighted by its credit hours, still in one pass over all courses.
+        """
+        store = getattr(data, 'store', data)
+        grades = GradeCalculator.calculate_course_grades_batch(data)
+        if policy is None:
+            return GradeCalculator.gpa_from_grades(grades)
+        return GradeCalculator.gpa_from_grades(grades, policy, policy.segment_scales(store),
+                                               policy.segment_credits(store))
+    
+    @staticmethod
+    def student_gpas_from_grades(grades, student_codes, num_students, policy=None, scale_codes=None,
+                                 credits=None):
+        """Per-student GPA from per-course grades and each course's student code"""
+        counted = (grades >= 0) & (student_codes >= 0)
+        codes = student_codes[counted]
+        points = GradeCalculator.grades_to_points_batch(
+            grades[counted], policy, None if scale_codes is None else scale_codes[counted])
+        if credits is None:
+            totals = np.bincount(codes, weights=points, minlength=num_students)
+            counts = np.bincount(codes, minlength=num_students)
+        else:
+            totals = np.bincount(codes, weights=points * credits[counted], minlength=num_students)
+            counts = np.bincount(codes, weights=credits[counted], minlength=num_students)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(counts > 0, totals / counts, 0.0)
+    
+    @staticmethod
+    def calculate_student_gpas_batch(data, policy=None):
+        """Calculate every student's GPA in one grouped pass.
+        
+        ``data`` is a multi-student DataManager or CourseStore; returns a dict
+        mapping student id to GPA. ``policy`` works as in calculate_gpa_batch.
+        """
+        store = getattr(data, 'store', data)
+        grades = GradeCalculator.calculate_course_grades_batch(store)
+        if policy is None:
+            gpas = GradeCalculator.student_gpas_from_grades(grades, store.student_codes, len(store.student_table))
+        else:
+            gpas = GradeCalculator.student_gpas_from_grades(
+                grades, store.student_codes, len(store.student_table), policy,
+                policy.segment_scales(store), policy.segment_credits(store))
+        return dict(zip(store.student_table, gpas.tolist()))
     
     @staticmethod
     def predict_final_grade(current_assignments, future_score, future_weight):
@@ -58,6 +234,292 @@ class GradeCalculator:
         current_contribution = current_grade * (current_weight / 100)
         
         return current_contribution + future_contribution
+    
+    @staticmethod
+    def remaining_weight_batch(data):
+        """Per-course weight of the assignments not yet graded"""
+        score, weight, max_score, offsets = GradeCalculator._columns(data)
+        return GradeCalculator._segment_sum(np.where(np.isnan(score), weight, 0.0), offsets)
+    
+    @staticmethod
+    def required_scores_batch(data, cutoffs=GRADE_CUTOFFS, sums=None):
+        """Minimum percentage needed on every course's remaining work to
+        finish at or above each cutoff.
+        
+        Returns a (courses x cutoffs) array, assuming the same percentage on
+        every ungraded assignment of a course; the final grade is what
+        calculate_course_grade gives once everything is graded. 0 means the
+        cutoff is already secured, values above 100 need extra credit and
+        inf means nothing is left to grade and the cutoff was missed.
+        ``cutoffs`` may also be a (courses x cutoffs) array giving each
+        course its own cutoffs (e.g. GradingPolicy.segment_cutoffs); NaN
+        entries give NaN. ``sums`` may pass precomputed course_sums_batch
+        results.
+        """
+        weighted_score, graded_weight = sums if sums is not None else GradeCalculator.course_sums_batch(data)
+        remaining = GradeCalculator.remaining_weight_batch(data)[:, None]
+        cutoffs = np.asarray(cutoffs, dtype=np.float64)
+        if cutoffs.ndim == 1:
+            cutoffs = cutoffs[None, :]
+        
+        shortfall = cutoffs * ((graded_weight[:, None] + remaining) / 100) - weighted_score[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            required = shortfall * 100 / remaining
+        current = GradeCalculator.grades_from_sums(weighted_score, graded_weight)[:, None]
+        finished = np.where(current >= cutoffs, 0.0, np.inf)
+        required = np.where(remaining > 0, np.maximum(required, 0.0), finished)
+        return np.where(np.isnan(cutoffs), np.nan, required)
+    
+    @staticmethod
+    def scenario_grades_batch(data, scores):
+        """Final grade of every course under many hypothetical scores at once.
+        
+        ``scores`` holds percentages for the ungraded assignments, either
+        shape (scenarios,) -- one percentage for all remaining work -- or
+        (scenarios, rows) with a column per row of the data (graded rows
+        are ignored) or per ungraded row in row order. NaN leaves an
+        assignment ungraded in that scenario. Returns a (scenarios x
+        courses) array of grades.
+        """
+        score, weight, max_score, offsets = GradeCalculator._columns(data)
+        weighted_score, graded_weight = GradeCalculator.course_sums_batch((score, weight, max_score, offsets))
+        scores = np.asarray(scores, dtype=np.float64)
+        
+        if scores.ndim == 1:
+            remaining = GradeCalculator.remaining_weight_batch((score, weight, max_score, offsets))
+            extra = scores[:, None] * (remaining[None, :] / 100)
+            extra_weight = np.broadcast_to(remaining, extra.shape)
+            return GradeCalculator.grades_from_sums(weighted_score + extra, graded_weight + extra_weight)
+        
+        rows = np.flatnonzero(np.isnan(score))
+        if scores.shape[1] == len(score):
+            scores = scores[:, rows]
+        elif scores.shape[1] != len(rows):
+            raise ValueError(f"scores need {len(score)} or {len(rows)} columns, got {scores.shape[1]}")
+        
+        num_courses = len(offsets) - 1
+        segment = GradeCalculator._row_segments(offsets)[rows]
+        row_weight = weight[rows]
+        grades = np.empty((len(scores), num_courses))
+        block = max(1, SCENARIO_BLOCK_SIZE // max(len(rows), 1))
+        for start in range(0, len(scores), block):
+            chunk = scores[start:start + block]
+            given = ~np.isnan(chunk)
+            # One bincount per block: scenario j's courses are bins j*courses...
+            bins = (segment[None, :] + num_courses * np.arange(len(chunk))[:, None]).ravel()
+            size = len(chunk) * num_courses
+            extra = np.bincount(bins, weights=np.where(given, chunk * (row_weight / 100), 0.0).ravel(),
+                                minlength=size).reshape(len(chunk), num_courses)
+            extra_weight = np.bincount(bins, weights=np.where(given, row_weight, 0.0).ravel(),
+                                       minlength=size).reshape(len(chunk), num_courses)
+            grades[start:start + block] = GradeCalculator.grades_from_sums(
+                weighted_score + extra, graded_weight + extra_weight)
+        return grades
+    
+    @staticmethod
+    def scenario_grid(data, segment, values):
+        """Every combination of ``values`` on the ungraded assignments of one
+        course; returns (combinations x ungraded assignments scores, grades)"""
+        score, weight, max_score, offsets = GradeCalculator._columns(data)
+        start, end = int(offsets[segment]), int(offsets[segment + 1])
+        ungraded = np.flatnonzero(np.isnan(score[start:end])) + start
+        values = np.asarray(values, dtype=np.float64)
+        
+        combinations = len(values) ** len(ungraded)
+        if combinations > MAX_GRID_COMBINATIONS:
+            raise ValueError(f"{combinations} combinations exceed MAX_GRID_COMBINATIONS")
+        
+        grid = values[np.indices((len(values),) * len(ungraded)).reshape(len(ungraded), combinations).T]
+        weighted_score, graded_weight = GradeCalculator.course_sums_batch(
+            (score[start:end], weight[start:end], max_score[start:end], np.array([0, end - start])))
+        extra = grid @ (weight[ungraded] / 100)
+        grades = GradeCalculator.grades_from_sums(weighted_score[0] + extra,
+                                                  np.full(len(grid), graded_weight[0] + weight[ungraded].sum()))
+        return grid, grades
 
 
+class GradeAccumulator:
+    """Running per-course totals for data streamed in chunks.
+    
+    Each chunk is folded into a weighted percentage sum, graded weight and
+    graded assignment count per course key, plus grade distribution counts,
+    so memory grows with the number of courses rather than the number of
+    rows. Keys are course names, or
+    (student_id, course) tuples for multi-student data. Distribution counts
+    are taken over ``bins`` (e.g. a grading scale's chart_bins()).
+    """
+    
+    def __init__(self, bins=DISTRIBUTION_BINS):
+        self.course_keys = []
+        self._lookup = {}
+        self.weighted_score = np.zeros(0)
+        self.graded_weight = np.zeros(0)
+        self.graded_count = np.zeros(0, dtype=np.int64)
+        self.bins = np.asarray(bins, dtype=np.float64)
+        self.distribution_counts = np.zeros(len(self.bins) - 1, dtype=np.int64)
+        self.rows = 0
+    
+    def __len__(self):
+        return len(self.course_keys)
+    
+    def _resize(self, size):
+        if size <= len(self.weighted_score):
+            return
+        capacity = max(size, 2 * len(self.weighted_score), 16)
+        grow = capacity - len(self.weighted_score)
+        self.weighted_score = np.concatenate([self.weighted_score, np.zeros(grow)])
+        self.graded_weight = np.concatenate([self.graded_weight, np.zeros(grow)])
+        self.graded_count = np.concatenate([self.graded_count, np.zeros(grow, dtype=np.int64)])
+    
+    def _remap(self, keys):
+        remap = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            index = self._lookup.get(key)
+            if index is None:
+                index = len(self.course_keys)
+                self.course_keys.append(key)
+                self._lookup[key] = index
+            remap[i] = index
+        self._resize(len(self.course_keys))
+        return remap
+    
+    def add_chunk(self, codes, keys, weight, score, max_score):
+        """Fold a chunk of rows into the running totals.
+        
+        ``codes`` gives each row's index into this chunk's ``keys`` table.
+        """
+        segment = self._remap(keys)[codes]
+        size = len(self.course_keys)
+        
+        graded = ~np.isnan(score)
+        percentage = GradeCalculator.assignment_percentages(score, max_score)
+        weighted = np.where(graded, percentage * (weight / 100), 0.0)
+        
+        self.weighted_score[:size] += np.bincount(segment, weights=weighted, minlength=size)
+        self.graded_weight[:size] += np.bincount(segment, weights=np.where(graded, weight, 0.0), minlength=size)
+        self.graded_count[:size] += np.bincount(segment[graded], minlength=size)
+        self.distribution_counts += GradeCalculator.grade_distribution_counts(percentage, self.bins)
+        self.rows += len(segment)
+    
+    def merge(self, other):
+        """Add another accumulator's totals (e.g. from another partition);
+        both must count the same distribution bins"""
+        if not np.array_equal(self.bins, other.bins):
+            raise ValueError("Cannot merge accumulators with different distribution bins")
+        size = len(other)
+        segment = self._remap(other.course_keys)
+        self.weighted_score[segment] += other.weighted_score[:size]
+        self.graded_weight[segment] += other.graded_weight[:size]
+        self.graded_count[segment] += other.graded_count[:size]
+        self.distribution_counts += other.distribution_counts
+        self.rows += other.rows
+    
+    def course_grades(self):
+        size = len(self.course_keys)
+        return GradeCalculator.grades_from_sums(self.weighted_score[:size], self.graded_weight[:size])
+    
+    def _course_names(self):
+        return [key[1] if isinstance(key, tuple) else key for key in self.course_keys]
+    
+    def gpa(self, policy=None):
+        """Overall GPA; with a GradingPolicy each course uses its own scale and credits"""
+        if policy is None:
+            return GradeCalculator.gpa_from_grades(self.course_grades())
+        names = self._course_names()
+        scale_codes = np.array([policy.scale_code(name) for name in names], dtype=np.int64)
+        credits = np.array([policy.credits_for(name) for name in names], dtype=np.float64)
+        return GradeCalculator.gpa_from_grades(self.course_grades(), policy, scale_codes, credits)
+    
+    def student_gpas(self):
+        """Per-student GPA when keys are (student_id, course) tuples.
+        
+        Courses without a student (a None or NaN id) are skipped, like
+        student code -1 in a CourseStore.
+        """
+        student_ids = []
+        lookup = {}
+        codes = np.empty(len(self.course_keys), dtype=np.int32)
+        for i, (student_id, _) in enumerate(self.course_keys):
+            if student_id is None or student_id != student_id:
+                codes[i] = -1
+                continue
+            if student_id not in lookup:
+                lookup[student_id] = len(student_ids)
+                student_ids.append(student_id)
+            codes[i] = lookup[student_id]
+        gpas = GradeCalculator.student_gpas_from_grades(self.course_grades(), codes, len(student_ids))
+        return dict(zip(student_ids, gpas.tolist()))
+
 
+class GradeTotals:
+    """Per-course sums kept current across individual edits.
+    
+    Holds each course's weighted percentage sum and graded weight plus the
+    derived grade and grade points. update() recomputes one course from its
+    own rows, with the same code as the full computation, so its cost
+    depends on the course's size and never drifts from a recompute. The
+    credit-weighted GPA totals (overall and per student) are rebuilt from
+    the per-course points the next time they are read after an edit.
+    Without a GradingPolicy every course uses the built-in scale and counts
+    one credit.
+    """
+    
+    def __init__(self, weighted_score, graded_weight, student_codes, num_students, policy=None,
+                 scale_codes=None, credits=None):
+        self.weighted_score = np.array(weighted_score, dtype=np.float64)
+        self.graded_weight = np.array(graded_weight, dtype=np.float64)
+        self.student_codes = np.asarray(student_codes)
+        self.num_students = num_students
+        self.policy = policy
+        self.scale_codes = scale_codes
+        self.credits = np.ones(len(self.weighted_score)) if credits is None else np.asarray(credits, dtype=np.float64)
+        self.grades = GradeCalculator.grades_from_sums(self.weighted_score, self.graded_weight)
+        self.points = GradeCalculator.grades_to_points_batch(self.grades, policy, scale_codes)
+        self._gpa_totals = None
+        self._student_totals = None
+    
+    @classmethod
+    def from_data(cls, data, policy=None):
+        store = getattr(data, 'store', data)
+        weighted_score, graded_weight = GradeCalculator.course_sums_batch(store)
+        if policy is None or policy.is_default():
+            return cls(weighted_score, graded_weight, store.student_codes, len(store.student_table))
+        return cls(weighted_score, graded_weight, store.student_codes, len(store.student_table), policy,
+                   policy.segment_scales(store), policy.segment_credits(store))
+    
+    def update(self, segment, data):
+        """Recompute one course's sums, grade and points from its rows in ``data``
+        (a CourseStore or a column tuple as for course_sums_batch)"""
+        score, weight, max_score, offsets = GradeCalculator._columns(data)
+        start, end = offsets[segment], offsets[segment + 1]
+        weighted_score, graded_weight = GradeCalculator.course_sums_batch(
+            (score[start:end], weight[start:end], max_score[start:end], np.array([0, end - start])))
+        self.weighted_score[segment] = weighted_score[0]
+        self.graded_weight[segment] = graded_weight[0]
+        
+        grade = GradeCalculator.grades_from_sums(weighted_score, graded_weight)
+        scale_codes = None if self.scale_codes is None else self.scale_codes[segment:segment + 1]
+        self.grades[segment] = grade[0]
+        self.points[segment] = GradeCalculator.grades_to_points_batch(grade, self.policy, scale_codes)[0]
+        self._gpa_totals = None
+        self._student_totals = None
+    
+    def gpa(self):
+        if self._gpa_totals is None:
+            counted = self.grades >= 0
+            # cumsum adds in order so the GPA matches calculate_gpa
+            self._gpa_totals = ((float(np.cumsum((self.points * self.credits)[counted])[-1]),
+                                 float(np.cumsum(self.credits[counted])[-1])) if counted.any() else (0.0, 0.0))
+        points_total, credit_total = self._gpa_totals
+        return points_total / credit_total if credit_total > 0 else 0
+    
+    def student_gpa(self, student_code):
+        if self._student_totals is None:
+            has_student = (self.grades >= 0) & (self.student_codes >= 0)
+            codes = self.student_codes[has_student]
+            self._student_totals = (
+                np.bincount(codes, weights=(self.points * self.credits)[has_student], minlength=self.num_students),
+                np.bincount(codes, weights=self.credits[has_student], minlength=self.num_students))
+        student_points, student_credits = self._student_totals
+        credits = student_credits[student_code]
+        return float(student_points[student_code] / credits) if credits > 0 else 0
@@ -0,0 +1,279 @@
+"""Monte Carlo outlook of final grades from the scores recorded so far.
+
+Each sample fills every ungraded assignment with a percentage drawn from
+an empirical pool of graded percentages -- those of the same assignment
+(``source='assignment'``, e.g. every student's Final) or of the same
+student (``source='student'``) -- falling back to all graded scores when
+the pool is empty. Course grades, letter bands and student GPAs are then
+computed for a block of samples at a time with the batched calculator
+functions, each course on the scale and credit hours the DataManager's
+GradingPolicy gives it::
+
+    result = simulate(data_manager, samples=10_000, seed=42)
+    result.letter_probabilities()    # courses x result.band_letters
+    result.overall_gpa               # one overall GPA per sample
+
+Samples are split into fixed-size tasks, each seeded from its own
+``SeedSequence.spawn`` child and run on a process pool, so a seed gives
+the same result whatever the number of workers.
+"""
+import os
+
+import numpy as np
+
+import instrumentation
+from grade_calculator import GradeCalculator
+from grading_scales import GradingPolicy
+from process_pool import spawn_pool
+
+DEFAULT_SAMPLES = 1000
+SOURCES = ('assignment', 'student')
+# Samples per task; fixed so results do not depend on the worker count
+TASK_SAMPLES = 250
+# Sampled scores held per vectorized block (samples x ungraded rows)
+BLOCK_SIZE = 2_000_000
+# Width of the per-student GPA histogram bins
+GPA_BIN_WIDTH = 0.1
+
+
+def gpa_bins(max_points):
+    """Edges of the per-student GPA histogram: GPA_BIN_WIDTH wide from 0 to
+    ``max_points``, which falls in the last bin"""
+    return np.linspace(0.0, max_points, max(int(round(max_points / GPA_BIN_WIDTH)), 1) + 1)
+
+
+# GPA histogram edges of the built-in 4.0 scale
+GPA_BINS = gpa_bins(4.0)
+
+# Simulation inputs of the current process, set by _init_worker
+_worker = {}
+
+
+class SimulationResult:
+    """Accumulated outcome of ``samples`` simulated completions.
+
+    Per course segment: letter band counts and the sum and sum of squares
+    of the final grade. Band columns are the bands of every scale of the
+    grading policy, one scale after another (``band_letters``); a course
+    only ever lands in bands of its own scale. Per student: a GPA histogram
+    over ``gpa_bins`` (up to the policy's highest grade points) and the GPA
+    sum. ``overall_gpa`` keeps the overall GPA of
+    every sample.
+    """
+
+    def __init__(self, num_courses, num_students, policy=None):
+        policy = policy if policy is not None else GradingPolicy()
+        self.samples = 0
+        self.letter_counts = np.zeros((num_courses, len(policy.band_letters)), dtype=np.int64)
+        self.grade_sum = np.zeros(num_courses)
+        self.grade_sq_sum = np.zeros(num_courses)
+        self.gpa_bins = gpa_bins(policy.max_points())
+        self.student_gpa_counts = np.zeros((num_students, len(self.gpa_bins) - 1), dtype=np.int64)
+        self.student_gpa_sum = np.zeros(num_students)
+        self.overall_gpa = np.empty(0)
+        self.band_letters = list(policy.band_letters)
+        self.band_scale = policy.band_scale
+        # Labels, filled in by simulate()
+        self.course_names = []
+        self.student_ids = []
+        self.course_scales = np.full(num_courses, policy.scale_codes[policy.default], dtype=np.int64)
+
+    def merge(self, other):
+        """Add another result's samples (appended to ``overall_gpa`` in order)"""
+        self.samples += other.samples
+        self.letter_counts += other.letter_counts
+        self.grade_sum += other.grade_sum
+        self.grade_sq_sum += other.grade_sq_sum
+        self.student_gpa_counts += other.student_gpa_counts
+        self.student_gpa_sum += other.student_gpa_sum
+        self.overall_gpa = np.concatenate([self.overall_gpa, other.overall_gpa])
+
+    def letter_probabilities(self):
+        """(courses x band_letters) probability of finishing in each band"""
+        return self.letter_counts / max(self.samples, 1)
+
+    def course_letter_probabilities(self, index):
+        """(letters, probabilities) over the bands of course ``index``'s scale"""
+        bands = np.flatnonzero(self.band_scale == self.course_scales[index])
+        return [self.band_letters[band] for band in bands.tolist()], self.letter_probabilities()[index, bands]
+
+    def probability_at_least(self, letter):
+        """Per-course probability of finishing at ``letter`` or better on the
+        course's own scale; NaN for courses whose scale has no ``letter``"""
+        probabilities = self.letter_probabilities()
+        at_least = np.full(len(probabilities), np.nan)
+        for scale in np.unique(self.course_scales).tolist():
+            bands = np.flatnonzero(self.band_scale == scale)
+            letters = [self.band_letters[band] for band in bands.tolist()]
+            if letter in letters:
+                courses = self.course_scales == scale
+                at_least[courses] = probabilities[courses][:, bands[letters.index(letter)]:bands[-1] + 1].sum(axis=1)
+        return at_least
+
+    def expected_grades(self):
+        return self.grade_sum / max(self.samples, 1)
+
+    def grade_std(self):
+        mean = self.expected_grades()
+        return np.sqrt(np.maximum(self.grade_sq_sum / max(self.samples, 1) - mean * mean, 0.0))
+
+    def expected_student_gpas(self):
+        return dict(zip(self.student_ids, (self.student_gpa_sum / max(self.samples, 1)).tolist()))
+
+    def student_gpa_distribution(self, student_id):
+        """Probability of the student's GPA falling in each ``gpa_bins`` bin"""
+        return self.student_gpa_counts[self.student_ids.index(student_id)] / max(self.samples, 1)
+
+
+def _prepare(data_manager, source):
+    """Arrays the workers need: course sums, the ungraded rows and the
+    empirical pool each of them samples from"""
+    if source not in SOURCES:
+        raise ValueError(f"source must be one of {', '.join(SOURCES)}")
+
+    store = data_manager.store
+    score, weight, offsets = store.score, store.weight, store.offsets
+    percentages = data_manager.metrics.assignment_percentages()
+    graded = ~np.isnan(score)
+    ungraded = np.flatnonzero(~graded)
+    segment = GradeCalculator._row_segments(offsets)
+
+    if source == 'assignment':
+        keys = store.assignment_codes.astype(np.int64)
+    else:
+        keys = store.student_codes[segment].astype(np.int64)
+
+    # Graded percentages sorted by pool key; pool k is one contiguous slice
+    order = np.argsort(keys[graded], kind='stable')
+    pool_keys = keys[graded][order]
+    pool_values = percentages[graded][order]
+    if len(ungraded) and not len(pool_values):
+        raise ValueError("No graded scores to sample from")
+
+    start = np.searchsorted(pool_keys, keys[ungraded], side='left')
+    length = np.searchsorted(pool_keys, keys[ungraded], side='right') - start
+    empty = length == 0
+    start[empty] = 0
+    length[empty] = len(pool_values)
+
+    weighted_score, graded_weight = GradeCalculator.course_sums_batch(store)
+    return {
+        'weighted_score': weighted_score,
+        'graded_weight': graded_weight,
+        'segment': segment[ungraded],
+        'row_weight': weight[ungraded],
+        'pool_values': pool_values,
+        'pool_start': start,
+        'pool_length': length,
+        'student_codes': store.student_codes,
+        'num_students': len(store.student_table),
+        'policy': data_manager.grading,
+        'scale_codes': data_manager.grading.segment_scales(store),
+        'credits': data_manager.grading.segment_credits(store),
+    }
+
+
+def _init_worker(inputs):
+    _worker.clear()
+    _worker.update(inputs)
+
+
+def _run_task(task):
+    """Simulate ``samples`` completions with a generator seeded by ``seed_sequence``"""
+    seed_sequence, samples = task
+    rng = np.random.default_rng(seed_sequence)
+    weighted_score, graded_weight = _worker['weighted_score'], _worker['graded_weight']
+    segment, row_weight = _worker['segment'], _worker['row_weight']
+    pool_values, pool_start, pool_length = _worker['pool_values'], _worker['pool_start'], _worker['pool_length']
+    student_codes, num_students = _worker['student_codes'], _worker['num_students']
+    policy, scale_codes, credits = _worker['policy'], _worker['scale_codes'], _worker['credits']
+
+    num_courses = len(weighted_score)
+    letters = len(policy.band_letters)
+    result = SimulationResult(num_courses, num_students, policy)
+    num_gpa_bins = len(result.gpa_bins) - 1
+    has_student = student_codes >= 0
+    course_bins = np.arange(num_courses) * letters
+    overall = []
+
+    # Every ungraded row gets a score, so each course's weight is fixed and
+    # only the weighted sum varies between samples
+    total_weight = graded_weight + np.bincount(segment, weights=row_weight, minlength=num_courses)
+    row_fraction = row_weight / 100
+    block = max(1, min(samples, BLOCK_SIZE // max(len(segment), 1)))
+    # Sample i's courses are bins i*courses...
+    block_bins = (segment + num_courses * np.arange(block)[:, None]).ravel()
+
+    for done in range(0, samples, block):
+        size = min(block, samples - done)
+        picks = pool_start + (rng.random((size, len(segment))) * pool_length).astype(np.int64)
+        extra = np.bincount(block_bins[:size * len(segment)], weights=(pool_values[picks] * row_fraction).ravel(),
+                            minlength=size * num_courses).reshape(size, num_courses)
+        grades = GradeCalculator.grades_from_sums(weighted_score + extra, total_weight)
+
+        band = policy.bands(grades, scale_codes)
+        result.letter_counts += np.bincount((course_bins + band).ravel(),
+                                            minlength=num_courses * letters).reshape(num_courses, letters)
+        result.grade_sum += grades.sum(axis=0)
+        result.grade_sq_sum += (grades * grades).sum(axis=0)
+
+        points = policy.band_points[band] * credits
+        counted = grades >= 0
+        credit_total = np.where(counted, credits, 0.0).sum(axis=1)
+        point_total = np.where(counted, points, 0.0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overall.append(np.where(credit_total > 0, point_total / credit_total, 0.0))
+
+        if num_students:
+            mask = counted & has_student
+            # Sample i's students are bins i*students...
+            bins = (student_codes + num_students * np.arange(size)[:, None])[mask]
+            totals = np.bincount(bins, weights=points[mask], minlength=size * num_students)
+            counts = np.bincount(bins, weights=np.broadcast_to(credits, mask.shape)[mask],
+                                 minlength=size * num_students)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                gpas = np.where(counts > 0, totals / counts, 0.0).reshape(size, num_students)
+            gpa_bin = np.clip(np.searchsorted(result.gpa_bins, gpas, side='right') - 1, 0, num_gpa_bins - 1)
+            result.student_gpa_counts += np.bincount(
+                (np.arange(num_students) * num_gpa_bins + gpa_bin).ravel(),
+                minlength=num_students * num_gpa_bins).reshape(num_students, num_gpa_bins)
+            result.student_gpa_sum += gpas.sum(axis=0)
+        result.samples += size
+
+    result.overall_gpa = np.concatenate(overall) if overall else np.empty(0)
+    return result
+
+
+def simulate(data_manager, samples=DEFAULT_SAMPLES, source='assignment', seed=None, workers=None):
+    """Simulate ``samples`` completions of every course's ungraded work.
+
+    ``workers`` processes share the tasks (default: one per core, at most
+    one per task; 1 runs in this process). Returns a SimulationResult.
+    """
+    store = data_manager.store
+    with instrumentation.span('simulate', samples=samples, source=source):
+        inputs = _prepare(data_manager, source)
+        seeds = np.random.SeedSequence(seed).spawn(-(-samples // TASK_SAMPLES))
+        tasks = [(child, min(TASK_SAMPLES, samples - index * TASK_SAMPLES)) for index, child in enumerate(seeds)]
+
+        if workers is None:
+            workers = min(os.cpu_count() or 1, len(tasks))
+        result = SimulationResult(len(store), len(store.student_table), data_manager.grading)
+        if workers <= 1:
+            _init_worker(inputs)
+            try:
+                for task in tasks:
+                    result.merge(_run_task(task))
+            finally:
+                _worker.clear()
+        else:
+            with spawn_pool(workers, initializer=_init_worker, initargs=(inputs,)) as executor:
+                for partial in executor.map(_run_task, tasks):
+                    result.merge(partial)
+
+    instrumentation.count('samples_simulated', result.samples)
+    table = store.course_table
+    result.course_names = [table[code] for code in store.course_codes.tolist()]
+    result.student_ids = list(store.student_table)
+    result.course_scales = inputs['scale_codes']
+    return result
@@ -0,0 +1,239 @@
+"""Grading scales defined as data and compiled to lookup arrays.
+
+A scale lists its letter bands (lowest percentage and grade points of
+each) and, optionally, the coarser bands charts group grades into. A
+GradingPolicy names several scales, says which scale and how many credit
+hours each course has, and compiles them so the grade points of every
+course -- whatever its scale -- come from one ``np.searchsorted``. Policies
+are read from JSON::
+
+    {
+      "default": "percent",
+      "scales": {
+        "percent": {"bands": [{"letter": "F", "min": 0, "points": 0.0},
+                              {"letter": "P", "min": 50, "points": 4.0}],
+                    "chart_bands": [{"label": "F", "min": 0}, {"label": "P", "min": 50}]}
+      },
+      "courses": {"CPSC 3720": {"scale": "percent", "credits": 3}}
+    }
+
+A band's ``min`` is inclusive; grades below the lowest band's ``min``
+still get the lowest band. Courses not listed use the default scale and
+one credit hour.
+"""
+import json
+
+import numpy as np
+
+DEFAULT_SCALE_NAME = 'default'
+# (letter, lowest percentage, grade points) of the built-in scale
+DEFAULT_BANDS = [('F', 0, 0.0), ('D', 50, 1.0), ('C-', 55, 1.7), ('C', 60, 2.0), ('C+', 65, 2.3),
+                 ('B-', 70, 2.7), ('B', 75, 3.0), ('B+', 80, 3.3), ('A-', 85, 3.7), ('A', 90, 4.0)]
+# (label, lowest percentage) of the bands charts group grades into
+DEFAULT_CHART_BANDS = [('F', 0), ('D', 60), ('C', 70), ('B', 80), ('A', 90)]
+
+
+class GradingScale:
+    """Letter bands of one scale compiled to sorted arrays.
+
+    ``cutoffs`` holds the lowest percentage of every band but the first,
+    so ``np.searchsorted(cutoffs, grade, side='right')`` is the band
+    index into ``letters`` and ``points``. ``chart_labels`` and
+    ``chart_cutoffs`` do the same for the chart bands.
+    """
+
+    def __init__(self, name, bands, chart_bands=None):
+        if not bands:
+            raise ValueError(f"Scale {name!r} has no bands")
+        bands = sorted(bands, key=lambda band: band[1])
+        chart_bands = sorted(chart_bands or [(letter, low) for letter, low, _ in bands], key=lambda band: band[1])
+        for kind, table in (('band', bands), ('chart band', chart_bands)):
+            lows = [band[1] for band in table]
+            if len(set(lows)) != len(lows):
+                raise ValueError(f"Scale {name!r} has two {kind}s starting at the same percentage")
+
+        self.name = name
+        self.letters = [letter for letter, _, _ in bands]
+        self.lower_bounds = np.array([low for _, low, _ in bands], dtype=np.float64)
+        self.cutoffs = self.lower_bounds[1:]
+        self.points = np.array([points for _, _, points in bands], dtype=np.float64)
+        self.chart_labels = [label for label, _ in chart_bands]
+        self.chart_lower_bounds = np.array([low for _, low in chart_bands], dtype=np.float64)
+        self.chart_cutoffs = self.chart_lower_bounds[1:]
+
+    def __len__(self):
+        return len(self.letters)
+
+    def band_index(self, grades):
+        return np.searchsorted(self.cutoffs, grades, side='right')
+
+    def points_for(self, grades):
+        return self.points[self.band_index(grades)]
+
+    def letter_for(self, grade):
+        return self.letters[int(self.band_index(grade))]
+
+    def chart_band_index(self, grades):
+        return np.searchsorted(self.chart_cutoffs, grades, side='right')
+
+    def chart_bins(self):
+        """Chart band edges from 0 to 100, as np.histogram bins"""
+        return np.concatenate([[0.0], self.chart_cutoffs, [100.0]])
+
+    def letter_points(self, letter):
+        """Grade points of ``letter``, or None if the scale has no such letter"""
+        if letter not in self.letters:
+            return None
+        return float(self.points[self.letters.index(letter)])
+
+    @classmethod
+    def from_dict(cls, name, data):
+        try:
+            bands = [(band['letter'], float(band['min']), float(band['points'])) for band in data['bands']]
+            chart_bands = [(band['label'], float(band['min'])) for band in data.get('chart_bands', [])]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid scale {name!r}: {e}") from e
+        return cls(name, bands, chart_bands or None)
+
+    def to_dict(self):
+        return {
+            'bands': [{'letter': letter, 'min': float(low), 'points': float(points)}
+                      for letter, low, points in zip(self.letters, self.lower_bounds, self.points)],
+            'chart_bands': [{'label': label, 'min': float(low)}
+                            for label, low in zip(self.chart_labels, self.chart_lower_bounds)]
+        }
+
+
+DEFAULT_SCALE = GradingScale(DEFAULT_SCALE_NAME, DEFAULT_BANDS, DEFAULT_CHART_BANDS)
+
+
+class GradingPolicy:
+    """Named grading scales plus each course's scale and credit hours.
+
+    The bands of all scales are numbered one after another (``band_letters``,
+    ``band_points``, ``band_scale``). A grade is located once among the
+    sorted cutoffs of every scale, and a (scale x rank) table turns that
+    rank into the band of the course's own scale, so points for courses on
+    different scales come from one searchsorted and one lookup.
+    """
+
+    def __init__(self, scales=None, course_scales=None, course_credits=None, default=DEFAULT_SCALE_NAME):
+        scales = list(scales) if scales is not None else [DEFAULT_SCALE]
+        if default not in [scale.name for scale in scales]:
+            if default != DEFAULT_SCALE_NAME:
+                raise ValueError(f"Unknown default scale {default!r}")
+            scales.insert(0, DEFAULT_SCALE)
+        self.scales = scales
+        self.scale_codes = {scale.name: code for code, scale in enumerate(scales)}
+        if len(self.scale_codes) != len(scales):
+            raise ValueError("Scale names must be unique")
+        self.default = default
+        self.course_scales = dict(course_scales or {})
+        self.course_credits = {course: float(credits) for course, credits in (course_credits or {}).items()}
+        unknown = set(self.course_scales.values()) - set(self.scale_codes)
+        if unknown:
+            raise ValueError(f"Unknown scale(s): {', '.join(sorted(unknown))}")
+
+        self.band_letters = [letter for scale in scales for letter in scale.letters]
+        self.band_points = np.concatenate([scale.points for scale in scales])
+        self.band_lower_bounds = np.concatenate([scale.lower_bounds for scale in scales])
+        self.band_scale = np.repeat(np.arange(len(scales)), [len(scale) for scale in scales])
+        self.band_offsets = np.concatenate([[0], np.cumsum([len(scale) for scale in scales])])
+
+        # A grade's rank among all cutoffs fixes its band in every scale:
+        # each scale's cutoffs are a subset of the union
+        self._cutoffs = np.unique(np.concatenate([scale.cutoffs for scale in scales]))
+        lower = np.concatenate([[-np.inf], self._cutoffs])
+        self._band_table = np.array([offset + np.searchsorted(scale.cutoffs, lower, side='right')
+                                     for scale, offset in zip(scales, self.band_offsets)], dtype=np.int64)
+
+    @property
+    def default_scale(self):
+        return self.scales[self.scale_codes[self.default]]
+
+    def scale_code(self, course_name):
+        return self.scale_codes[self.course_scales.get(course_name, self.default)]
+
+    def scale_for(self, course_name):
+        return self.scales[self.scale_code(course_name)]
+
+    def credits_for(self, course_name):
+        return self.course_credits.get(course_name, 1.0)
+
+    def segment_scales(self, store):
+        """Scale code of every course segment of ``store``"""
+        codes = np.array([self.scale_code(name) for name in store.course_table], dtype=np.int64)
+        return codes[store.course_codes] if len(codes) else np.zeros(len(store), dtype=np.int64)
+
+    def segment_credits(self, store):
+        """Credit hours of every course segment of ``store``"""
+        credits = np.array([self.credits_for(name) for name in store.course_table], dtype=np.float64)
+        return credits[store.course_codes] if len(credits) else np.ones(len(store))
+
+    def segment_cutoffs(self, store):
+        """(segments x cutoffs) letter cutoffs of every course segment's scale,
+        padded with NaN for scales with fewer bands"""
+        width = max(len(scale.cutoffs) for scale in self.scales)
+        table = np.full((len(self.scales), width), np.nan)
+        for code, scale in enumerate(self.scales):
+            table[code, :len(scale.cutoffs)] = scale.cutoffs
+        return table[self.segment_scales(store)]
+
+    def max_points(self):
+        """Highest grade points any scale awards"""
+        return float(self.band_points.max())
+
+    def bands(self, grades, scale_codes):
+        """Global band index of each grade on its course's scale"""
+        return self._band_table[scale_codes, np.searchsorted(self._cutoffs, grades, side='right')]
+
+    def points(self, grades, scale_codes):
+        return self.band_points[self.bands(grades, scale_codes)]
+
+    def letters(self, grades, scale_codes):
+        return [self.band_letters[band] for band in np.ravel(self.bands(grades, scale_codes)).tolist()]
+
+    def is_default(self):
+        """True if every course is graded on the built-in scale with one credit"""
+        return (self.default_scale is DEFAULT_SCALE and not self.course_credits
+                and all(self.scales[self.scale_codes[name]] is DEFAULT_SCALE
+                        for name in self.course_scales.values()))
+
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            scales = [GradingScale.from_dict(name, scale) for name, scale in data.get('scales', {}).items()]
+            course_scales, course_credits = {}, {}
+            for course, settings in data.get('courses', {}).items():
+                if 'scale' in settings:
+                    course_scales[course] = settings['scale']
+                if 'credits' in settings:
+                    course_credits[course] = float(settings['credits'])
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid grading policy: {e}") from e
+        return cls(scales, course_scales, course_credits, data.get('default', DEFAULT_SCALE_NAME))
+
+    def to_dict(self):
+        courses = {}
+        for course, scale in self.course_scales.items():
+            courses.setdefault(course, {})['scale'] = scale
+        for course, credits in self.course_credits.items():
+            courses.setdefault(course, {})['credits'] = credits
+        return {'default': self.default,
+                'scales': {scale.name: scale.to_dict() for scale in self.scales},
+                'courses': courses}
+
+
+def load_policy(filename):
+    """Read a GradingPolicy from a JSON file; raises OSError or ValueError"""
+    with open(filename) as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid grading policy file: {e}") from e
+    return GradingPolicy.from_dict(data)
+
+
+def save_policy(policy, filename):
+    with open(filename, 'w') as f:
+        json.dump(policy.to_dict(), f, indent=2)
@@ -0,0 +1,115 @@
+import numpy as np
+
+# Formatted assignment rows kept for this many recently opened courses
+ASSIGNMENT_CACHE_SIZE = 256
+
+
+class InfoRowModel:
+    """Formatted rows for the information panel, built on demand.
+
+    The panel is a list of lines: one per course segment, followed by the
+    assignment lines of every opened course. lines() maps a window of line
+    numbers to (course, assignment) indices and rows are formatted only for
+    the lines the panel shows, so drawing costs the same for ten courses or
+    a million. Formatted assignment rows are kept for the most recently
+    opened courses. The model describes one data version: build a new one
+    after the DataManager changes.
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.version = data_manager.version
+        self.open_courses = set()
+        self._course_columns = None
+        self._assignment_rows = {}
+
+    def __len__(self):
+        return len(self.data_manager.store)
+
+    def is_current(self):
+        return self.version == self.data_manager.version
+
+    def _columns(self):
+        """(assignment count, graded count, grade) arrays of every course segment"""
+        if self._course_columns is None:
+            store = self.data_manager.store
+            counts = np.diff(store.offsets)
+            graded_before = np.concatenate([[0], np.cumsum(~np.isnan(store.score))])
+            graded = graded_before[store.offsets[1:]] - graded_before[store.offsets[:-1]]
+            self._course_columns = counts, graded, self.data_manager.metrics.course_grades()
+        return self._course_columns
+
+    def course_row(self, index):
+        """(label, assignment count, graded count, grade) text for course segment ``index``"""
+        store = self.data_manager.store
+        counts, graded, grades = self._columns()
+        label = store.course_table[store.course_codes[index]]
+        student = store.student_codes[index]
+        if student >= 0:
+            label = f"{label}  [{store.student_table[student]}]"
+        return label, f"{counts[index]} assignments", f"{graded[index]} graded", f"{grades[index]:.2f}%"
+
+    def assignment_count(self, index):
+        offsets = self.data_manager.store.offsets
+        return int(offsets[index + 1] - offsets[index])
+
+    def line_count(self):
+        return len(self) + sum(self.assignment_count(index) for index in self.open_courses)
+
+    def lines(self, start, count):
+        """(course, assignment) indices of up to ``count`` lines from line ``start``;
+        assignment is None on a course's own line"""
+        # Walk the opened courses before ``start`` to find its course
+        course, assignment, skipped = None, None, 0
+        for index in sorted(self.open_courses):
+            course_line = index + skipped
+            if start <= course_line:
+                break
+            size = self.assignment_count(index)
+            if start <= course_line + size:
+                course, assignment = index, start - course_line - 1
+                break
+            skipped += size
+        if course is None:
+            course = start - skipped
+
+        lines = []
+        total = len(self)
+        while len(lines) < count and course < total:
+            lines.append((course, assignment))
+            if assignment is None and course in self.open_courses and self.assignment_count(course):
+                assignment = 0
+            elif assignment is not None and assignment + 1 < self.assignment_count(course):
+                assignment += 1
+            else:
+                course, assignment = course + 1, None
+        return lines
+
+    def assignment_rows(self, index):
+        """(name, weight, score, percentage) text for the assignments of segment ``index``"""
+        rows = self._assignment_rows.pop(index, None)
+        if rows is None:
+            store = self.data_manager.store
+            start, end = int(store.offsets[index]), int(store.offsets[index + 1])
+            percentages = self.data_manager.metrics.assignment_percentages()[start:end].tolist()
+            names = store.assignment_table
+            rows = []
+            for code, weight, score, max_score, percentage in zip(
+                    store.assignment_codes[start:end].tolist(), store.weight[start:end].tolist(),
+                    store.score[start:end].tolist(), store.max_score[start:end].tolist(), percentages):
+                if score == score:
+                    rows.append((names[code], f"{weight:5.1f}%", f"{score:5.1f}/{max_score:5.1f}",
+                                 f"{percentage:5.1f}%"))
+                else:
+                    rows.append((names[code], f"{weight:5.1f}%", "Not yet graded", ""))
+            if len(self._assignment_rows) >= ASSIGNMENT_CACHE_SIZE:
+                del self._assignment_rows[next(iter(self._assignment_rows))]
+        # Re-inserted last, so the dict stays in least recently used order
+        self._assignment_rows[index] = rows
+        return rows
+
+    def summary(self):
+        store = self.data_manager.store
+        return {'courses': len(store), 'assignments': store.num_rows,
+                'graded': int(np.count_nonzero(~np.isnan(store.score))),
+                'gpa': self.data_manager.metrics.gpa()}
@@ -0,0 +1,88 @@
+import grade_simulator
+import instrumentation
+from course_index import CoursePrefixIndex
+from grade_calculator import GradeCalculator
+
+
+class MetricsCache:
+    """Derived grade metrics for one DataManager, memoized per data version.
+    
+    DataManager bumps its ``version`` on every load, add_course and edit;
+    entries computed for an older version are recomputed on next access.
+    Course grades, points and GPAs come from the DataManager's running
+    GradeTotals, which edits keep current without a recompute. Returned
+    arrays are shared and must not be modified by callers.
+    """
+    
+    def __init__(self, data_manager):
+        self._data_manager = data_manager
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute`` if stale"""
+        version = self._data_manager.version
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            instrumentation.count('metrics_cache_hits', key=key)
+            return entry[1]
+        
+        self.misses += 1
+        instrumentation.count('metrics_cache_misses', key=key)
+        with instrumentation.span('compute_metric', key=key):
+            value = compute()
+        self._entries[key] = (version, value)
+        return value
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def course_grades(self):
+        return self._data_manager.grade_totals().grades
+    
+    def course_points(self):
+        return self._data_manager.grade_totals().points
+    
+    def gpa(self):
+        return self._data_manager.grade_totals().gpa()
+    
+    def student_gpas(self):
+        def compute():
+            totals = self._data_manager.grade_totals()
+            students = self._data_manager.store.student_table
+            return {student_id: totals.student_gpa(code) for code, student_id in enumerate(students)}
+        return self.get('student_gpas', compute)
+    
+    def assignment_percentages(self):
+        """Percentage of every assignment row; NaN where ungraded"""
+        def compute():
+            store = self._data_manager.store
+            return GradeCalculator.assignment_percentages(store.score, store.max_score)
+        return self.get('assignment_percentages', compute)
+    
+    def grade_distribution_counts(self):
+        """Graded assignments per chart band of the default grading scale"""
+        return self.get('grade_distribution_counts', lambda: GradeCalculator.grade_distribution_counts(
+            self.assignment_percentages(), self._data_manager.grading.default_scale.chart_bins()))
+    
+    def course_index(self):
+        """Type-ahead prefix index over the distinct course names"""
+        return self.get('course_index', lambda: CoursePrefixIndex(self._data_manager.store.course_table))
+    
+    def required_scores(self):
+        """Per-course percentage needed on remaining work for each letter
+        cutoff of the course's own grading scale (columns past the scale's
+        last cutoff are NaN)"""
+        def compute():
+            totals = self._data_manager.grade_totals()
+            store = self._data_manager.store
+            return GradeCalculator.required_scores_batch(
+                store, cutoffs=self._data_manager.grading.segment_cutoffs(store),
+                sums=(totals.weighted_score, totals.graded_weight))
+        return self.get('required_scores', compute)
+    
+    def grade_simulation(self):
+        """Monte Carlo outlook of the ungraded work; seeded, so stable per version"""
+        return self.get('grade_simulation', lambda: grade_simulator.simulate(self._data_manager, seed=0))
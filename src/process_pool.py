@@ -0,0 +1,13 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def spawn_pool(max_workers=None, **kwargs):
+    """ProcessPoolExecutor whose workers are started with 'spawn'.
+
+    A forked worker inherits a copy of every thread of this process (e.g.
+    Tk's, or a loader thread) frozen mid-flight, including any locks they
+    hold; spawned workers start a fresh interpreter instead.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                               **kwargs)
@@ -0,0 +1,120 @@
+"""GradeVision snapshot files (.gvs) for zero-copy opening of grade data.
+
+A snapshot is a single file laid out as::
+
+    b'GVSNAP01' | uint64 header length | JSON header | padding | arrays
+
+The JSON header holds the course, assignment and student name tables and,
+for every column of the CourseStore, its dtype, length and byte offset
+relative to the start of the array section. Each array starts on a 64-byte
+boundary so it can be mapped directly with np.memmap; opening a snapshot
+reads only the header, and column pages are read when first touched.
+"""
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from course_store import CourseStore
+
+SNAPSHOT_EXTENSION = '.gvs'
+MAGIC = b'GVSNAP01'
+VERSION = 1
+ALIGNMENT = 64
+
+# Fixed on-disk dtype of every column (little-endian)
+COLUMNS = {
+    'course_codes': '<i4',
+    'student_codes': '<i4',
+    'offsets': '<i8',
+    'assignment_codes': '<i4',
+    'weight': '<f8',
+    'score': '<f8',
+    'max_score': '<f8'
+}
+
+_PREAMBLE = struct.Struct('<8sQ')
+
+
+def _align(position):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(store, filename):
+    """Write ``store`` to ``filename`` in the snapshot layout"""
+    arrays = {name: np.ascontiguousarray(getattr(store, name), dtype=dtype)
+              for name, dtype in COLUMNS.items()}
+
+    columns = {}
+    position = 0
+    for name, array in arrays.items():
+        position = _align(position)
+        columns[name] = {'dtype': COLUMNS[name], 'length': len(array), 'offset': position}
+        position += array.nbytes
+
+    header = json.dumps({
+        'version': VERSION,
+        'course_table': list(store.course_table),
+        'assignment_table': list(store.assignment_table),
+        'student_table': list(store.student_table),
+        'columns': columns
+    }).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    # Write beside the target and swap it in: the columns may be memory-mapped
+    # views of ``filename`` itself, which truncating it in place would pull
+    # out from under the mapping
+    fd, temp_filename = tempfile.mkstemp(suffix=SNAPSHOT_EXTENSION,
+                                         dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREAMBLE.pack(MAGIC, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + columns[name]['offset'])
+                f.write(array.tobytes())
+            # Make sure the file covers the final (possibly empty) column
+            f.truncate(data_start + position)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        os.remove(temp_filename)
+        raise
+
+
+def read_header(filename):
+    """Return (header dict, byte offset of the array section)"""
+    with open(filename, 'rb') as f:
+        magic, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a GradeVision snapshot")
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    if header['version'] != VERSION:
+        raise ValueError(f"Unsupported snapshot version {header['version']}")
+    return header, _align(_PREAMBLE.size + header_length)
+
+
+def open_snapshot(filename, mode='c'):
+    """Open a snapshot as a CourseStore whose columns are memory-mapped.
+
+    The default copy-on-write mode lets the store be edited in memory without
+    touching the file, while unmodified pages stay shared in the page cache
+    across processes.
+    """
+    header, data_start = read_header(filename)
+
+    arrays = {}
+    for name, column in header['columns'].items():
+        if column['length'] == 0:
+            # np.memmap cannot map zero bytes
+            arrays[name] = np.empty(0, dtype=column['dtype'])
+        else:
+            arrays[name] = np.memmap(filename, dtype=column['dtype'], mode=mode,
+                                     offset=data_start + column['offset'],
+                                     shape=(column['length'],))
+
+    return CourseStore.from_columns(
+        header['course_table'], header['assignment_table'], header['student_table'],
+        **arrays
+    )
@@ -1,49 +1,164 @@
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import OrderedDict
 import sys
 import os
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__)))
-from grade_calculator import GradeCalculator
+import instrumentation
+from grading_scales import DEFAULT_SCALE
+
+# matplotlib is imported by the methods that draw, so importing this module
+# (e.g. for COURSE_PLOT_TYPES or RenderCache) does not load a plotting backend.
+
+# Chart types that can be limited to a single course
+COURSE_PLOT_TYPES = ('assignment_performance', 'weight_distribution', 'grade_simulation')
+
+# Bar colors of the top three chart bands of a scale (e.g. A, B, C), best
+# first; lower bands use BELOW_BAND_COLOR
+BAND_COLORS = ('#2E86AB', '#A23B72', '#F18F01')
+BELOW_BAND_COLOR = '#C73E1D'
+# Threshold line colors for the same three bands
+THRESHOLD_COLORS = ('green', 'blue', 'orange')
+# Grade distribution bar colors, lowest band first; scales with fewer chart
+# bands use the last ones
+DISTRIBUTION_COLORS = ('#C73E1D', '#F18F01', '#A23B72', '#2E86AB', '#06A77D')
 
 class GradeVisualizer:
+    # Above this many graded assignments, plot_assignment_performance draws
+    # per-course density strips instead of one labelled bar per assignment
+    ASSIGNMENT_DETAIL_LIMIT = 200
+    # Score bins (percent) of each density strip
+    DENSITY_BINS = 20
+    
+    @staticmethod
+    def plot(viz_type, data_manager, course_name=None, figure=None):
+        """Draw chart ``viz_type`` (a key of the UI's visualization menu)"""
+        plotters = {
+            'course_grades': lambda: GradeVisualizer.plot_course_grades(data_manager, figure),
+            'assignment_performance': lambda: GradeVisualizer.plot_assignment_performance(
+                data_manager, course_name, figure),
+            'grade_distribution': lambda: GradeVisualizer.plot_grade_distribution(data_manager, figure),
+            'weight_distribution': lambda: GradeVisualizer.plot_weight_distribution(
+                data_manager, course_name, figure),
+            'gpa': lambda: GradeVisualizer.plot_gpa_trend(data_manager, figure),
+            'grade_simulation': lambda: GradeVisualizer.plot_grade_simulation(data_manager, course_name, figure)
+        }
+        if viz_type not in plotters:
+            raise ValueError(f"Unknown visualization type: {viz_type}")
+        
+        with instrumentation.span('plot', chart=viz_type):
+            figure = plotters[viz_type]()
+        if instrumentation.enabled():
+            instrumentation.count('artists_drawn', GradeVisualizer.count_artists(figure), chart=viz_type)
+        return figure
+    
+    @staticmethod
+    def count_artists(figure):
+        """Number of data artists (bars, lines, images, text labels) in a figure"""
+        return sum(len(ax.patches) + len(ax.lines) + len(ax.images) + len(ax.collections) + len(ax.texts)
+                   for ax in figure.axes)
+    
+    @staticmethod
+    def render_rgba(data_manager, viz_type, course_name=None, figsize=(10, 6), dpi=100):
+        """Render a chart off-screen with the Agg backend.
+        
+        Uses only a standalone Figure (no pyplot state), so it is safe to
+        call from a worker thread. Returns an (height, width, 4) uint8 array.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        
+        figure = Figure(figsize=figsize, dpi=dpi)
+        canvas = FigureCanvasAgg(figure)
+        with instrumentation.span('render', chart=viz_type):
+            GradeVisualizer.plot(viz_type, data_manager, course_name, figure)
+            with instrumentation.span('draw', chart=viz_type):
+                canvas.draw()
+            return np.array(canvas.buffer_rgba())
+    
+    @staticmethod
+    def grade_colors(percentages, scale=DEFAULT_SCALE):
+        """Bar colors for percentages by the chart band they fall in on
+        ``scale``: one color for each of the top three bands, then red"""
+        below_top = len(scale.chart_labels) - 1 - scale.chart_band_index(np.asarray(percentages, dtype=np.float64))
+        palette = np.array(BAND_COLORS + (BELOW_BAND_COLOR,), dtype=object)
+        return palette[np.minimum(below_top, len(BAND_COLORS))].tolist()
+    
+    @staticmethod
+    def grade_color(percentage, scale=DEFAULT_SCALE):
+        """Bar color for one percentage, as grade_colors"""
+        return GradeVisualizer.grade_colors([percentage], scale)[0]
+    
+    @staticmethod
+    def course_colors(data_manager, grades):
+        """Bar color of every course grade on the scale of its course"""
+        policy = data_manager.grading
+        grades = np.asarray(grades, dtype=np.float64)
+        scale_codes = policy.segment_scales(data_manager.store)
+        colors = np.empty(len(grades), dtype=object)
+        for code in np.unique(scale_codes).tolist():
+            courses = scale_codes == code
+            colors[courses] = GradeVisualizer.grade_colors(grades[courses], policy.scales[code])
+        return colors.tolist()
+    
+    @staticmethod
+    def top_bands(scale):
+        """(label, lowest percentage) of up to three highest chart bands above
+        the lowest one, best first"""
+        bands = list(zip(scale.chart_labels[1:], scale.chart_cutoffs.tolist()))
+        return bands[::-1][:len(THRESHOLD_COLORS)]
+    
     @staticmethod
     def calculate_percentage(score, max_score):
         if max_score == 0:
             return 0
         return (score / max_score) * 100
     
+    @staticmethod
+    def course_means(store, grades):
+        """(course names, mean grade) over every segment of each course name,
+        in order of first appearance"""
+        codes = store.course_codes
+        counts = np.bincount(codes, minlength=len(store.course_table))
+        sums = np.bincount(codes, weights=grades, minlength=len(store.course_table))
+        present = np.flatnonzero(counts)
+        return [store.course_table[code] for code in present.tolist()], (sums[present] / counts[present]).tolist()
+    
     @staticmethod
     def plot_course_grades(data_manager, figure=None):
         if figure is None:
+            import matplotlib.pyplot as plt
             figure, ax = plt.subplots(figsize=(10, 6))
         else:
             ax = figure.gca()
             ax.clear()
         
-        courses = data_manager.courses
-        course_names = []
-        course_grades = []
+        course_names = data_manager.get_course_names()
+        course_grades = data_manager.metrics.course_grades().tolist()
+        title = 'Course Grades Overview'
         
-        for course in courses:
-            grade = GradeCalculator.calculate_course_grade(course['assignments'])
-            course_names.append(course['name'])
-            course_grades.append(grade)
+        if len(set(course_names)) < len(course_names):
+            # Cohort data: one bar per course with the mean over its students
+            store = data_manager.store
+            course_names, course_grades = GradeVisualizer.course_means(store, course_grades)
+            policy = data_manager.grading
+            colors = [GradeVisualizer.grade_color(grade, policy.scale_for(name))
+                      for name, grade in zip(course_names, course_grades)]
+            title = f'Mean Course Grades ({len(store.student_table)} students)'
+        elif course_grades:
+            colors = GradeVisualizer.course_colors(data_manager, course_grades)
         
         if course_grades:
-            colors = ['#2E86AB' if g >= 90 else '#A23B72' if g >= 80 else '#F18F01' if g >= 70 else '#C73E1D' for g in course_grades]
             bars = ax.bar(course_names, course_grades, color=colors, edgecolor='black', linewidth=1.5)
             ax.set_ylabel('Grade (%)', fontsize=12, fontweight='bold')
             ax.set_xlabel('Course', fontsize=12, fontweight='bold')
-            ax.set_title('Course Grades Overview', fontsize=14, fontweight='bold', pad=20)
+            ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
             ax.set_ylim(0, 100)
             ax.grid(axis='y', alpha=0.3, linestyle='--')
-            ax.axhline(y=90, color='green', linestyle='--', alpha=0.5, label='A (90%)')
-            ax.axhline(y=80, color='blue', linestyle='--', alpha=0.5, label='B (80%)')
-            ax.axhline(y=70, color='orange', linestyle='--', alpha=0.5, label='C (70%)')
+            for (label, low), color in zip(GradeVisualizer.top_bands(data_manager.grading.default_scale),
+                                           THRESHOLD_COLORS):
+                ax.axhline(y=low, color=color, linestyle='--', alpha=0.5, label=f'{label} ({low:g}%)')
             
             # Add value labels on bars
             for bar in bars:
@@ -53,7 +168,8 @@ class GradeVisualizer:
                        ha='center', va='bottom', fontweight='bold')
             
             ax.legend(loc='upper right')
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+            for label in ax.xaxis.get_majorticklabels():
+                label.set(rotation=45, ha='right')
         
         figure.tight_layout()
         return figure
@@ -61,18 +177,35 @@ class GradeVisualizer:
     @staticmethod
     def plot_assignment_performance(data_manager, course_name=None, figure=None):
         if figure is None:
+            import matplotlib.pyplot as plt
             figure, ax = plt.subplots(figsize=(12, 6))
         else:
             ax = figure.gca()
             ax.clear()
         
-        courses = data_manager.courses
+        store = data_manager.store
+        percentages = data_manager.metrics.assignment_percentages()
+        row_courses = store.course_codes[store.row_course_index()]
         if course_name:
-            courses = [c for c in courses if c['name'] == course_name]
+            segments = store.segments_for(course_name)
+            rows = np.concatenate([np.arange(*store.segment_rows(s)) for s in segments] or [[]]).astype(np.int64)
+            percentages, row_courses = percentages[rows], row_courses[rows]
+        graded = ~np.isnan(percentages)
+        if graded.sum() > GradeVisualizer.ASSIGNMENT_DETAIL_LIMIT:
+            GradeVisualizer._plot_assignment_density(
+                ax, store.course_table, row_courses[graded], percentages[graded], course_name)
+            figure.tight_layout()
+            return figure
+        
+        if course_name:
+            courses = data_manager.get_courses_by_name(course_name)
+        else:
+            courses = data_manager.courses
         
         assignment_names = []
         percentages = []
-        colors_list = []
+        scales = []
+        policy = data_manager.grading
         
         for course in courses:
             for assignment in course['assignments']:
@@ -82,9 +215,11 @@ class GradeVisualizer:
                     )
                     assignment_names.append(f"{course['name']}\n{assignment['name']}")
                     percentages.append(percentage)
-                    colors_list.append('#2E86AB' if percentage >= 90 else '#A23B72' if percentage >= 80 else '#F18F01' if percentage >= 70 else '#C73E1D')
+                    scales.append(policy.scale_for(course['name']))
         
         if percentages:
+            colors_list = [GradeVisualizer.grade_color(percentage, scale)
+                           for percentage, scale in zip(percentages, scales)]
             bars = ax.bar(range(len(assignment_names)), percentages, color=colors_list, edgecolor='black', linewidth=1)
             ax.set_xticks(range(len(assignment_names)))
             ax.set_xticklabels(assignment_names, rotation=45, ha='right', fontsize=9)
@@ -106,39 +241,72 @@ class GradeVisualizer:
         return figure
     
     @staticmethod
-    def plot_grade_distribution(data_manager, figure=None):
-        """Plot grade distribution histogram"""
+    def _plot_assignment_density(ax, course_table, course_codes, percentages, course_name=None):
+        """Draw one score-density strip per course plus a mean score line.
+        
+        The strips are a single image, so cost does not grow with the number
+        of assignments drawn.
+        """
+        codes, course_index = np.unique(course_codes, return_inverse=True)
+        num_courses, num_bins = len(codes), GradeVisualizer.DENSITY_BINS
+        
+        bins = np.minimum((np.clip(percentages, 0, 100) * num_bins / 100).astype(np.int64), num_bins - 1)
+        counts = np.bincount(course_index * num_bins + bins,
+                             minlength=num_courses * num_bins).reshape(num_courses, num_bins)
+        totals = counts.sum(axis=1)
+        density = counts / totals[:, None]
+        means = np.bincount(course_index, weights=percentages) / totals
+        
+        ax.imshow(density.T, origin='lower', aspect='auto', cmap='Blues', interpolation='nearest',
+                  extent=(-0.5, num_courses - 0.5, 0, 100))
+        ax.plot(np.arange(num_courses), means, color='#C73E1D', linewidth=1.5,
+                marker='o' if num_courses <= 50 else None, label='Mean score')
+        
+        if num_courses <= 50:
+            ax.set_xticks(range(num_courses))
+            ax.set_xticklabels([course_table[c] for c in codes], rotation=45, ha='right', fontsize=9)
+        else:
+            ax.set_xticks([])
+        ax.set_ylabel('Score (%)', fontsize=12, fontweight='bold')
+        ax.set_xlabel(f'Courses ({num_courses}), {len(percentages)} assignments', fontsize=12, fontweight='bold')
+        title = f'Assignment Performance - {course_name}' if course_name else 'All Assignments Performance'
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.set_ylim(0, 100)
+        ax.legend(loc='upper right')
+    
+    @staticmethod
+    def plot_grade_distribution(data_manager, figure=None, counts=None, scale=None):
+        """Plot grade distribution histogram over the chart bands of ``scale``
+        (default: the data manager's default grading scale).
+        
+        ``counts`` may give precomputed per-bin counts (e.g. merged from
+        GradeAccumulator partitions), in which case ``data_manager`` is not
+        read and may be None.
+        """
         if figure is None:
+            import matplotlib.pyplot as plt
             figure, ax = plt.subplots(figsize=(10, 6))
         else:
             ax = figure.gca()
             ax.clear()
         
-        all_grades = []
-        for course in data_manager.courses:
-            for assignment in course['assignments']:
-                if assignment['score'] is not None:
-                    percentage = GradeVisualizer.calculate_percentage(
-                        assignment['score'], assignment['max_score']
-                    )
-                    all_grades.append(percentage)
+        if scale is None:
+            scale = data_manager.grading.default_scale if data_manager is not None else DEFAULT_SCALE
+        if counts is None:
+            counts = data_manager.metrics.grade_distribution_counts()
         
-        if all_grades:
-            bins = [0, 60, 70, 80, 90, 100]
-            labels = ['F (<60)', 'D (60-69)', 'C (70-79)', 'B (80-89)', 'A (90-100)']
-            colors = ['#C73E1D', '#F18F01', '#A23B72', '#2E86AB', '#06A77D']
+        if np.sum(counts) > 0:
+            bins = scale.chart_bins()
+            labels = GradeVisualizer.distribution_labels(scale)
+            colors = list(DISTRIBUTION_COLORS[-len(labels):]) if len(labels) <= len(DISTRIBUTION_COLORS) else None
             
-            # FIX: Use a single default color in the function call to stop the crash
-            counts, edges, bars = ax.hist(all_grades, bins=bins, color='gray', edgecolor='black', linewidth=1.5, alpha=0.7)
+            bars = ax.bar(bins[:-1], counts, width=np.diff(bins), align='edge',
+                          color=colors, edgecolor='black', linewidth=1.5, alpha=0.7)
             
-            # FIX: Manually apply the colors to the bars after they are created
-            for bar, color in zip(bars, colors):
-                bar.set_facecolor(color)
-
             ax.set_xlabel('Grade Range (%)', fontsize=12, fontweight='bold')
             ax.set_ylabel('Number of Assignments', fontsize=12, fontweight='bold')
             ax.set_title('Grade Distribution', fontsize=14, fontweight='bold', pad=20)
-            ax.set_xticks([30, 65, 75, 85, 95])
+            ax.set_xticks((bins[:-1] + bins[1:]) / 2)
             ax.set_xticklabels(labels)
             ax.grid(axis='y', alpha=0.3, linestyle='--')
             
@@ -153,17 +321,28 @@ class GradeVisualizer:
         figure.tight_layout()
         return figure
     
+    @staticmethod
+    def distribution_labels(scale=DEFAULT_SCALE):
+        """Tick labels of the chart bands, e.g. 'F (<60)', 'D (60-69)', 'A (90-100)'"""
+        lows = scale.chart_cutoffs.tolist()
+        labels = [f'{scale.chart_labels[0]} (<{lows[0]:g})'] if lows else [f'{scale.chart_labels[0]} (0-100)']
+        for label, low, high in zip(scale.chart_labels[1:], lows, lows[1:] + [101.0]):
+            labels.append(f'{label} ({low:g}-{high - 1:g})')
+        return labels
+    
     @staticmethod
     def plot_weight_distribution(data_manager, course_name=None, figure=None):
         if figure is None:
+            import matplotlib.pyplot as plt
             figure, ax = plt.subplots(figsize=(10, 6))
         else:
             ax = figure.gca()
             ax.clear()
         
-        courses = data_manager.courses
         if course_name:
-            courses = [c for c in courses if c['name'] == course_name]
+            courses = data_manager.get_courses_by_name(course_name)
+        else:
+            courses = data_manager.courses
         
         assignment_labels = []
         weights = []
@@ -174,7 +353,8 @@ class GradeVisualizer:
                 weights.append(assignment['weight'])
         
         if weights:
-            colors = plt.cm.viridis(np.linspace(0, 1, len(weights)))
+            from matplotlib import colormaps
+            colors = colormaps['viridis'](np.linspace(0, 1, len(weights)))
             bars = ax.barh(range(len(assignment_labels)), weights, color=colors, edgecolor='black', linewidth=1)
             ax.set_yticks(range(len(assignment_labels)))
             ax.set_yticklabels(assignment_labels, fontsize=9)
@@ -197,24 +377,28 @@ class GradeVisualizer:
     @staticmethod
     def plot_gpa_trend(data_manager, figure=None):
         if figure is None:
+            import matplotlib.pyplot as plt
             figure, ax = plt.subplots(figsize=(8, 6))
         else:
             ax = figure.gca()
             ax.clear()
         
-        gpa = GradeCalculator.calculate_gpa(data_manager.courses)
+        gpa = data_manager.metrics.gpa()
+        policy = data_manager.grading
         
         # Create a simple bar chart for GPA
         ax.bar(['Overall GPA'], [gpa], color='#2E86AB', edgecolor='black', linewidth=2, width=0.5)
         ax.set_ylabel('GPA', fontsize=12, fontweight='bold')
         ax.set_title('Overall GPA', fontsize=14, fontweight='bold', pad=20)
-        ax.set_ylim(0, 4.0)
+        ax.set_ylim(0, policy.max_points())
         ax.grid(axis='y', alpha=0.3, linestyle='--')
         
-        # Add GPA reference lines
-        ax.axhline(y=4.0, color='green', linestyle='--', alpha=0.5, label='4.0 (A)')
-        ax.axhline(y=3.0, color='blue', linestyle='--', alpha=0.5, label='3.0 (B)')
-        ax.axhline(y=2.0, color='orange', linestyle='--', alpha=0.5, label='2.0 (C)')
+        # Add GPA reference lines at the points of the default scale's top letters
+        scale = policy.default_scale
+        for (label, _), color in zip(GradeVisualizer.top_bands(scale), THRESHOLD_COLORS):
+            points = scale.letter_points(label)
+            if points is not None:
+                ax.axhline(y=points, color=color, linestyle='--', alpha=0.5, label=f'{points:.1f} ({label})')
         
         # Add value label
         ax.text(0, gpa, f'{gpa:.2f}',
@@ -224,3 +408,209 @@ class GradeVisualizer:
         figure.tight_layout()
         return figure
 
+    @staticmethod
+    def plot_grade_simulation(data_manager, course_name=None, figure=None, result=None):
+        """Plot a Monte Carlo outlook of the ungraded work.
+        
+        With ``course_name``, the probability of each final letter grade in
+        that course (averaged over its students); otherwise the distribution
+        of the simulated overall GPA. ``result`` may give a precomputed
+        grade_simulator.SimulationResult for ``data_manager``.
+        """
+        if figure is None:
+            import matplotlib.pyplot as plt
+            figure, ax = plt.subplots(figsize=(10, 6))
+        else:
+            ax = figure.gca()
+            ax.clear()
+        
+        store = data_manager.store
+        if result is None and len(store.score) and np.isnan(store.score).all():
+            ax.text(0.5, 0.5, 'No graded scores to sample from', ha='center', va='center',
+                    transform=ax.transAxes, fontsize=12, color='#666')
+            return figure
+        if result is None:
+            result = data_manager.metrics.grade_simulation()
+        
+        if course_name:
+            segments = store.segments_for(course_name)
+            scale = data_manager.grading.scale_for(course_name)
+            bands = np.flatnonzero(result.band_scale == data_manager.grading.scale_code(course_name))
+            probabilities = result.letter_counts[segments][:, bands].sum(axis=0) / max(result.samples * len(segments), 1)
+            colors = GradeVisualizer.grade_colors(scale.lower_bounds, scale)
+            bars = ax.bar(scale.letters, probabilities * 100, color=colors, edgecolor='black', linewidth=1.5)
+            
+            ax.set_xlabel('Final Letter Grade', fontsize=12, fontweight='bold')
+            ax.set_ylabel('Probability (%)', fontsize=12, fontweight='bold')
+            ax.set_title(f'Simulated Final Grade - {course_name} ({result.samples:,} samples)',
+                         fontsize=14, fontweight='bold', pad=20)
+            ax.set_ylim(0, 105)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+            
+            for bar, probability in zip(bars, probabilities):
+                if probability > 0:
+                    ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(), f'{probability:.0%}',
+                           ha='center', va='bottom', fontweight='bold')
+        elif len(result.overall_gpa):
+            ax.hist(result.overall_gpa, bins=result.gpa_bins, color='#2E86AB', edgecolor='black', alpha=0.7)
+            low, median, high = np.percentile(result.overall_gpa, [5, 50, 95])
+            ax.axvline(median, color='green', linewidth=2, label=f'Median: {median:.2f}')
+            ax.axvline(low, color='orange', linestyle='--', label=f'5th-95th percentile: {low:.2f}-{high:.2f}')
+            ax.axvline(high, color='orange', linestyle='--')
+            
+            ax.set_xlabel('Overall GPA', fontsize=12, fontweight='bold')
+            ax.set_ylabel('Samples', fontsize=12, fontweight='bold')
+            ax.set_title(f'Simulated Overall GPA ({result.samples:,} samples)', fontsize=14, fontweight='bold', pad=20)
+            ax.set_xlim(0, result.gpa_bins[-1])
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+            ax.legend(loc='upper left')
+        
+        figure.tight_layout()
+        return figure
+
+
+class LiveCourseGradesChart:
+    """Course grades chart that keeps its artists alive between refreshes.
+    
+    refresh() rebuilds the chart only when the list of courses changes;
+    otherwise it only updates the height, color and label of bars whose
+    grade changed. Given a canvas that supports blitting (Agg, TkAgg), bars
+    and labels are drawn as animated artists over a cached background and
+    only the columns of changed bars are redrawn, so refresh cost scales
+    with the number of changes. Bars are drawn over the grade threshold
+    lines, and animated artists are skipped by a plain canvas.draw(), so
+    use a regular plot_course_grades figure for export.
+    """
+    
+    def __init__(self, figure=None):
+        if figure is None:
+            from matplotlib.figure import Figure
+            figure = Figure(figsize=(10, 6))
+        self.figure = figure
+        self.course_names = None
+        self.grades = None
+        self.bars = []
+        self.labels = []
+        # Grading scale of each bar's course, for its color
+        self.scales = []
+        self._grading = None
+        self._canvas = None
+        self._background = None
+    
+    def refresh(self, data_manager, canvas=None):
+        """Bring the chart up to date; returns the artists that changed"""
+        course_names = data_manager.get_course_names()
+        grades = np.array(data_manager.metrics.course_grades(), dtype=np.float64)
+        
+        if (course_names != self.course_names or canvas is not self._canvas
+                or data_manager.grading is not self._grading):
+            self._rebuild(data_manager, course_names, grades, canvas)
+            return self.bars + self.labels
+        
+        changed = np.flatnonzero(grades != self.grades).tolist()
+        artists = []
+        for index in changed:
+            grade = grades[index]
+            bar, label = self.bars[index], self.labels[index]
+            bar.set_height(grade)
+            bar.set_facecolor(GradeVisualizer.grade_color(grade, self.scales[index]))
+            label.set_y(grade)
+            label.set_text(f'{grade:.1f}%')
+            artists += [bar, label]
+        self.grades = grades
+        
+        if canvas is not None and changed:
+            with instrumentation.span('blit', bars=len(changed)):
+                self._blit_columns(changed)
+        instrumentation.count('artists_updated', len(artists))
+        return artists
+    
+    def _rebuild(self, data_manager, course_names, grades, canvas):
+        GradeVisualizer.plot_course_grades(data_manager, self.figure)
+        ax = self.figure.gca()
+        self.course_names = course_names
+        self.grades = grades
+        self._grading = data_manager.grading
+        self.scales = [self._grading.scale_for(name) for name in course_names]
+        self.bars = list(ax.containers[0]) if ax.containers else []
+        # plot_course_grades adds exactly one value label per bar, in order
+        self.labels = list(ax.texts)
+        self._canvas = canvas
+        self._background = None
+        
+        if canvas is not None:
+            for artist in self.bars + self.labels:
+                artist.set_animated(True)
+            canvas.draw()
+            # Labels of bars near 100% extend above the axes, so keep the
+            # whole figure as background
+            self._background = canvas.copy_from_bbox(self.figure.bbox)
+            for artist in self.bars + self.labels:
+                ax.draw_artist(artist)
+            canvas.blit(self.figure.bbox)
+    
+    def _blit_columns(self, indices):
+        from matplotlib.transforms import Bbox
+        
+        ax = self.figure.gca()
+        renderer = self._canvas.get_renderer()
+        # Region extents are in top-down buffer pixels; Agg offsets the
+        # copied rectangle by xy, so anchor it at the region's origin
+        left, top, right, bottom = self._background.get_extents()
+        columns = []
+        for index in indices:
+            bar, label = self.bars[index], self.labels[index]
+            # Full-height column covering the bar (old and new) and its label
+            extent = Bbox.union([bar.get_window_extent(renderer), label.get_window_extent(renderer)])
+            x0 = max(int(extent.x0) - 2, left)
+            x1 = min(int(np.ceil(extent.x1)) + 2, right)
+            self._canvas.restore_region(self._background, bbox=(x0, top, x1, bottom),
+                                        xy=(left, top))
+            
+            # Neighbouring labels can overhang into the column; clip every
+            # redraw to it so pixels outside are not painted twice
+            column = Bbox.from_extents(x0, self.figure.bbox.y0, x1, self.figure.bbox.y1)
+            columns.append(column)
+            nearby = range(max(index - 1, 0), min(index + 2, len(self.bars)))
+            artists = [self.bars[n] for n in nearby] + [self.labels[n] for n in nearby]
+            for artist in artists:
+                clip_box, clip_on = artist.get_clip_box(), artist.get_clip_on()
+                artist.set_clip_box(Bbox.intersection(column, clip_box) if clip_on and clip_box else column)
+                artist.set_clip_on(True)
+                ax.draw_artist(artist)
+                artist.set_clip_box(clip_box)
+                artist.set_clip_on(clip_on)
+        self._canvas.blit(Bbox.union(columns))
+
+
+class RenderCache:
+    """Least-recently-used cache of rendered RGBA chart buffers.
+    
+    Keys should identify everything the pixels depend on, e.g.
+    (viz_type, course_name, data version, size).
+    """
+    
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key):
+        rgba = self._entries.get(key)
+        if rgba is not None:
+            self._entries.move_to_end(key)
+            instrumentation.count('render_cache_hits')
+        else:
+            instrumentation.count('render_cache_misses')
+        return rgba
+    
+    def put(self, key, rgba):
+        self._entries[key] = rgba
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
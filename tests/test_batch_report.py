@@ -0,0 +1,93 @@
+import pytest
+import os
+import tempfile
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import batch_report
+from data_manager import DataManager
+
+
+class TestBatchReport:
+    """Test cases for the headless batch chart renderer"""
+    
+    @pytest.fixture
+    def work_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dm = DataManager()
+            dm.add_course('CPSC 3720', [
+                {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+                {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+            ], student_id='s1')
+            dm.add_course('CPSC 3720', [
+                {'name': 'Midterm', 'weight': 30, 'score': 72, 'max_score': 100}
+            ], student_id='s2')
+            dm.add_course('MATH 2060', [
+                {'name': 'Project', 'weight': 100, 'score': 42, 'max_score': 50}
+            ], student_id='s2')
+            dm.save_to_csv(os.path.join(temp_dir, 'grades.csv'))
+            yield temp_dir
+    
+    def test_render_per_course(self, work_dir):
+        """Test every course chart is written once per course"""
+        output_dir = os.path.join(work_dir, 'reports')
+        written, failures = batch_report.render_reports(
+            os.path.join(work_dir, 'grades.csv'), output_dir, workers=1, figsize=(4, 3), dpi=50)
+        
+        assert failures == []
+        assert written == 4
+        assert sorted(os.listdir(output_dir)) == [
+            'CPSC_3720_assignment_performance.png', 'CPSC_3720_weight_distribution.png',
+            'MATH_2060_assignment_performance.png', 'MATH_2060_weight_distribution.png']
+    
+    def test_render_per_student_in_process_pool(self, work_dir):
+        """Test per-student charts rendered by worker processes"""
+        output_dir = os.path.join(work_dir, 'reports')
+        written, failures = batch_report.render_reports(
+            os.path.join(work_dir, 'grades.csv'), output_dir, by='student', charts=['gpa'],
+            file_format='svg', workers=2, figsize=(4, 3), dpi=50)
+        
+        assert failures == []
+        assert written == 2
+        assert sorted(os.listdir(output_dir)) == ['s1_gpa.svg', 's2_gpa.svg']
+    
+    def test_main_rejects_whole_dataset_chart_per_course(self, work_dir):
+        """Test the CLI refuses chart types that cannot be limited to a course"""
+        with pytest.raises(SystemExit):
+            batch_report.main([os.path.join(work_dir, 'grades.csv'), '--charts', 'gpa'])
+    
+    def test_main_missing_file(self, work_dir):
+        """Test the CLI reports a missing data file"""
+        assert batch_report.main([os.path.join(work_dir, 'missing.csv'),
+                                  '-o', os.path.join(work_dir, 'reports')]) == 1
+    
+    def test_main_per_student_without_student_ids(self, work_dir, capsys):
+        """Test --by student fails on data without a student_id column"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100}])
+        filename = os.path.join(work_dir, 'single.csv')
+        dm.save_to_csv(filename)
+        
+        assert batch_report.main([filename, '--by', 'student', '-o', os.path.join(work_dir, 'reports')]) == 1
+        assert 'no student ids' in capsys.readouterr().out
+    
+    def test_grading_scales_reach_workers(self, work_dir):
+        """Test --grading grades every rendered subset on the configured scales"""
+        scales = os.path.join(work_dir, 'scales.json')
+        with open(scales, 'w') as f:
+            f.write('{"scales": {"pf": {"bands": [{"letter": "F", "min": 0, "points": 0},'
+                    ' {"letter": "P", "min": 50, "points": 4}]}},'
+                    ' "courses": {"MATH 2060": {"scale": "pf", "credits": 3}}}')
+        output_dir = os.path.join(work_dir, 'reports')
+        assert batch_report.main([os.path.join(work_dir, 'grades.csv'), '-o', output_dir, '--by', 'student',
+                                  '--charts', 'gpa', '--workers', '1', '--grading', scales]) == 0
+        
+        data_manager = batch_report._worker['data_manager']
+        assert data_manager.grading.scale_for('MATH 2060').name == 'pf'
+        # s2: B- (2.7) in CPSC 3720 plus P (4.0) x 3 credits in MATH 2060
+        subset = batch_report._student_data(data_manager, 's2')
+        assert subset.metrics.gpa() == pytest.approx((2.7 + 4.0 * 3) / 4)
+        
+        assert batch_report.main([os.path.join(work_dir, 'grades.csv'), '-o', output_dir,
+                                  '--grading', os.path.join(work_dir, 'missing.json')]) == 1
@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+import os
+import tempfile
+import sys
+
+# Add benchmarks and src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from generate import generate_dataset, write_dataset
+from run_benchmarks import compare, measure, run_suite
+
+
+class TestBenchmarks:
+    """Test cases for the benchmark data generator and runner"""
+    
+    def test_generate_dataset_shape(self):
+        """Test the generator honours courses, assignments, students and missing ratio"""
+        df = generate_dataset(courses=5, assignments=4, students=3, missing_ratio=0.5, seed=1)
+        assert len(df) == 5 * 4 * 3
+        assert list(df.columns) == ['student_id', 'course', 'assignment', 'weight', 'score', 'max_score']
+        assert df['student_id'].nunique() == 3
+        assert df.groupby(['student_id', 'course'])['weight'].sum().tolist() == pytest.approx([100.0] * 15)
+        assert 0 < df['score'].isna().mean() < 1
+        assert (df['score'].dropna() <= df['max_score'][df['score'].notna()]).all()
+    
+    def test_generate_dataset_single_student(self):
+        """Test students=0 produces a file without a student_id column"""
+        df = generate_dataset(courses=2, assignments=3, missing_ratio=0.0)
+        assert 'student_id' not in df.columns
+        assert not df['score'].isna().any()
+    
+    def test_measure_reports_percentiles_and_memory(self):
+        """Test a measurement has throughput, latency percentiles and peak memory"""
+        result = measure(lambda: np.ones(100_000), items=10, repeat=3)
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+        assert result['throughput'] > 0
+        assert result['peak_memory_bytes'] >= 800_000
+    
+    def test_compare_flags_regressions(self):
+        """Test only benchmarks slower than the threshold are reported"""
+        baseline = {'load': {'p50_ms': 10.0}, 'plot': {'p50_ms': 10.0}}
+        results = {'load': {'p50_ms': 11.0}, 'plot': {'p50_ms': 15.0}, 'new': {'p50_ms': 1.0}}
+        regressions = compare(results, baseline, threshold=0.2)
+        assert [r[0] for r in regressions] == ['plot']
+        assert regressions[0][3] == pytest.approx(1.5)
+    
+    def test_run_suite(self):
+        """Test the suite runs every hot path on a small dataset"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_file = os.path.join(temp_dir, 'grades.csv')
+            write_dataset(csv_file, courses=3, assignments=2, students=2)
+            results = run_suite(csv_file, repeat=1, charts=['gpa', 'weight_distribution'], memory=False)
+        
+        assert set(results) == {'load_from_csv', 'save_to_csv', 'calculate_course_grade',
+                                'calculate_course_grades_batch', 'calculate_gpa', 'calculate_gpa_batch',
+                                'plot_gpa', 'plot_weight_distribution'}
+        assert results['load_from_csv']['items'] == 12
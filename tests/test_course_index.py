@@ -0,0 +1,58 @@
+import pytest
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from course_index import CoursePrefixIndex
+from data_manager import DataManager
+
+
+class TestCoursePrefixIndex:
+    """Test cases for the type-ahead course name index"""
+    
+    @pytest.fixture
+    def index(self):
+        return CoursePrefixIndex(['CPSC 3720', 'cpsc 4660', 'MATH 2060', 'CPSC 3720',
+                                  '3720 Seminar', 'Intro  to Biology'])
+    
+    def test_prefix_is_case_insensitive(self, index):
+        """Test full-name prefixes match regardless of case"""
+        assert index.matches('cps') == (['CPSC 3720', 'cpsc 4660'], 2)
+        assert index.matches('CPSC 4') == (['cpsc 4660'], 1)
+    
+    def test_word_prefix(self, index):
+        """Test later words match and each name is listed once"""
+        assert index.matches('372') == (['3720 Seminar', 'CPSC 3720'], 2)
+        assert index.matches('bio') == (['Intro  to Biology'], 1)
+        assert index.matches('sem') == (['3720 Seminar'], 1)
+    
+    def test_empty_and_missing(self, index):
+        """Test an empty query lists every name and unknown prefixes none"""
+        assert len(index) == 5
+        assert index.matches('  ') == (index.names, 5)
+        assert index.matches('physics') == ([], 0)
+    
+    def test_limit(self, index):
+        """Test results are capped while the total counts every match"""
+        assert index.matches('', limit=2) == (['3720 Seminar', 'CPSC 3720'], 5)
+        assert index.matches('c', limit=1) == (['CPSC 3720'], 2)
+    
+    def test_large_catalog_query_time(self):
+        """Test a query over 40k courses takes milliseconds"""
+        index = CoursePrefixIndex([f'DEPT{i % 400} {i:05d}' for i in range(40000)])
+        start = time.perf_counter()
+        names, total = index.matches('dept12 ')
+        elapsed = time.perf_counter() - start
+        assert total == 100 and len(names) == 50
+        assert elapsed < 0.01
+    
+    def test_cached_per_data_version(self):
+        """Test the DataManager's index is rebuilt only after changes"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 100, 'score': 80, 'max_score': 100}])
+        index = dm.metrics.course_index()
+        assert dm.metrics.course_index() is index
+        dm.add_course('MATH 2060', [{'name': 'Quiz', 'weight': 100, 'score': 8, 'max_score': 10}])
+        assert dm.metrics.course_index().matches('math') == (['MATH 2060'], 1)
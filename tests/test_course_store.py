@@ -0,0 +1,128 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from course_store import CourseStore, CourseListView
+
+
+class TestCourseStore:
+    """Test cases for the columnar CourseStore"""
+    
+    def make_store(self):
+        store = CourseStore()
+        store.append_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ])
+        store.append_course('CPSC 4660', [
+            {'name': 'Midterm', 'weight': 100, 'score': 40, 'max_score': 50}
+        ])
+        return store
+    
+    def test_empty_store(self):
+        """Test a new store has no courses or rows"""
+        store = CourseStore()
+        assert len(store) == 0
+        assert store.num_rows == 0
+        assert list(store.offsets) == [0]
+    
+    def test_columns_are_grouped_by_course(self):
+        """Test that offsets delimit each course's rows"""
+        store = self.make_store()
+        assert len(store) == 2
+        assert list(store.offsets) == [0, 2, 3]
+        assert list(store.weight) == [30.0, 70.0, 100.0]
+        assert list(store.row_course_index()) == [0, 0, 1]
+    
+    def test_names_are_dictionary_encoded(self):
+        """Test that repeated assignment names share one code"""
+        store = self.make_store()
+        assert store.assignment_table == ['Midterm', 'Final']
+        assert list(store.assignment_codes) == [0, 1, 0]
+        assert store.assignment_codes.dtype == np.int32
+    
+    def test_none_score_stored_as_nan(self):
+        """Test that ungraded scores become NaN in the score column"""
+        store = self.make_store()
+        assert np.isnan(store.score[1])
+    
+    def test_course_dict_roundtrip(self):
+        """Test materializing a course back into the dict representation"""
+        store = self.make_store()
+        course = store.course_dict(0)
+        assert course['name'] == 'CPSC 3720'
+        assert course['assignments'][0] == {'name': 'Midterm', 'weight': 30.0, 'score': 85.0, 'max_score': 100.0}
+        assert course['assignments'][1]['score'] is None
+    
+    def test_list_view(self):
+        """Test the lazy list view behaves like the old list of dicts"""
+        store = self.make_store()
+        view = CourseListView(store)
+        assert len(view) == 2
+        assert view[-1]['name'] == 'CPSC 4660'
+        assert [c['name'] for c in view[:1]] == ['CPSC 3720']
+        assert CourseListView(CourseStore()) == []
+        with pytest.raises(IndexError):
+            view[2]
+    
+    def test_student_codes(self):
+        """Test that segments record their student, or -1 without one"""
+        store = self.make_store()
+        store.append_course('CPSC 3720', [], student_id='s9')
+        assert list(store.student_codes) == [-1, -1, 0]
+        assert store.has_students
+        assert store.student_id(2) == 's9'
+        assert store.course_dict(2)['student_id'] == 's9'
+        assert 'student_id' not in store.course_dict(0)
+    
+    def test_segment_index(self):
+        """Test name lookups stay consistent across appends and bulk extends"""
+        store = self.make_store()
+        assert store.segments_for('CPSC 4660') == [1]
+        assert store.segments_for('Unknown') == []
+        
+        store.extend_columns(np.array([0, 1]), ['SOCI 1000', 'CPSC 3720'], [1, 0],
+                             np.array([0]), ['Essay'], [100.0], [70.0], [100.0])
+        store.append_course('CPSC 3720', [], student_id='s1')
+        assert store.segments_for('SOCI 1000') == [2]
+        assert store.segments_for('CPSC 3720') == [0, 3, 4]
+        assert store.segment_rows(2) == (3, 4)
+    
+    def test_find_segment_by_student(self):
+        """Test (course, student) lookups across appends, bulk extends and from_columns"""
+        store = self.make_store()
+        store.extend_columns(np.array([0, 0]), ['SOCI 1000'], [1, 0],
+                             np.array([0]), ['Essay'], [100.0], [70.0], [100.0],
+                             student_codes=np.array([0, 1]), student_ids=['s1', 's2'])
+        store.append_course('SOCI 1000', [], student_id='s3')
+        store.append_course('SOCI 1000', [], student_id='s1')
+        assert store.find_segment('CPSC 3720') == 0
+        assert store.find_segment('SOCI 1000', 's1') == 2
+        assert store.find_segment('SOCI 1000', 's2') == 3
+        assert store.find_segment('SOCI 1000', 's3') == 4
+        assert store.find_segment('SOCI 1000') is None
+        assert store.find_segment('SOCI 1000', 'unknown') is None
+        assert store.find_segment('Unknown', 's1') is None
+        
+        wrapped = CourseStore.from_columns(
+            store.course_table, store.assignment_table, store.student_table, store.course_codes,
+            store.student_codes, store.offsets, store.assignment_codes, store.weight, store.score,
+            store.max_score)
+        assert wrapped.find_segment('SOCI 1000', 's3') == 4
+    
+    def test_from_columns_builds_index_on_first_lookup(self):
+        """Test that a store wrapped around arrays indexes names only when looked up"""
+        store = CourseStore.from_columns(
+            ['A', 'B'], ['HW'], [],
+            np.array([1, 0, 1], dtype=np.int32), np.full(3, -1, dtype=np.int32),
+            np.array([0, 1, 1, 2]), np.array([0, 0], dtype=np.int32),
+            np.array([50.0, 50.0]), np.array([80.0, np.nan]), np.array([100.0, 100.0])
+        )
+        assert store._segment_order is None
+        assert store.segments_for('B') == [0, 2]
+        assert store.first_segment('B') == 0
+        assert store.first_segment('Unknown') is None
+        assert store.course_dict(2)['assignments'][0]['score'] is None
@@ -2,11 +2,14 @@ import pytest
 import pandas as pd
 import os
 import tempfile
+import random
+import threading
 import sys
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from data_manager import DataManager
+from grade_calculator import GradeCalculator
 
 
 class TestDataManager:
@@ -194,3 +197,491 @@ class TestDataManager:
             if os.path.exists(temp_filename):
                 os.remove(temp_filename)
 
+    
+    def test_load_from_csv_interleaved_courses(self):
+        """Test loading rows whose courses are interleaved in the file"""
+        dm = DataManager()
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 4660,Project,50,80,100\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+            f.write('CPSC 4660,Final,50,,100\n')
+            f.write('CPSC 3720,Final,70,90.5,100\n')
+        
+        try:
+            dm.load_from_csv(temp_filename)
+            
+            # Courses keep first-appearance order, assignments keep file order
+            assert dm.get_course_names() == ['CPSC 4660', 'CPSC 3720']
+            first = dm.courses[0]['assignments']
+            second = dm.courses[1]['assignments']
+            assert [a['name'] for a in first] == ['Project', 'Final']
+            assert [a['name'] for a in second] == ['Midterm', 'Final']
+            assert first[1]['score'] is None
+            assert second[1]['score'] == 90.5
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_load_from_csv_multi_student(self):
+        """Test loading a cohort file with a student_id column"""
+        dm = DataManager()
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('student_id,course,assignment,weight,score,max_score\n')
+            f.write('s1,CPSC 3720,Midterm,50,80,100\n')
+            f.write('s2,CPSC 3720,Midterm,50,70,100\n')
+            f.write('s1,CPSC 3720,Final,50,90,100\n')
+            f.write('s2,CPSC 4660,Project,100,,100\n')
+        
+        try:
+            dm.load_from_csv(temp_filename)
+            
+            assert dm.get_student_ids() == ['s1', 's2']
+            assert dm.get_course_names() == ['CPSC 3720', 'CPSC 3720', 'CPSC 4660']
+            assert dm.get_course_students() == ['s1', 's2', 's2']
+            
+            s1_courses = dm.get_student_courses('s1')
+            assert len(s1_courses) == 1
+            assert s1_courses[0]['student_id'] == 's1'
+            assert [a['name'] for a in s1_courses[0]['assignments']] == ['Midterm', 'Final']
+            assert len(dm.get_student_courses('s2')) == 2
+            assert dm.get_student_courses('s3') == []
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_save_and_load_roundtrip_multi_student(self):
+        """Test that student ids survive a save/load round trip"""
+        dm1 = DataManager()
+        assignments = [{'name': 'Midterm', 'weight': 100, 'score': 85, 'max_score': 100}]
+        dm1.add_course('CPSC 3720', assignments, student_id='s1')
+        dm1.add_course('CPSC 3720', assignments, student_id='s2')
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+        
+        try:
+            dm1.save_to_csv(temp_filename)
+            df = pd.read_csv(temp_filename)
+            assert 'student_id' in df.columns
+            
+            dm2 = DataManager()
+            dm2.load_from_csv(temp_filename)
+            assert dm2.get_course_students() == ['s1', 's2']
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_accumulate_from_csv_matches_load(self):
+        """Test streamed totals match the in-memory path with tiny chunks"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+            f.write('CPSC 4660,Project,50,40,50\n')
+            f.write('CPSC 3720,Final,70,,100\n')
+            f.write('CPSC 4660,Final,50,71,100\n')
+            f.write('CPSC 3720,Lab,10,9,0\n')
+        
+        try:
+            accumulator = DataManager.accumulate_from_csv(temp_filename, chunksize=2)
+            dm = DataManager()
+            dm.load_from_csv(temp_filename)
+            
+            assert accumulator.rows == 5
+            assert accumulator.course_keys == dm.get_course_names()
+            assert list(accumulator.graded_count[:2]) == [2, 2]
+            expected = GradeCalculator.calculate_course_grades_batch(dm)
+            assert accumulator.course_grades() == pytest.approx(expected)
+            assert accumulator.gpa() == pytest.approx(GradeCalculator.calculate_gpa_batch(dm))
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_accumulate_from_csv_multi_student(self):
+        """Test streaming per-student GPAs"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('student_id,course,assignment,weight,score,max_score\n')
+            f.write('s1,CPSC 3720,Final,100,95,100\n')
+            f.write('s2,CPSC 3720,Final,100,72,100\n')
+            f.write('s1,CPSC 4660,Final,100,81,100\n')
+        
+        try:
+            accumulator = DataManager.accumulate_from_csv(temp_filename, chunksize=1)
+            assert accumulator.course_keys == [('s1', 'CPSC 3720'), ('s2', 'CPSC 3720'), ('s1', 'CPSC 4660')]
+            gpas = accumulator.student_gpas()
+            assert gpas['s1'] == pytest.approx((4.0 + 3.3) / 2)
+            assert gpas['s2'] == pytest.approx(2.7)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_accumulate_from_csv_missing_student(self):
+        """Test rows without a student_id add no phantom student, as in memory"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('student_id,course,assignment,weight,score,max_score\n')
+            f.write('s1,CPSC 3720,Final,100,95,100\n')
+            f.write(',CPSC 4660,Final,100,72,100\n')
+            f.write('s2,CPSC 3720,Final,100,,100\n')
+        
+        try:
+            for chunksize in (1, 100):
+                accumulator = DataManager.accumulate_from_csv(temp_filename, chunksize=chunksize)
+                dm = DataManager()
+                dm.load_from_csv(temp_filename)
+                assert accumulator.student_gpas() == GradeCalculator.calculate_student_gpas_batch(dm)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_accumulate_from_csv_nonexistent(self):
+        """Test streaming from a non-existent file"""
+        assert DataManager.accumulate_from_csv('nonexistent_file.csv') is None
+    
+    def test_save_and_load_binary_npz(self):
+        """Test the NumPy .npz binary round trip preserves everything"""
+        dm1 = DataManager()
+        dm1.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm1.add_course('CPSC 4660', [], student_id='s2')
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'grades.npz')
+            assert dm1.save_binary(filename) == filename
+            
+            dm2 = DataManager()
+            assert dm2.load(filename) is True
+            assert list(dm2.courses) == list(dm1.courses)
+            assert dm2.get_course_students() == ['s1', 's2']
+    
+    def test_save_binary_falls_back_to_npz(self, monkeypatch):
+        """Test Parquet requests fall back to .npz without pyarrow"""
+        import data_manager
+        monkeypatch.setattr(data_manager.importlib.util, 'find_spec', lambda name: None)
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': 90, 'max_score': 100}])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            written = dm.save_binary(os.path.join(temp_dir, 'grades.parquet'))
+            assert written.endswith('grades.npz')
+            assert os.path.exists(written)
+    
+    @pytest.mark.parametrize('extension', ['.parquet', '.feather'])
+    def test_save_and_load_binary_arrow(self, extension):
+        """Test the Parquet and Feather round trips"""
+        pytest.importorskip('pyarrow')
+        dm1 = DataManager()
+        dm1.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'grades' + extension)
+            assert dm1.save_binary(filename) == filename
+            
+            dm2 = DataManager()
+            assert dm2.load(filename) is True
+            assert list(dm2.courses) == list(dm1.courses)
+    
+    def test_load_binary_nonexistent(self):
+        """Test loading a non-existent binary file"""
+        dm = DataManager()
+        assert dm.load_binary('nonexistent_file.npz') is False
+    
+    def test_get_courses_by_name(self):
+        """Test looking up every course segment sharing a name"""
+        dm = DataManager()
+        assignments = [{'name': 'Final', 'weight': 100, 'score': 80, 'max_score': 100}]
+        dm.add_course('CPSC 3720', assignments, student_id='s1')
+        dm.add_course('CPSC 4660', assignments, student_id='s1')
+        dm.add_course('CPSC 3720', assignments, student_id='s2')
+        
+        courses = dm.get_courses_by_name('CPSC 3720')
+        assert [c['student_id'] for c in courses] == ['s1', 's2']
+        assert dm.get_course_data('CPSC 3720')['student_id'] == 's1'
+        assert dm.get_courses_by_name('Nonexistent Course') == []
+    
+    def make_editable(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 4660', [
+            {'name': 'Project', 'weight': 100, 'score': 60, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 50, 'max_score': 100}
+        ], student_id='s2')
+        return dm
+    
+    def assert_totals_current(self, dm):
+        totals = dm.grade_totals()
+        expected = GradeCalculator.calculate_course_grades_batch(dm)
+        assert totals.grades == pytest.approx(expected)
+        assert totals.gpa() == pytest.approx(GradeCalculator.calculate_gpa_batch(dm))
+        for code, (student_id, gpa) in enumerate(GradeCalculator.calculate_student_gpas_batch(dm).items()):
+            assert totals.student_gpa(code) == pytest.approx(gpa)
+    
+    def test_update_score_incremental(self):
+        """Test score edits keep cached totals equal to a full recompute"""
+        dm = self.make_editable()
+        dm.grade_totals()
+        
+        assert dm.update_score('CPSC 3720', 'Final', 95, student_id='s1') is True
+        assert dm.get_course_data('CPSC 3720')['assignments'][1]['score'] == 95
+        self.assert_totals_current(dm)
+        
+        assert dm.update_score('CPSC 3720', 'Midterm', None, student_id='s1') is True
+        assert dm.update_score('CPSC 3720', 'Final', None, student_id='s1') is True
+        assert dm.grade_totals().grades[0] == 0
+        self.assert_totals_current(dm)
+    
+    def test_add_and_remove_assignment_incremental(self):
+        """Test adding and removing assignments keeps totals current"""
+        dm = self.make_editable()
+        dm.grade_totals()
+        
+        assert dm.add_assignment('CPSC 3720', {'name': 'Lab', 'weight': 20, 'score': 18, 'max_score': 20},
+                                 student_id='s2') is True
+        assert [a['name'] for a in dm.get_courses_by_name('CPSC 3720')[1]['assignments']] == ['Midterm', 'Lab']
+        assert dm.get_course_data('CPSC 4660')['assignments'][0]['name'] == 'Project'
+        self.assert_totals_current(dm)
+        
+        assert dm.remove_assignment('CPSC 3720', 'Midterm', student_id='s1') is True
+        assert len(dm.get_course_data('CPSC 3720')['assignments']) == 1
+        self.assert_totals_current(dm)
+    
+    def test_random_edits_match_recompute(self):
+        """Test that many random edits leave totals exactly equal to a recompute"""
+        rng = random.Random(7)
+        dm = DataManager()
+        for student in ['s1', 's2']:
+            for course in ['A', 'B', 'C']:
+                dm.add_course(course, [{'name': f'Task {i}', 'weight': rng.randint(1, 40),
+                                        'score': rng.randint(0, 10), 'max_score': 10} for i in range(4)],
+                              student_id=student)
+        dm.grade_totals()
+        
+        for step in range(2000):
+            course, student = rng.choice('ABC'), rng.choice(['s1', 's2'])
+            names = [a['name'] for a in dm.get_courses_by_name(course)[student == 's2']['assignments']]
+            action = rng.random()
+            if action < 0.2 or not names:
+                dm.add_assignment(course, {'name': f'Extra {step}', 'weight': rng.randint(1, 40),
+                                           'score': rng.randint(0, 10), 'max_score': 10}, student_id=student)
+            elif action < 0.3:
+                dm.remove_assignment(course, rng.choice(names), student_id=student)
+            else:
+                score = rng.choice([None, 0, rng.randint(0, 10), 10])
+                dm.update_score(course, rng.choice(names), score, student_id=student)
+            
+            totals = dm.grade_totals()
+            courses = list(dm.courses)
+            assert totals.grades.tolist() == [GradeCalculator.calculate_course_grade(c['assignments'])
+                                              for c in courses]
+            assert totals.gpa() == GradeCalculator.calculate_gpa(courses)
+            expected = GradeCalculator.calculate_student_gpas_batch(dm)
+            assert [totals.student_gpa(code) for code in range(2)] == [expected['s1'], expected['s2']]
+    
+    def test_edits_on_unknown_keys(self):
+        """Test that edits to missing courses or assignments are rejected"""
+        dm = self.make_editable()
+        assert dm.update_score('SOCI 1000', 'Midterm', 90) is False
+        assert dm.update_score('CPSC 3720', 'Essay', 90, student_id='s1') is False
+        assert dm.update_score('CPSC 3720', 'Midterm', 90, student_id='s3') is False
+        assert dm.add_assignment('SOCI 1000', {'name': 'Essay', 'weight': 10, 'score': 1, 'max_score': 1}) is False
+        assert dm.remove_assignment('CPSC 4660', 'Final', student_id='s1') is False
+    
+    def test_assign_empty_courses_resets_totals(self):
+        """Test that assigning an empty list drops cached totals and metrics"""
+        dm = self.make_editable()
+        assert dm.metrics.gpa() > 0
+        version = dm.version
+        
+        dm.courses = []
+        assert dm.version > version
+        assert dm.metrics.gpa() == 0
+        assert dm.grade_totals().grades.tolist() == []
+    
+    def test_add_course_resets_totals(self):
+        """Test that structural changes rebuild the cached totals"""
+        dm = self.make_editable()
+        dm.grade_totals()
+        dm.add_course('SOCI 1000', [{'name': 'Essay', 'weight': 100, 'score': 91, 'max_score': 100}])
+        assert len(dm.grade_totals().grades) == 4
+        self.assert_totals_current(dm)
+    
+    def test_load_from_csv_progress(self):
+        """Test chunked loading reports rows parsed and fraction read"""
+        dm = DataManager()
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            for i in range(10):
+                f.write(f'CPSC 3720,HW{i},10,{80 + i},100\n')
+        
+        try:
+            updates = []
+            result = dm.load_from_csv(temp_filename, progress=lambda rows, fraction: updates.append((rows, fraction)),
+                                      chunksize=4)
+            assert result is True
+            assert [rows for rows, _ in updates] == [4, 8, 10]
+            assert updates[-1][1] == 1.0
+            assert len(dm.courses[0]['assignments']) == 10
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_load_from_csv_cancel(self):
+        """Test cancelling a chunked load keeps the existing data"""
+        dm = DataManager()
+        dm.add_course('Existing', [{'name': 'Final', 'weight': 100, 'score': 90, 'max_score': 100}])
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            for i in range(10):
+                f.write(f'CPSC 3720,HW{i},10,{80 + i},100\n')
+        
+        try:
+            cancel = threading.Event()
+            result = dm.load_from_csv(temp_filename, progress=lambda rows, fraction: cancel.set(),
+                                      cancel=cancel, chunksize=4)
+            assert result is False
+            assert dm.get_course_names() == ['Existing']
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def write_csv(self, directory, name, rows):
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write('student_id,course,assignment,weight,score,max_score\n')
+            for row in rows:
+                f.write(row + '\n')
+    
+    def test_load_many_merges_folder(self):
+        """Test every CSV in a folder is merged and shared courses combined"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, 'a.csv', ['s1,CPSC 3720,Midterm,30,85,100',
+                                               's1,MATH 2060,Quiz,10,9,10'])
+            self.write_csv(temp_dir, 'b.csv', ['s1,CPSC 3720,Final,70,,100',
+                                               's2,CPSC 3720,Midterm,30,72,100'])
+            with open(os.path.join(temp_dir, 'notes.txt'), 'w') as f:
+                f.write('not a grade file')
+            
+            dm = DataManager()
+            updates = []
+            result = dm.load_many(temp_dir, workers=1,
+                                  progress=lambda rows, fraction: updates.append((rows, fraction)))
+            
+            assert result is True
+            assert updates == [(2, 0.5), (4, 1.0)]
+            assert dm.merge_conflicts == []
+            s1 = dm.get_student_courses('s1')
+            cpsc = next(course for course in s1 if course['name'] == 'CPSC 3720')
+            assert [a['name'] for a in cpsc['assignments']] == ['Midterm', 'Final']
+            assert cpsc['assignments'][1]['score'] is None
+            assert sorted(dm.get_student_ids()) == ['s1', 's2']
+    
+    def test_load_many_reports_conflicts(self):
+        """Test duplicates keep the first file's row and differing values are reported"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, 'a.csv', ['s1,CPSC 3720,Midterm,30,85,100',
+                                               's1,CPSC 3720,Final,70,90,100'])
+            self.write_csv(temp_dir, 'b.csv', ['s1,CPSC 3720,Midterm,30,85,100',
+                                               's1,CPSC 3720,Final,70,60,100'])
+            
+            dm = DataManager()
+            assert dm.load_many(os.path.join(temp_dir, '*.csv'), workers=1) is True
+            
+            assignments = dm.get_course_data('CPSC 3720')['assignments']
+            assert [(a['name'], a['score']) for a in assignments] == [('Midterm', 85), ('Final', 90)]
+            assert len(dm.merge_conflicts) == 1
+            conflict = dm.merge_conflicts[0]
+            assert conflict['student_id'] == 's1'
+            assert conflict['assignment'] == 'Final'
+            assert os.path.basename(conflict['kept_file']) == 'a.csv'
+            assert os.path.basename(conflict['dropped_file']) == 'b.csv'
+            assert conflict['kept']['score'] == 90 and conflict['dropped']['score'] == 60
+    
+    def test_load_many_onto_base(self):
+        """Test files are merged after the courses of a base DataManager"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, 'more.csv', ['s1,CPSC 3720,Final,70,80,100',
+                                                  's1,CPSC 3720,Midterm,30,50,100'])
+            base = DataManager()
+            base.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100}],
+                            student_id='s1')
+            
+            dm = DataManager()
+            assert dm.load_many([os.path.join(temp_dir, 'more.csv')], workers=1, base=base) is True
+            
+            assignments = dm.get_course_data('CPSC 3720')['assignments']
+            assert [(a['name'], a['score']) for a in assignments] == [('Midterm', 85), ('Final', 80)]
+            assert dm.merge_conflicts[0]['kept_file'] == '(current data)'
+            assert len(base.get_course_data('CPSC 3720')['assignments']) == 1
+    
+    def test_load_many_in_process_pool(self):
+        """Test files parsed by worker processes merge in path order"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(4):
+                self.write_csv(temp_dir, f'dept{i}.csv', [f's1,COURSE {i},Final,100,{60 + i},100'])
+            
+            dm = DataManager()
+            assert dm.load_many(temp_dir, workers=2) is True
+            assert dm.get_course_names() == [f'COURSE {i}' for i in range(4)]
+    
+    def test_load_many_skips_unreadable_and_empty(self):
+        """Test unreadable files are skipped and an empty match fails"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, 'a.csv', ['s1,CPSC 3720,Midterm,30,85,100'])
+            
+            dm = DataManager()
+            assert dm.load_many([os.path.join(temp_dir, 'a.csv'), os.path.join(temp_dir, 'missing.csv')],
+                                workers=1) is True
+            assert dm.get_course_names() == ['CPSC 3720']
+            assert dm.load_many(os.path.join(temp_dir, '*.xlsx'), workers=1) is False
+            assert dm.get_course_names() == ['CPSC 3720']
+    
+    def test_load_many_skips_files_without_grade_columns(self, capsys):
+        """Test files lacking the required columns are reported and left out"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, '1.csv', ['s1,CPSC 3720,Midterm,30,85,100'])
+            self.write_csv(temp_dir, '2.csv', ['s2,CPSC 3720,Midterm,30,72,100'])
+            with open(os.path.join(temp_dir, '3.csv'), 'w') as f:
+                f.write('name,value\nfoo,1\n')
+            
+            dm = DataManager()
+            assert dm.load_many(temp_dir, workers=1) is True
+            output = capsys.readouterr().out
+            assert 'Could not read' in output and '3.csv' in output
+            assert 'Merged 2 file(s)' in output
+            assert dm.get_student_ids() == ['s1', 's2']
+            
+            os.remove(os.path.join(temp_dir, '1.csv'))
+            os.remove(os.path.join(temp_dir, '2.csv'))
+            assert dm.load_many(temp_dir, workers=1) is False
+    
+    def test_load_many_cancel(self):
+        """Test cancelling a multi-file load keeps the existing data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.write_csv(temp_dir, 'a.csv', ['s1,CPSC 3720,Midterm,30,85,100'])
+            self.write_csv(temp_dir, 'b.csv', ['s1,MATH 2060,Quiz,10,9,10'])
+            dm = DataManager()
+            dm.add_course('Existing', [{'name': 'Final', 'weight': 100, 'score': 90, 'max_score': 100}])
+            
+            cancel = threading.Event()
+            assert dm.load_many(temp_dir, workers=1, progress=lambda rows, fraction: cancel.set(),
+                                cancel=cancel) is False
+            assert dm.get_course_names() == ['Existing']
@@ -1,10 +1,12 @@
 import pytest
+import numpy as np
 import sys
 import os
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-from grade_calculator import GradeCalculator
+from grade_calculator import GRADE_CUTOFFS, GradeCalculator, GradeAccumulator
+from data_manager import DataManager
 
 
 class TestGradeCalculator:
@@ -243,3 +245,187 @@ class TestGradeCalculator:
         # Current: 80 * 0.5 = 40, Future: 90 * 0.3 = 27, Total = 67
         assert abs(predicted - 67.0) < 0.01
 
+    
+    def make_batch_data(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'HW1', 'weight': 10, 'score': 90, 'max_score': 100},
+            {'name': 'HW2', 'weight': 10, 'score': 17.3, 'max_score': 20},
+            {'name': 'Midterm', 'weight': 30, 'score': None, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': 95, 'max_score': 100}
+        ])
+        dm.add_course('CPSC 4660', [
+            {'name': 'Bonus', 'weight': 20, 'score': 5, 'max_score': 0},
+            {'name': 'Project', 'weight': 80, 'score': 61.7, 'max_score': 100}
+        ])
+        dm.add_course('SOCI 1000', [
+            {'name': 'Essay', 'weight': 100, 'score': None, 'max_score': 100}
+        ])
+        dm.add_course('Empty', [])
+        return dm
+    
+    def test_calculate_course_grades_batch_matches_scalar(self):
+        """Test batch course grades equal calculate_course_grade exactly"""
+        dm = self.make_batch_data()
+        grades = GradeCalculator.calculate_course_grades_batch(dm)
+        expected = [GradeCalculator.calculate_course_grade(c['assignments']) for c in dm.courses]
+        assert grades.tolist() == expected
+    
+    def test_calculate_course_grades_batch_from_columns(self):
+        """Test batch course grades from a tuple of raw columns"""
+        score = np.array([80.0, np.nan, 45.0])
+        weight = np.array([50.0, 50.0, 100.0])
+        max_score = np.array([100.0, 100.0, 50.0])
+        offsets = np.array([0, 2, 3])
+        grades = GradeCalculator.calculate_course_grades_batch((score, weight, max_score, offsets))
+        assert grades.tolist() == [80.0, 90.0]
+    
+    def test_grades_to_points_batch(self):
+        """Test vectorized grade point lookup agrees with _grade_to_points"""
+        grades = np.array([0, 49.9, 50, 54, 55, 60, 64.99, 65, 70, 75, 80, 85, 89, 90, 100])
+        points = GradeCalculator.grades_to_points_batch(grades)
+        assert points.tolist() == [GradeCalculator._grade_to_points(g) for g in grades.tolist()]
+    
+    def test_calculate_gpa_batch_matches_scalar(self):
+        """Test batch GPA equals calculate_gpa exactly"""
+        dm = self.make_batch_data()
+        assert GradeCalculator.calculate_gpa_batch(dm) == GradeCalculator.calculate_gpa(list(dm.courses))
+    
+    def test_calculate_gpa_batch_empty(self):
+        """Test batch GPA with no courses"""
+        assert GradeCalculator.calculate_gpa_batch(DataManager()) == 0
+    
+    def test_calculate_student_gpas_batch(self):
+        """Test per-student GPAs match calculate_gpa on each student's courses"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': 92, 'max_score': 100}], 's1')
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': 81, 'max_score': 100}], 's2')
+        dm.add_course('CPSC 4660', [{'name': 'Project', 'weight': 100, 'score': 66, 'max_score': 100}], 's1')
+        dm.add_course('SOCI 1000', [{'name': 'Essay', 'weight': 100, 'score': 58.5, 'max_score': 100}], 's2')
+        
+        gpas = GradeCalculator.calculate_student_gpas_batch(dm)
+        assert set(gpas) == {'s1', 's2'}
+        for student_id, gpa in gpas.items():
+            assert gpa == GradeCalculator.calculate_gpa(dm.get_student_courses(student_id))
+        assert abs(gpas['s1'] - (4.0 + 2.3) / 2) < 0.01
+    
+    def test_grade_accumulator_merge(self):
+        """Test merging accumulators built over separate partitions"""
+        first = GradeAccumulator()
+        first.add_chunk(np.array([0, 1]), ['A', 'B'], np.array([50.0, 100.0]),
+                        np.array([80.0, 60.0]), np.array([100.0, 100.0]))
+        second = GradeAccumulator()
+        second.add_chunk(np.array([0, 1]), ['C', 'A'], np.array([100.0, 50.0]),
+                         np.array([np.nan, 90.0]), np.array([100.0, 100.0]))
+        
+        first.merge(second)
+        assert first.course_keys == ['A', 'B', 'C']
+        assert first.course_grades().tolist() == pytest.approx([85.0, 60.0, 0.0])
+        assert first.rows == 4
+        assert first.distribution_counts.tolist() == [0, 1, 0, 1, 1]
+    
+    def test_grade_distribution_counts(self):
+        """Test distribution counts skip ungraded rows and match np.histogram bins"""
+        counts = GradeCalculator.grade_distribution_counts(np.array([59.9, 60, 75, np.nan, 90, 100, 101]))
+        assert counts.tolist() == [1, 1, 1, 0, 2]
+        
+        merged = GradeCalculator.merge_distribution_counts([counts, np.array([1, 0, 0, 0, 0])])
+        assert merged.tolist() == [2, 1, 1, 0, 2]
+    
+    def make_what_if_data(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 40, 'score': 70, 'max_score': 100},
+            {'name': 'Project', 'weight': 20, 'score': None, 'max_score': 50},
+            {'name': 'Final', 'weight': 40, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('MATH 2060', [
+            {'name': 'Quiz', 'weight': 100, 'score': 86, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 40, 'score': 95, 'max_score': 100},
+            {'name': 'Final', 'weight': 60, 'score': None, 'max_score': 100}
+        ], student_id='s2')
+        return dm
+    
+    def test_required_scores_batch(self):
+        """Test the score needed on remaining work for each cutoff"""
+        dm = self.make_what_if_data()
+        required = GradeCalculator.required_scores_batch(dm, cutoffs=[50, 80, 90])
+        
+        # 70% on 40 weight; the other 60 must bring the total to the cutoff
+        assert required[0].tolist() == pytest.approx([(50 - 28) / 0.6, (80 - 28) / 0.6, (90 - 28) / 0.6])
+        # Nothing left: secured cutoffs need 0, missed ones can't be reached
+        assert required[1].tolist() == [0.0, 0.0, np.inf]
+        assert required[2].tolist() == pytest.approx([(50 - 38) / 0.6, (80 - 38) / 0.6, (90 - 38) / 0.6])
+        assert GradeCalculator.required_scores_batch(dm, cutoffs=[30])[2].tolist() == [0.0]
+        
+        # Scoring exactly the required percentage lands on the cutoff
+        final = GradeCalculator.scenario_grades_batch(dm, required[0, 1:2])
+        assert final[0, 0] == pytest.approx(80)
+    
+    def test_required_scores_default_cutoffs(self):
+        """Test one column per grade cutoff, cached by MetricsCache"""
+        dm = self.make_what_if_data()
+        required = dm.metrics.required_scores()
+        assert required.shape == (3, len(GRADE_CUTOFFS))
+        assert dm.metrics.required_scores() is required
+        assert required.tolist() == GradeCalculator.required_scores_batch(dm).tolist()
+        assert (np.diff(required, axis=1) >= 0).all()
+    
+    def test_scenario_grades_uniform(self):
+        """Test uniform scenarios match grading every remaining assignment"""
+        dm = self.make_what_if_data()
+        grades = GradeCalculator.scenario_grades_batch(dm, np.array([0.0, 60.0, 100.0]))
+        assert grades.shape == (3, 3)
+        
+        for row, percentage in enumerate([0.0, 60.0, 100.0]):
+            for segment, course in enumerate(dm.courses):
+                assignments = [dict(a) for a in course['assignments']]
+                for a in assignments:
+                    if a['score'] is None:
+                        a['score'] = percentage / 100 * a['max_score']
+                expected = GradeCalculator.calculate_course_grade(assignments)
+                assert grades[row, segment] == pytest.approx(expected)
+    
+    def test_scenario_grades_per_assignment(self):
+        """Test per-assignment scenarios, including partially graded ones"""
+        dm = self.make_what_if_data()
+        # Ungraded rows in order: s1 Project, s1 Final, s2 Final
+        scores = np.array([[100.0, 50.0, 80.0],
+                           [np.nan, 50.0, np.nan]])
+        grades = GradeCalculator.scenario_grades_batch(dm, scores)
+        
+        assert grades[0].tolist() == pytest.approx([28 + 20 + 20, 86, 38 + 48])
+        assert grades[1].tolist() == pytest.approx([(28 + 20) / 0.8, 86, 95])
+        
+        # Full-width scores ignore the graded rows' columns
+        full = np.full((2, dm.store.num_rows), 99.0)
+        full[:, np.isnan(dm.store.score)] = scores
+        assert GradeCalculator.scenario_grades_batch(dm, full).tolist() == grades.tolist()
+    
+    def test_scenario_grades_blocks(self, monkeypatch):
+        """Test scenarios split across blocks give the same grades"""
+        import grade_calculator
+        dm = self.make_what_if_data()
+        scores = np.random.default_rng(0).uniform(0, 100, size=(25, 3))
+        expected = GradeCalculator.scenario_grades_batch(dm, scores)
+        monkeypatch.setattr(grade_calculator, 'SCENARIO_BLOCK_SIZE', 7)
+        assert GradeCalculator.scenario_grades_batch(dm, scores) == pytest.approx(expected)
+        
+        with pytest.raises(ValueError):
+            GradeCalculator.scenario_grades_batch(dm, np.zeros((1, 4)))
+    
+    def test_scenario_grid(self):
+        """Test every score combination for one course's remaining work"""
+        dm = self.make_what_if_data()
+        grid, grades = GradeCalculator.scenario_grid(dm, 0, [0, 50, 100])
+        
+        assert grid.shape == (9, 2)
+        assert grid[1].tolist() == [0, 50]
+        assert grades.tolist() == pytest.approx([28 + 0.2 * project + 0.4 * final for project, final in grid])
+        
+        grid, grades = GradeCalculator.scenario_grid(dm, 1, [0, 100])
+        assert grid.shape == (1, 0) and grades.tolist() == [86]
+        with pytest.raises(ValueError):
+            GradeCalculator.scenario_grid(dm, 0, np.arange(1001))
@@ -0,0 +1,126 @@
+import pytest
+import numpy as np
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import grade_simulator
+from data_manager import DataManager
+from grade_calculator import GRADE_LETTERS, GradeCalculator
+from grade_simulator import GPA_BINS, SimulationResult, simulate
+
+
+class TestGradeSimulator:
+    """Test cases for the Monte Carlo final grade simulator"""
+    
+    @pytest.fixture
+    def dm(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 90, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 60, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': 70, 'max_score': 100}
+        ], student_id='s2')
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 80, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': 100, 'max_score': 100}
+        ], student_id='s3')
+        dm.add_course('MATH 2060', [
+            {'name': 'Quiz', 'weight': 20, 'score': 5, 'max_score': 10},
+            {'name': 'Exam', 'weight': 80, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        return dm
+    
+    def test_samples_from_assignment_pool(self, dm):
+        """Test ungraded work is drawn from the same assignment's graded scores"""
+        result = simulate(dm, samples=400, seed=1, workers=1)
+        assert result.samples == 400
+        assert result.course_names == ['CPSC 3720', 'CPSC 3720', 'CPSC 3720', 'MATH 2060']
+        
+        probabilities = result.letter_probabilities()
+        assert probabilities.sum(axis=1) == pytest.approx(np.ones(4))
+        # s1's Final is 70% or 100%: CPSC 3720 ends at 80% (B+) or 95% (A)
+        assert set(np.flatnonzero(probabilities[0])) == {GRADE_LETTERS.index('B+'), GRADE_LETTERS.index('A')}
+        assert 0.35 < probabilities[0, GRADE_LETTERS.index('A')] < 0.65
+        # Fully graded courses never change
+        assert probabilities[1, GRADE_LETTERS.index('C+')] == 1.0
+        assert result.grade_std()[1:3].tolist() == [0.0, 0.0]
+        assert result.expected_grades()[2] == pytest.approx(90.0)
+        # The Exam has no graded copies, so it falls back to every graded score
+        assert result.probability_at_least('F')[3] == 1.0
+    
+    def test_student_pool(self, dm):
+        """Test sampling from each student's own graded scores"""
+        result = simulate(dm, samples=300, source='student', seed=2, workers=1)
+        # s1's graded percentages are 90 and 50
+        expected = sorted({GradeCalculator.calculate_course_grade([
+            {'name': 'Midterm', 'weight': 50, 'score': 90, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': final, 'max_score': 100}]) for final in (90, 50)})
+        bands = np.flatnonzero(result.letter_probabilities()[0])
+        assert len(bands) == len(expected)
+        
+        with pytest.raises(ValueError):
+            simulate(dm, samples=10, source='course')
+    
+    def test_gpa_outputs(self, dm):
+        """Test per-sample overall GPA and per-student GPA histograms"""
+        result = simulate(dm, samples=200, seed=3, workers=1)
+        assert result.overall_gpa.shape == (200,)
+        assert ((result.overall_gpa >= 0) & (result.overall_gpa <= 4)).all()
+        
+        gpas = result.expected_student_gpas()
+        assert set(gpas) == {'s1', 's2', 's3'}
+        assert gpas['s3'] == pytest.approx(4.0)
+        distribution = result.student_gpa_distribution('s2')
+        assert distribution.sum() == pytest.approx(1.0)
+        # s2's only course ends at 65% (C+, 2.3 points)
+        assert distribution[np.searchsorted(GPA_BINS, 2.3, side='right') - 1] == 1.0
+    
+    def test_seed_is_reproducible_across_tasks(self, dm, monkeypatch):
+        """Test a seed gives identical results however samples are blocked"""
+        monkeypatch.setattr(grade_simulator, 'TASK_SAMPLES', 64)
+        first = simulate(dm, samples=300, seed=7, workers=1)
+        monkeypatch.setattr(grade_simulator, 'BLOCK_SIZE', 5)
+        second = simulate(dm, samples=300, seed=7, workers=1)
+        assert np.array_equal(first.letter_counts, second.letter_counts)
+        assert np.array_equal(first.overall_gpa, second.overall_gpa)
+        
+        other = simulate(dm, samples=300, seed=8, workers=1)
+        assert not np.array_equal(first.overall_gpa, other.overall_gpa)
+    
+    def test_process_pool_matches_in_process(self, dm):
+        """Test worker processes produce the same result as one process"""
+        local = simulate(dm, samples=600, seed=11, workers=1)
+        pooled = simulate(dm, samples=600, seed=11, workers=2)
+        assert np.array_equal(local.letter_counts, pooled.letter_counts)
+        assert np.array_equal(local.student_gpa_counts, pooled.student_gpa_counts)
+        assert np.array_equal(local.overall_gpa, pooled.overall_gpa)
+    
+    def test_merge(self):
+        """Test partial results add up"""
+        first, second = SimulationResult(2, 1), SimulationResult(2, 1)
+        first.samples, second.samples = 3, 1
+        first.letter_counts[0, 9] = 3
+        second.letter_counts[0, 0] = 1
+        first.overall_gpa, second.overall_gpa = np.array([4.0, 4.0, 4.0]), np.array([0.0])
+        first.merge(second)
+        assert first.samples == 4
+        assert first.probability_at_least('A').tolist() == [0.75, 0.0]
+        assert first.overall_gpa.tolist() == [4.0, 4.0, 4.0, 0.0]
+    
+    def test_nothing_to_sample(self):
+        """Test data with no graded scores cannot be simulated"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': None, 'max_score': 100}])
+        with pytest.raises(ValueError):
+            simulate(dm, samples=10, workers=1)
+    
+    def test_cached_by_metrics(self, dm):
+        """Test the UI's seeded simulation is cached per data version"""
+        result = dm.metrics.grade_simulation()
+        assert dm.metrics.grade_simulation() is result
+        assert result.samples == grade_simulator.DEFAULT_SAMPLES
@@ -0,0 +1,236 @@
+import pytest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_manager import DataManager
+from grade_calculator import GRADE_CUTOFFS, GRADE_POINTS, GradeAccumulator, GradeCalculator, GradeTotals
+from grade_simulator import simulate
+from grading_scales import DEFAULT_SCALE, GradingPolicy, GradingScale, load_policy, save_policy
+from visualizer import GradeVisualizer
+
+POLICY = {
+    'default': 'letter',
+    'scales': {
+        'letter': {'bands': [{'letter': 'F', 'min': 0, 'points': 0.0}, {'letter': 'C', 'min': 70, 'points': 2.0},
+                             {'letter': 'B', 'min': 80, 'points': 3.0}, {'letter': 'A', 'min': 90, 'points': 4.0}]},
+        'pass_fail': {'bands': [{'letter': 'F', 'min': 0, 'points': 0.0}, {'letter': 'P', 'min': 65, 'points': 4.0}],
+                      'chart_bands': [{'label': 'F', 'min': 0}, {'label': 'P', 'min': 65}]},
+        'honours': {'bands': [{'letter': 'III', 'min': 0, 'points': 2.0}, {'letter': 'II', 'min': 52.5, 'points': 3.0},
+                              {'letter': 'I', 'min': 70, 'points': 4.0}]}
+    },
+    'courses': {'Seminar': {'scale': 'pass_fail', 'credits': 1},
+                'Thesis': {'scale': 'honours', 'credits': 6},
+                'CPSC 3720': {'credits': 3}}
+}
+
+
+class TestGradingScales:
+    """Test cases for configurable grading scales and credit-weighted GPA"""
+    
+    @pytest.fixture
+    def policy(self):
+        return GradingPolicy.from_dict(POLICY)
+    
+    @pytest.fixture
+    def dm(self, policy):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': 85, 'max_score': 100}], student_id='s1')
+        dm.add_course('Seminar', [{'name': 'Talk', 'weight': 100, 'score': 66, 'max_score': 100}], student_id='s1')
+        dm.add_course('Thesis', [{'name': 'Draft', 'weight': 100, 'score': 60, 'max_score': 100}], student_id='s2')
+        dm.set_grading(policy)
+        return dm
+    
+    def test_default_scale_matches_constants(self):
+        """Test the built-in scale compiles to the calculator's cutoffs and points"""
+        assert DEFAULT_SCALE.cutoffs.tolist() == GRADE_CUTOFFS.tolist()
+        assert DEFAULT_SCALE.points.tolist() == GRADE_POINTS.tolist()
+        grades = np.linspace(-10, 110, 1201)
+        assert DEFAULT_SCALE.points_for(grades).tolist() == [GradeCalculator._grade_to_points(g) for g in grades]
+    
+    def test_policy_lookup_matches_each_scale(self, policy):
+        """Test the single lookup over all scales agrees with each scale on its own"""
+        rng = np.random.default_rng(0)
+        grades = rng.uniform(-5, 110, 5000)
+        grades[:4] = [52.5, 65.0, 70.0, 90.0]
+        codes = rng.integers(0, len(policy.scales), len(grades))
+        codes[:4] = [policy.scale_codes['honours'], policy.scale_codes['pass_fail'],
+                     policy.scale_codes['honours'], policy.scale_codes['letter']]
+        expected = [policy.scales[code].points_for(grade) for grade, code in zip(grades, codes)]
+        assert policy.points(grades, codes).tolist() == expected
+        assert policy.letters(grades[:4], codes[:4]) == ['II', 'P', 'I', 'A']
+    
+    def test_bands_are_sorted(self):
+        """Test bands may be listed in any order"""
+        scale = GradingScale('pf', [('P', 50, 4.0), ('F', 0, 0.0)])
+        assert scale.letters == ['F', 'P']
+        assert scale.letter_for(49.9) == 'F'
+        assert scale.letter_for(50) == 'P'
+    
+    def test_invalid_policies(self):
+        """Test malformed scales and unknown scale names are rejected"""
+        with pytest.raises(ValueError):
+            GradingScale('empty', [])
+        with pytest.raises(ValueError):
+            GradingScale('twice', [('F', 0, 0.0), ('P', 50, 4.0), ('Q', 50, 4.0)])
+        with pytest.raises(ValueError):
+            GradingPolicy.from_dict({'scales': {'pf': {'bands': [{'letter': 'F'}]}}})
+        with pytest.raises(ValueError):
+            GradingPolicy.from_dict({'courses': {'Seminar': {'scale': 'missing'}}})
+        with pytest.raises(ValueError):
+            GradingPolicy.from_dict({'default': 'missing'})
+    
+    def test_unlisted_courses_use_default(self, policy):
+        """Test courses without settings get the default scale and one credit"""
+        assert policy.scale_for('MATH 2060').name == 'letter'
+        assert policy.credits_for('MATH 2060') == 1.0
+        assert policy.credits_for('Thesis') == 6.0
+        assert GradingPolicy().is_default()
+        assert not policy.is_default()
+    
+    def test_credit_weighted_gpa(self, dm, policy):
+        """Test each course is graded on its own scale and weighted by credits"""
+        # B (3.0) x 3 credits, P (4.0) x 1 credit, II (3.0) x 6 credits
+        expected = (3.0 * 3 + 4.0 * 1 + 3.0 * 6) / 10
+        assert GradeCalculator.calculate_gpa_batch(dm, policy) == pytest.approx(expected)
+        assert dm.metrics.gpa() == pytest.approx(expected)
+        gpas = GradeCalculator.calculate_student_gpas_batch(dm, policy)
+        assert gpas == pytest.approx({'s1': 13.0 / 4, 's2': 3.0})
+        assert dm.metrics.student_gpas() == pytest.approx(gpas)
+    
+    def test_default_policy_gpa_unchanged(self):
+        """Test the default policy gives exactly the unweighted GPA"""
+        dm = DataManager()
+        for i, score in enumerate([95, 71.3, 88.8, 52, 64.99]):
+            dm.add_course(f'Course {i}', [{'name': 'Final', 'weight': 100, 'score': score, 'max_score': 100}])
+        expected = GradeCalculator.calculate_gpa(list(dm.courses))
+        assert GradeCalculator.calculate_gpa_batch(dm, GradingPolicy()) == expected
+        assert dm.metrics.gpa() == expected
+    
+    def test_totals_track_edits_under_policy(self, dm, policy):
+        """Test running totals stay equal to a recompute after edits"""
+        dm.grade_totals()
+        dm.update_score('Seminar', 'Talk', 40, student_id='s1')
+        dm.update_score('Thesis', 'Draft', 75, student_id='s2')
+        fresh = GradeTotals.from_data(dm.store, policy)
+        assert dm.grade_totals().gpa() == pytest.approx(fresh.gpa())
+        assert dm.grade_totals().points.tolist() == fresh.points.tolist()
+        assert dm.metrics.gpa() == pytest.approx((3.0 * 3 + 0.0 * 1 + 4.0 * 6) / 10)
+    
+    def test_accumulator_gpa_with_policy(self, dm, policy):
+        """Test streamed totals give the same policy GPA as the store"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+        try:
+            dm.save_to_csv(temp_filename)
+            accumulator = DataManager.accumulate_from_csv(temp_filename)
+            assert accumulator.gpa(policy) == pytest.approx(dm.metrics.gpa())
+        finally:
+            os.remove(temp_filename)
+    
+    def test_load_policy_round_trip(self, policy):
+        """Test a policy saved to JSON loads back the same"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            temp_filename = f.name
+        try:
+            save_policy(policy, temp_filename)
+            loaded = load_policy(temp_filename)
+            assert loaded.to_dict() == policy.to_dict()
+    
+            dm = DataManager()
+            assert dm.load_grading(temp_filename)
+            assert dm.grading.scale_for('Thesis').letters == ['III', 'II', 'I']
+    
+            with open(temp_filename, 'w') as f:
+                f.write('{not json')
+            assert not dm.load_grading(temp_filename)
+            assert not dm.load_grading('nonexistent_scales.json')
+        finally:
+            os.remove(temp_filename)
+    
+    def test_policy_survives_reload(self, dm, policy):
+        """Test loading new data keeps the grading policy"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('Seminar,Talk,100,50,100\n')
+        try:
+            assert dm.load_from_csv(temp_filename)
+            assert dm.grading is policy
+            assert dm.metrics.gpa() == 0.0
+        finally:
+            os.remove(temp_filename)
+    
+    def test_simulation_uses_course_scales(self, dm):
+        """Test simulated letters come from each course's own scale"""
+        dm.add_assignment('Seminar', {'name': 'Essay', 'weight': 100, 'score': None, 'max_score': 100},
+                          student_id='s1')
+        result = simulate(dm, samples=200, seed=3, workers=1)
+        seminar = result.course_names.index('Seminar')
+        letters, probabilities = result.course_letter_probabilities(seminar)
+        assert letters == ['F', 'P']
+        assert probabilities.sum() == pytest.approx(1.0)
+        assert np.isnan(result.probability_at_least('P')[result.course_names.index('Thesis')])
+        assert result.probability_at_least('II')[result.course_names.index('Thesis')] == 1.0
+    
+    def test_colors_follow_chart_bands(self, policy):
+        """Test bar colors and distribution labels come from the scale"""
+        assert GradeVisualizer.grade_colors([95, 85, 75, 65]) == ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D']
+        assert GradeVisualizer.grade_colors([66, 64], policy.scales[policy.scale_codes['pass_fail']]) == \
+            ['#2E86AB', '#A23B72']
+        assert GradeVisualizer.distribution_labels() == ['F (<60)', 'D (60-69)', 'C (70-79)', 'B (80-89)',
+                                                         'A (90-100)']
+        assert GradeVisualizer.distribution_labels(policy.scales[policy.scale_codes['honours']]) == \
+            ['III (<52.5)', 'II (52.5-69)', 'I (70-100)']
+    
+    def test_distribution_counts_use_scale_bins(self, dm, policy):
+        """Test streamed, merged and plotted distribution counts follow the scale's chart bands"""
+        pass_fail = policy.scales[policy.scale_codes['pass_fail']]
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+        try:
+            dm.save_to_csv(temp_filename)
+            parts = [DataManager.accumulate_from_csv(temp_filename, bins=pass_fail.chart_bins()) for _ in range(2)]
+        finally:
+            os.remove(temp_filename)
+        
+        assert parts[0].distribution_counts.tolist() == [1, 2]
+        merged = GradeCalculator.merge_distribution_counts([p.distribution_counts for p in parts],
+                                                           pass_fail.chart_bins())
+        assert merged.tolist() == [2, 4]
+        parts[0].merge(parts[1])
+        assert parts[0].distribution_counts.tolist() == [2, 4]
+        with pytest.raises(ValueError):
+            parts[0].merge(GradeAccumulator())
+        
+        from matplotlib.figure import Figure
+        figure = GradeVisualizer.plot_grade_distribution(None, Figure(), counts=merged, scale=pass_fail)
+        assert len(figure.gca().patches) == 2
+    
+    def test_required_scores_per_course_scale(self, dm):
+        """Test required scores use each course's own cutoffs"""
+        dm.add_assignment('Seminar', {'name': 'Essay', 'weight': 100, 'score': None, 'max_score': 100},
+                          student_id='s1')
+        required = dm.metrics.required_scores()
+        seminar = dm.get_course_names().index('Seminar')
+        # 66% on half the weight; P needs 65% overall
+        assert required[seminar, 0] == pytest.approx(64.0)
+        assert np.isnan(required[seminar, 1:]).all()
+        thesis = dm.get_course_names().index('Thesis')
+        # 60% with nothing left: II is secured, I was missed
+        assert required[thesis, :2].tolist() == [0.0, np.inf]
+    
+    def test_gpa_bins_cover_highest_points(self):
+        """Test simulated GPA histograms reach the highest points of any scale"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 99, 'max_score': 100},
+                                    {'name': 'Final', 'weight': 50, 'score': None, 'max_score': 100}],
+                      student_id='s1')
+        dm.set_grading(GradingPolicy([GradingScale('plus', [('F', 0, 0.0), ('A+', 97, 4.3)])], default='plus'))
+        result = simulate(dm, samples=20, seed=0, workers=1)
+        assert result.gpa_bins[-1] == 4.3
+        assert result.student_gpa_distribution('s1')[-1] == 1.0
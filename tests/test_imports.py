@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Seconds allowed for importing the modules themselves, on top of NumPy
+IMPORT_BUDGET = 0.2
+
+HEAVY_MODULES = ('pandas', 'matplotlib', 'tkinter')
+
+_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+import numpy
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _import_in_subprocess(*modules):
+    script = _SCRIPT.format(src=SRC_DIR, modules=modules, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+class TestImports:
+    """Guards on what importing the core modules pulls in"""
+    
+    def test_core_modules_skip_heavy_dependencies(self):
+        """Test computing grades does not import pandas, matplotlib or Tk"""
+        result = _import_in_subprocess('grade_calculator', 'data_manager', 'metrics_cache')
+        assert result['loaded'] == []
+    
+    def test_visualizer_defers_matplotlib(self):
+        """Test the visualizer loads matplotlib only when it draws"""
+        result = _import_in_subprocess('visualizer')
+        assert result['loaded'] == []
+    
+    def test_import_time_budget(self):
+        """Test the core modules import within the startup budget"""
+        result = _import_in_subprocess('grade_calculator', 'data_manager', 'metrics_cache', 'visualizer')
+        assert result['elapsed'] < IMPORT_BUDGET
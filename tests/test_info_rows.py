@@ -0,0 +1,81 @@
+import pytest
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import info_rows
+from data_manager import DataManager
+from info_rows import InfoRowModel
+
+
+class TestInfoRowModel:
+    """Test cases for the information panel's formatted-row model"""
+    
+    @pytest.fixture
+    def dm(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('MATH 2060', [], student_id='s2')
+        dm.add_course('MATH 2060', [
+            {'name': 'Quiz', 'weight': 10, 'score': 9, 'max_score': 10}
+        ], student_id='s1')
+        return dm
+    
+    def test_course_row(self, dm):
+        """Test one row per course segment with counts and grade"""
+        model = InfoRowModel(dm)
+        assert len(model) == 3
+        assert [model.course_row(index) for index in range(3)] == [
+            ('CPSC 3720  [s1]', '2 assignments', '1 graded', '85.00%'),
+            ('MATH 2060  [s2]', '0 assignments', '0 graded', '0.00%'),
+            ('MATH 2060  [s1]', '1 assignments', '1 graded', '90.00%'),
+        ]
+    
+    def test_lines_follow_open_courses(self, dm):
+        """Test windows of lines include the assignments of opened courses"""
+        model = InfoRowModel(dm)
+        assert model.line_count() == 3
+        assert model.lines(0, 10) == [(0, None), (1, None), (2, None)]
+        
+        model.open_courses.update({0, 1, 2})
+        assert model.line_count() == 6
+        assert model.lines(0, 10) == [(0, None), (0, 0), (0, 1), (1, None), (2, None), (2, 0)]
+        assert model.lines(2, 3) == [(0, 1), (1, None), (2, None)]
+        assert model.lines(5, 3) == [(2, 0)]
+        
+        model.open_courses.discard(0)
+        assert model.lines(1, 2) == [(1, None), (2, None)]
+    
+    def test_assignment_rows(self, dm):
+        """Test assignment rows format graded and ungraded scores"""
+        model = InfoRowModel(dm)
+        assert model.assignment_rows(0) == [
+            ('Midterm', ' 30.0%', ' 85.0/100.0', ' 85.0%'),
+            ('Final', ' 70.0%', 'Not yet graded', ''),
+        ]
+        assert model.assignment_rows(1) == []
+        assert model.assignment_rows(0) is model.assignment_rows(0)
+    
+    def test_assignment_cache_is_bounded(self, dm, monkeypatch):
+        """Test only the most recently opened courses keep formatted rows"""
+        monkeypatch.setattr(info_rows, 'ASSIGNMENT_CACHE_SIZE', 2)
+        model = InfoRowModel(dm)
+        first = model.assignment_rows(0)
+        model.assignment_rows(2)
+        model.assignment_rows(0)
+        model.assignment_rows(1)
+        assert model.assignment_rows(0) is first
+        assert sorted(model._assignment_rows) == [0, 1]
+    
+    def test_summary_and_staleness(self, dm):
+        """Test the summary totals and that edits mark the model stale"""
+        model = InfoRowModel(dm)
+        assert model.summary() == {'courses': 3, 'assignments': 3, 'graded': 2,
+                                   'gpa': pytest.approx(dm.metrics.gpa())}
+        assert model.is_current()
+        dm.update_score('CPSC 3720', 'Final', 90, student_id='s1')
+        assert not model.is_current()
@@ -0,0 +1,123 @@
+import pytest
+import json
+import logging
+import os
+import tempfile
+import threading
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import instrumentation
+from instrumentation import AggregateSink, JsonLinesSink, LogSink
+from data_manager import DataManager
+
+
+class TestInstrumentation:
+    """Test cases for timing spans, counters and sinks"""
+    
+    @pytest.fixture
+    def events(self):
+        """Register a sink recording raw events for the duration of a test"""
+        recorded = []
+        instrumentation.add_sink(recorded.append)
+        yield recorded
+        instrumentation.remove_sink(recorded.append)
+    
+    def test_disabled_without_sinks(self):
+        """Test spans and counters are no-ops when nothing listens"""
+        assert not instrumentation.enabled()
+        with instrumentation.span('work'):
+            instrumentation.count('items', 3)
+    
+    def test_nested_spans_record_parent(self, events):
+        """Test spans report duration, fields and the enclosing span"""
+        with instrumentation.span('outer', file='grades.csv'):
+            with instrumentation.span('inner'):
+                instrumentation.count('rows', 5)
+        
+        assert [(e['type'], e['name'], e['parent']) for e in events] == [
+            ('count', 'rows', 'inner'), ('span', 'inner', 'outer'), ('span', 'outer', None)]
+        assert events[2]['fields'] == {'file': 'grades.csv'}
+        assert events[2]['duration'] >= events[1]['duration'] >= 0
+    
+    def test_span_recorded_on_exception(self, events):
+        """Test a span still closes when its block raises"""
+        with pytest.raises(ValueError):
+            with instrumentation.span('failing'):
+                raise ValueError()
+        assert events[0]['name'] == 'failing'
+        
+        with instrumentation.span('after'):
+            pass
+        assert events[1]['parent'] is None
+    
+    def test_aggregate_sink(self):
+        """Test the aggregate sink totals spans and counters across threads"""
+        sink = instrumentation.add_sink(AggregateSink())
+        try:
+            def work():
+                for _ in range(50):
+                    with instrumentation.span('step'):
+                        instrumentation.count('items', 2)
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            instrumentation.remove_sink(sink)
+        
+        assert sink.spans['step']['calls'] == 200
+        assert sink.counters['items'] == 400
+        assert sink.spans['step']['min'] <= sink.spans['step']['max']
+        assert 'step' in sink.format_table()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'timings.json')
+            sink.dump(filename)
+            with open(filename) as f:
+                assert json.load(f)['counters'] == {'items': 400}
+        
+        sink.reset()
+        assert sink.spans == {} and sink.counters == {}
+    
+    def test_log_and_json_lines_sinks(self, caplog):
+        """Test structured log lines and JSON lines output"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'events.jsonl')
+            sinks = [instrumentation.add_sink(LogSink()), instrumentation.add_sink(JsonLinesSink(filename))]
+            try:
+                with caplog.at_level(logging.INFO, logger='gradevision.instrumentation'):
+                    with instrumentation.span('save', file='out.csv'):
+                        pass
+            finally:
+                for sink in sinks:
+                    instrumentation.remove_sink(sink)
+            
+            assert caplog.messages[0].startswith('span=save duration_ms=')
+            assert caplog.messages[0].endswith('file=out.csv')
+            with open(filename) as f:
+                event = json.loads(f.readline())
+            assert event['name'] == 'save' and event['fields'] == {'file': 'out.csv'}
+    
+    def test_data_manager_load_is_instrumented(self, events):
+        """Test CSV loading reports parse and build spans and the rows parsed"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+            f.write('CPSC 3720,Final,70,,100\n')
+        
+        try:
+            dm = DataManager()
+            dm.load_from_csv(temp_filename)
+            dm.metrics.course_grades()
+        finally:
+            os.remove(temp_filename)
+        
+        names = [(e['name'], e['parent']) for e in events]
+        assert ('parse_csv', 'load_from_csv') in names
+        assert ('build_store', 'load_from_csv') in names
+        assert ('grade_totals', None) in names
+        assert [e['value'] for e in events if e['name'] == 'rows_parsed'] == [2]
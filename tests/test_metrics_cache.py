@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_manager import DataManager
+from grade_calculator import GradeCalculator
+
+
+class TestMetricsCache:
+    """Test cases for the per-DataManager derived metrics cache"""
+    
+    @pytest.fixture
+    def dm(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 80, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 4660', [
+            {'name': 'Project', 'weight': 100, 'score': 45, 'max_score': 50}
+        ], student_id='s2')
+        return dm
+    
+    def test_metrics_match_calculator(self, dm):
+        """Test cached metrics agree with GradeCalculator"""
+        assert dm.metrics.course_grades().tolist() == GradeCalculator.calculate_course_grades_batch(dm).tolist()
+        assert dm.metrics.course_points().tolist() == [3.3, 4.0]
+        assert dm.metrics.gpa() == GradeCalculator.calculate_gpa(list(dm.courses))
+        assert dm.metrics.student_gpas() == {'s1': 3.3, 's2': 4.0}
+        percentages = dm.metrics.assignment_percentages()
+        assert percentages[0] == 80.0 and np.isnan(percentages[1]) and percentages[2] == 90.0
+    
+    def test_repeated_access_hits_cache(self, dm):
+        """Test identical requests are served from the cache"""
+        first = dm.metrics.assignment_percentages()
+        second = dm.metrics.assignment_percentages()
+        assert first is second
+        assert dm.metrics.hits == 1
+        assert dm.metrics.misses == 1
+    
+    def test_edit_invalidates_entries(self, dm):
+        """Test edits bump the version and refresh dependent metrics"""
+        dm.metrics.assignment_percentages()
+        version = dm.version
+        
+        dm.update_score('CPSC 3720', 'Final', 100, student_id='s1')
+        assert dm.version > version
+        assert dm.metrics.assignment_percentages()[1] == 100.0
+        assert dm.metrics.course_grades()[0] == pytest.approx(90.0)
+        assert dm.metrics.student_gpas()['s1'] == 4.0
+    
+    def test_add_course_invalidates_entries(self, dm):
+        """Test structural changes refresh every metric"""
+        dm.metrics.course_grades()
+        dm.add_course('SOCI 1000', [{'name': 'Essay', 'weight': 100, 'score': 60, 'max_score': 100}])
+        assert len(dm.metrics.course_grades()) == 3
+        assert len(dm.metrics.assignment_percentages()) == 4
+    
+    def test_grade_distribution_counts(self, dm):
+        """Test distribution counts are cached and follow edits"""
+        counts = dm.metrics.grade_distribution_counts()
+        assert counts.tolist() == [0, 0, 0, 1, 1]
+        assert dm.metrics.grade_distribution_counts() is counts
+        
+        dm.update_score('CPSC 3720', 'Final', 100, student_id='s1')
+        assert dm.metrics.grade_distribution_counts().tolist() == [0, 0, 0, 1, 2]
@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+import os
+import tempfile
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_manager import DataManager
+from snapshot import open_snapshot, write_snapshot
+
+
+class TestSnapshot:
+    """Test cases for memory-mapped GradeVision snapshots"""
+    
+    @pytest.fixture
+    def data_manager(self):
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100},
+            {'name': 'Final', 'weight': 70, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 4660', [
+            {'name': 'Project', 'weight': 100, 'score': 42, 'max_score': 50}
+        ], student_id='s2')
+        return dm
+    
+    @pytest.fixture
+    def snapshot_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield os.path.join(temp_dir, 'grades.gvs')
+    
+    def test_roundtrip(self, data_manager, snapshot_file):
+        """Test that a snapshot reopens with identical data"""
+        data_manager.save_snapshot(snapshot_file)
+        
+        dm = DataManager()
+        assert dm.load(snapshot_file) is True
+        assert list(dm.courses) == list(data_manager.courses)
+        assert dm.get_course_students() == ['s1', 's2']
+    
+    def test_columns_are_memory_mapped(self, data_manager, snapshot_file):
+        """Test that opened columns are memmaps aligned for direct access"""
+        write_snapshot(data_manager.store, snapshot_file)
+        store = open_snapshot(snapshot_file)
+        
+        assert isinstance(store.weight, np.memmap)
+        assert isinstance(store.assignment_codes, np.memmap)
+        assert store.assignment_codes.dtype == np.int32
+        assert store.weight.offset % 64 == 0
+    
+    def test_copy_on_write_leaves_file_unchanged(self, data_manager, snapshot_file):
+        """Test that edits to an opened store do not write through"""
+        write_snapshot(data_manager.store, snapshot_file)
+        store = open_snapshot(snapshot_file)
+        store.score[0] = 1.0
+        
+        reopened = open_snapshot(snapshot_file)
+        assert reopened.score[0] == 85.0
+    
+    def test_save_over_opened_snapshot(self, data_manager, snapshot_file):
+        """Test saving an edited snapshot over the file it was opened from"""
+        data_manager.save_snapshot(snapshot_file)
+        dm = DataManager()
+        dm.open_snapshot(snapshot_file)
+        dm.update_score('CPSC 3720', 'Final', 90, student_id='s1')
+        dm.save_snapshot(snapshot_file)
+        
+        # The open store still reads its original mapping
+        assert dm.store.score.tolist() == [85.0, 90.0, 42.0]
+        reopened = DataManager()
+        reopened.open_snapshot(snapshot_file)
+        assert list(reopened.courses) == list(dm.courses)
+        assert os.listdir(os.path.dirname(snapshot_file)) == ['grades.gvs']
+    
+    def test_empty_store(self, snapshot_file):
+        """Test snapshots of an empty store"""
+        DataManager().save_snapshot(snapshot_file)
+        dm = DataManager()
+        dm.open_snapshot(snapshot_file)
+        assert dm.courses == []
+        assert dm.store.num_rows == 0
+    
+    def test_rejects_other_files(self, snapshot_file):
+        """Test that non-snapshot files raise ValueError"""
+        with open(snapshot_file, 'wb') as f:
+            f.write(b'course,assignment,weight,score,max_score\n')
+        with pytest.raises(ValueError):
+            open_snapshot(snapshot_file)
+    
+    def test_open_nonexistent(self):
+        """Test opening a missing snapshot"""
+        assert DataManager().open_snapshot('nonexistent_file.gvs') is False
@@ -2,12 +2,15 @@ import pytest
 import sys
 import os
 import tempfile
+import queue
+import threading
 import tkinter as tk
+import numpy as np
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 sys.path.insert(0, os.path.dirname(__file__))
-from ui_menu import GradeVisionUI
+from ui_menu import GradeVisionUI, ppm_bytes
 from data_manager import DataManager
 
 
@@ -27,6 +30,27 @@ class TestGradeVisionUI:
         """Create a UI instance for testing"""
         return GradeVisionUI(root)
     
+    def info_content(self, ui):
+        """Summary text plus the rows of every course, opening each one"""
+        lines = [ui.info_text.get(1.0, tk.END)]
+        if ui.info_rows is not None:
+            # A window tall enough for every line
+            ui.info_height = 1000000
+            ui._show_info_window()
+            for index in range(len(ui.info_rows)):
+                ui.info_tree.focus(str(index))
+                ui._on_info_open(None)
+        for item in ui.info_tree.get_children():
+            for row in (item,) + ui.info_tree.get_children(item):
+                lines.append(' '.join([ui.info_tree.item(row, 'text')] +
+                                      [str(value) for value in ui.info_tree.item(row, 'values')]))
+        return '\n'.join(lines)
+    
+    def test_ppm_bytes(self):
+        """Test rendered RGBA buffers become binary PPM without alpha"""
+        rgba = np.array([[[255, 0, 0, 255], [0, 128, 255, 0]]], dtype=np.uint8)
+        assert ppm_bytes(rgba) == b'P6 2 1 255 ' + bytes([255, 0, 0, 0, 128, 255])
+    
     def test_ui_initialization(self, root):
         """Test UI initialization"""
         ui = GradeVisionUI(root)
@@ -71,7 +95,7 @@ class TestGradeVisionUI:
         ui.data_manager.add_course('CPSC 3720', assignments)
         
         ui.update_info_display()
-        content = ui.info_text.get(1.0, tk.END)
+        content = self.info_content(ui)
         assert "CPSC 3720" in content
         assert "Midterm" in content
         assert "Final" in content
@@ -85,7 +109,7 @@ class TestGradeVisionUI:
         ui.data_manager.add_course('CPSC 3720', assignments)
         
         ui.update_info_display()
-        content = ui.info_text.get(1.0, tk.END)
+        content = self.info_content(ui)
         assert "CPSC 3720" in content
         assert "Not yet graded" in content
     
@@ -170,11 +194,43 @@ class TestGradeVisionUI:
         ui.data_manager.add_course('CPSC 4660', assignments2)
         
         ui.update_info_display()
-        content = ui.info_text.get(1.0, tk.END)
+        content = self.info_content(ui)
         assert "CPSC 3720" in content
         assert "CPSC 4660" in content
         assert "Overall GPA" in content
     
+    def test_info_tree_holds_only_visible_lines(self, ui):
+        """Test the tree holds one window of lines and assignments only once opened"""
+        for i in range(100):
+            ui.data_manager.add_course(f'COURSE {i}', [
+                {'name': f'HW{j}', 'weight': 20, 'score': 80, 'max_score': 100} for j in range(3)])
+        
+        ui.update_info_display()
+        ui.info_height = 10
+        ui._show_info_window()
+        assert ui.info_tree.get_children() == tuple(str(i) for i in range(10))
+        assert ui.info_tree.get_children('0') == ('0/',)
+        ui._scroll_info('scroll', 1, 'pages')
+        assert ui.info_tree.get_children()[0] == '10'
+        ui._scroll_info('moveto', 1.0)
+        assert ui.info_tree.get_children()[-1] == '99'
+        
+        ui._scroll_info('moveto', 0.0)
+        ui.info_tree.focus('1')
+        ui._on_info_open(None)
+        assert [ui.info_tree.item(row, 'text') for row in ui.info_tree.get_children('1')] == ['HW0', 'HW1', 'HW2']
+        assert ui.info_tree.get_children() == tuple(str(i) for i in range(7))
+        
+        # A window starting inside the opened course repeats its row
+        ui._scroll_info('scroll', 3, 'units')
+        assert ui.info_tree.get_children()[:2] == ('1', '2')
+        assert [ui.info_tree.item(row, 'text') for row in ui.info_tree.get_children('1')] == ['HW1', 'HW2']
+        
+        ui.info_tree.focus('1')
+        ui._on_info_close(None)
+        assert ui.info_rows.open_courses == set()
+        assert ui.info_tree.get_children()[0] == '3'
+    
     def test_visualization_types(self, ui):
         """Test different visualization types"""
         assignments = [{'name': 'Test', 'weight': 100, 'score': 80, 'max_score': 100}]
@@ -197,3 +253,166 @@ class TestGradeVisionUI:
                 # which we can't easily test without mocking
                 pass
 
+    
+    def test_load_worker_posts_result(self):
+        """Test the background loader hands a loaded DataManager to the queue"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+        
+        try:
+            load_queue = queue.Queue()
+            GradeVisionUI._load_worker(temp_filename, load_queue, threading.Event())
+            messages = []
+            while not load_queue.empty():
+                messages.append(load_queue.get_nowait())
+            
+            assert messages[0][0] == 'progress'
+            kind, data_manager, file_path, success = messages[-1]
+            assert kind == 'done' and success is True
+            assert file_path == temp_filename
+            assert data_manager.get_course_names() == ['CPSC 3720']
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_load_worker_merges_files_onto_base(self):
+        """Test the background loader merges extra files without touching the base"""
+        base = DataManager()
+        base.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 30, 'score': 85, 'max_score': 100}])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_filename = os.path.join(temp_dir, 'more.csv')
+            with open(temp_filename, 'w') as f:
+                f.write('course,assignment,weight,score,max_score\n')
+                f.write('MATH 2060,Quiz,10,9,10\n')
+            
+            load_queue = queue.Queue()
+            GradeVisionUI._load_worker([temp_filename], load_queue, threading.Event(), many=True, base=base)
+            messages = []
+            while not load_queue.empty():
+                messages.append(load_queue.get_nowait())
+        
+        kind, data_manager, file_path, success = messages[-1]
+        assert kind == 'done' and success is True
+        assert file_path == [temp_filename]
+        assert data_manager.get_course_names() == ['CPSC 3720', 'MATH 2060']
+        assert base.get_course_names() == ['CPSC 3720']
+    
+    def test_load_worker_cancelled(self):
+        """Test a cancelled background load reports cancellation"""
+        load_queue = queue.Queue()
+        cancel = threading.Event()
+        cancel.set()
+        GradeVisionUI._load_worker('nonexistent_file.csv', load_queue, cancel)
+        assert load_queue.get_nowait() == ('cancelled',)
+    
+    def test_start_load_swaps_data_when_done(self, ui, monkeypatch):
+        """Test the current data stays in place until the queue is polled"""
+        import ui_menu
+        monkeypatch.setattr(ui_menu.messagebox, 'showinfo', lambda *args: None)
+        ui.data_manager.add_course('Existing', [{'name': 'Final', 'weight': 100, 'score': 90, 'max_score': 100}])
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+        
+        try:
+            ui.start_load(temp_filename)
+            ui.load_thread.join()
+            assert ui.data_manager.get_course_names() == ['Existing']
+            
+            ui._poll_load_queue()
+            assert ui.load_thread is None
+            assert ui.current_file == temp_filename
+            assert ui.data_manager.get_course_names() == ['CPSC 3720']
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+    
+    def test_grading_scales_kept_across_loads(self, ui, monkeypatch):
+        """Test loaded grading scales apply to data loaded afterwards"""
+        import ui_menu
+        monkeypatch.setattr(ui_menu.messagebox, 'showinfo', lambda *args: None)
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            scales_filename = f.name
+            f.write('{"scales": {"pf": {"bands": [{"letter": "F", "min": 0, "points": 0},'
+                    ' {"letter": "P", "min": 50, "points": 4}]}},'
+                    ' "courses": {"CPSC 3720": {"scale": "pf"}}}')
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,55,100\n')
+        
+        try:
+            assert ui.apply_grading(scales_filename)
+            ui.start_load(temp_filename)
+            ui.load_thread.join()
+            ui._poll_load_queue()
+            assert ui.data_manager.grading.scale_for('CPSC 3720').name == 'pf'
+            assert ui.data_manager.metrics.gpa() == 4.0
+        finally:
+            os.remove(scales_filename)
+            os.remove(temp_filename)
+    
+    def test_repeated_visualization_uses_render_cache(self, ui):
+        """Test a re-clicked chart is served from the render cache"""
+        ui.data_manager.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        
+        ui.show_visualization('course_grades')
+        key, future = ui.pending_render
+        future.result()
+        ui._poll_render(key, future)
+        assert ui.render_cache.get(key) is not None
+        
+        ui.show_visualization('course_grades')
+        assert ui.pending_render is None
+    
+    def test_render_of_replaced_data_is_not_cached(self, ui):
+        """Test a chart finished after a new file was loaded is not cached"""
+        ui.data_manager.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        old = ui.data_manager
+        
+        ui.show_visualization('course_grades')
+        key, future = ui.pending_render
+        future.result()
+        ui.data_manager = DataManager()
+        ui.data_manager.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 40, 'max_score': 100}])
+        assert ui.data_manager.version == old.version
+        ui._poll_render(key, future, old)
+        assert ui.render_cache.get(key) is None
+        
+        ui.show_visualization('course_grades')
+        assert ui.pending_render is not None
+        assert ui.pending_render[0] != key
+    
+    def test_timing_panel_shows_recorded_spans(self, ui, monkeypatch):
+        """Test timings are off until switched on, then loading fills the Timings tab"""
+        import ui_menu
+        monkeypatch.setattr(ui_menu.messagebox, 'showinfo', lambda *args: None)
+        assert not ui.record_timings.get()
+        assert 'off' in ui.timing_text.get(1.0, tk.END)
+        ui.record_timings.set(True)
+        ui.toggle_timings()
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            temp_filename = f.name
+            f.write('course,assignment,weight,score,max_score\n')
+            f.write('CPSC 3720,Midterm,30,85,100\n')
+        
+        try:
+            ui.start_load(temp_filename)
+            ui.load_thread.join()
+            ui._poll_load_queue()
+            text = ui.timing_text.get(1.0, tk.END)
+            assert 'load_from_csv' in text
+            assert 'rows_parsed' in text
+            
+            ui.record_timings.set(False)
+            ui.toggle_timings()
+            assert 'off' in ui.timing_text.get(1.0, tk.END)
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
@@ -5,7 +5,7 @@ import matplotlib.pyplot as plt
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-from visualizer import GradeVisualizer
+from visualizer import GradeVisualizer, LiveCourseGradesChart, RenderCache
 from data_manager import DataManager
 from grade_calculator import GradeCalculator
 
@@ -71,6 +71,23 @@ class TestGradeVisualizer:
         assert result is not None
         plt.close(fig)
     
+    def test_plot_course_grades_cohort_means(self):
+        """Test cohort data gets one bar per course at the mean of its students"""
+        dm = DataManager()
+        dm.add_course('A', [{'name': 'Final', 'weight': 100, 'score': 80, 'max_score': 100}], student_id='s1')
+        dm.add_course('A', [{'name': 'Final', 'weight': 100, 'score': 60, 'max_score': 100}], student_id='s2')
+        dm.add_course('B', [{'name': 'Final', 'weight': 100, 'score': 90, 'max_score': 100}], student_id='s1')
+        
+        fig = plt.Figure(figsize=(10, 6))
+        GradeVisualizer.plot_course_grades(dm, fig)
+        ax = fig.axes[0]
+        bars = ax.patches
+        assert [bar.get_height() for bar in bars] == [70.0, 90.0]
+        assert len({bar.get_x() for bar in bars}) == 2
+        assert [label.get_text() for label in ax.get_xticklabels()] == ['A', 'B']
+        assert 'Mean' in ax.get_title()
+        plt.close(fig)
+    
     def test_plot_assignment_performance_single_course(self):
         """Test plotting assignment performance for single course"""
         dm = DataManager()
@@ -113,6 +130,28 @@ class TestGradeVisualizer:
         assert result is not None
         plt.close(fig)
     
+    def test_plot_assignment_performance_density_mode(self):
+        """Test large assignment sets are drawn as density strips, not bars"""
+        dm = DataManager()
+        assignments = [{'name': f'HW{i}', 'weight': 1, 'score': 50 + i % 50, 'max_score': 100}
+                       for i in range(GradeVisualizer.ASSIGNMENT_DETAIL_LIMIT)]
+        dm.add_course('CPSC 3720', assignments)
+        dm.add_course('MATH 2060', assignments[:10])
+        
+        fig = GradeVisualizer.plot_assignment_performance(dm)
+        ax = fig.axes[0]
+        assert len(ax.images) == 1
+        assert len(ax.patches) == 0
+        assert len(ax.texts) == 0
+        assert ax.images[0].get_array().shape == (GradeVisualizer.DENSITY_BINS, 2)
+        assert [t.get_text() for t in ax.get_xticklabels()] == ['CPSC 3720', 'MATH 2060']
+        plt.close(fig)
+        
+        # A single course under the limit keeps the detailed bars
+        fig = GradeVisualizer.plot_assignment_performance(dm, 'MATH 2060')
+        assert len(fig.axes[0].patches) == 10
+        plt.close(fig)
+    
     def test_plot_assignment_performance_with_none_scores(self):
         """Test plotting assignment performance with ungraded assignments"""
         dm = DataManager()
@@ -156,6 +195,15 @@ class TestGradeVisualizer:
         assert result is not None
         plt.close(fig)
     
+    def test_plot_grade_distribution_from_counts(self):
+        """Test drawing the distribution from precomputed bin counts"""
+        fig = plt.Figure(figsize=(10, 6))
+        GradeVisualizer.plot_grade_distribution(None, fig, counts=[3, 0, 5, 2, 7])
+        ax = fig.axes[0]
+        assert [p.get_height() for p in ax.patches] == [3, 0, 5, 2, 7]
+        assert [t.get_text() for t in ax.texts] == ['3', '5', '2', '7']
+        plt.close(fig)
+    
     def test_plot_weight_distribution_single_course(self):
         """Test plotting weight distribution for single course"""
         dm = DataManager()
@@ -216,6 +264,41 @@ class TestGradeVisualizer:
         assert result is not None
         plt.close(fig)
     
+    def test_plot_grade_simulation(self):
+        """Test the simulated outlook per course and for the overall GPA"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 90, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': None, 'max_score': 100}
+        ], student_id='s1')
+        dm.add_course('CPSC 3720', [
+            {'name': 'Midterm', 'weight': 50, 'score': 60, 'max_score': 100},
+            {'name': 'Final', 'weight': 50, 'score': 70, 'max_score': 100}
+        ], student_id='s2')
+        
+        fig = plt.Figure(figsize=(8, 6))
+        GradeVisualizer.plot('grade_simulation', dm, 'CPSC 3720', fig)
+        ax = fig.axes[0]
+        assert len(ax.patches) == 10
+        # s1's Final is drawn from s2's 70%, so s1 ends at 80% (B+) and s2 at 65% (C+)
+        heights = [round(patch.get_height()) for patch in ax.patches]
+        assert heights == [0, 0, 0, 0, 50, 0, 0, 50, 0, 0]
+        
+        GradeVisualizer.plot_grade_simulation(dm, figure=fig)
+        assert 'Overall GPA' in fig.axes[0].get_title()
+        assert len(fig.axes[0].patches) > 0
+        plt.close(fig)
+    
+    def test_plot_grade_simulation_nothing_graded(self):
+        """Test the outlook shows a message when nothing is graded yet"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Final', 'weight': 100, 'score': None, 'max_score': 100}])
+        
+        fig = plt.Figure(figsize=(8, 6))
+        GradeVisualizer.plot_grade_simulation(dm, figure=fig)
+        assert fig.axes[0].texts[0].get_text() == 'No graded scores to sample from'
+        plt.close(fig)
+    
     def test_plot_gpa_trend_empty(self):
         """Test plotting GPA trend with empty data"""
         dm = DataManager()
@@ -279,3 +362,85 @@ class TestGradeVisualizer:
         # If we get here without exceptions, all plots work
         assert True
 
+    
+    def test_plot_dispatch_unknown_type(self):
+        """Test that an unknown chart type is rejected"""
+        with pytest.raises(ValueError):
+            GradeVisualizer.plot('pie', DataManager(), figure=plt.Figure())
+    
+    def test_render_rgba(self):
+        """Test off-screen rendering returns an RGBA pixel buffer"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        
+        rgba = GradeVisualizer.render_rgba(dm, 'course_grades', figsize=(4, 3), dpi=50)
+        assert rgba.shape == (150, 200, 4)
+        assert rgba.dtype.name == 'uint8'
+    
+    def test_render_rgba_in_worker_thread(self):
+        """Test rendering from a background thread"""
+        from concurrent.futures import ThreadPoolExecutor
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(GradeVisualizer.render_rgba, dm, 'weight_distribution', 'CPSC 3720', (4, 3), 50)
+            assert future.result().shape == (150, 200, 4)
+    
+    def test_render_cache_lru(self):
+        """Test the render cache evicts the least recently used entry"""
+        cache = RenderCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert len(cache) == 2
+    
+    def test_live_chart_updates_changed_bars_only(self):
+        """Test a live chart refresh touches only the bars whose grade changed"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        dm.add_course('MATH 2060', [{'name': 'Final', 'weight': 100, 'score': 92, 'max_score': 100}])
+        chart = LiveCourseGradesChart(plt.Figure())
+        chart.refresh(dm)
+        bars = list(chart.bars)
+        
+        dm.update_score('CPSC 3720', 'Midterm', 40)
+        changed = chart.refresh(dm)
+        assert changed == [bars[0], chart.labels[0]]
+        assert chart.bars == bars
+        assert bars[0].get_height() == 40
+        assert chart.labels[0].get_text() == '40.0%'
+        assert chart.refresh(dm) == []
+    
+    def test_live_chart_rebuilds_on_new_course(self):
+        """Test adding a course rebuilds the live chart"""
+        dm = DataManager()
+        dm.add_course('CPSC 3720', [{'name': 'Midterm', 'weight': 50, 'score': 85, 'max_score': 100}])
+        chart = LiveCourseGradesChart(plt.Figure())
+        chart.refresh(dm)
+        
+        dm.add_course('MATH 2060', [{'name': 'Final', 'weight': 100, 'score': 92, 'max_score': 100}])
+        chart.refresh(dm)
+        assert len(chart.bars) == 2
+        assert chart.course_names == ['CPSC 3720', 'MATH 2060']
+    
+    def test_live_chart_blit_matches_full_draw(self):
+        """Test blitting changed columns gives the same pixels as a rebuild"""
+        import numpy as np
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        dm = DataManager()
+        for i in range(4):
+            dm.add_course(f'C{i}', [{'name': 'Final', 'weight': 100, 'score': 95 - i * 8, 'max_score': 100}])
+        chart = LiveCourseGradesChart(plt.Figure(figsize=(4, 3), dpi=50))
+        canvas = FigureCanvasAgg(chart.figure)
+        chart.refresh(dm, canvas)
+        
+        dm.update_score('C1', 'Final', 40)
+        chart.refresh(dm, canvas)
+        fresh = LiveCourseGradesChart(plt.Figure(figsize=(4, 3), dpi=50))
+        fresh_canvas = FigureCanvasAgg(fresh.figure)
+        fresh.refresh(dm, fresh_canvas)
+        assert np.array_equal(np.asarray(canvas.buffer_rgba()), np.asarray(fresh_canvas.buffer_rgba()))
@@ -1,15 +1,40 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import queue
 import sys
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.append('./src')
+import instrumentation
 from data_manager import DataManager
-from grade_calculator import GradeCalculator
-from visualizer import GradeVisualizer
+from grading_scales import load_policy
+from info_rows import InfoRowModel
+from instrumentation import AggregateSink
+from visualizer import COURSE_PLOT_TYPES, GradeVisualizer, RenderCache
+
+# How often the Tk loop checks the background loader for progress (ms)
+LOAD_POLL_MS = 100
+# How often the Tk loop checks for a finished chart render (ms)
+RENDER_POLL_MS = 30
+# Charts are rendered at the visualization tab's size at this resolution
+VIZ_DPI = 100
+# Lines drawn in the information tree until its height is known, and the
+# height assumed for one of its rows (px)
+INFO_WINDOW = 30
+INFO_ROW_HEIGHT = 20
+# Course picker: names listed per query, and the pause in typing (ms)
+# before the list is filtered again
+COURSE_MATCH_LIMIT = 50
+COURSE_SEARCH_DEBOUNCE_MS = 150
+
+def ppm_bytes(rgba):
+    """Binary PPM image of an (height, width, 4) RGBA buffer, dropping alpha;
+    Tk's PhotoImage reads it natively"""
+    height, width = rgba.shape[:2]
+    return f'P6 {width} {height} 255 '.encode('ascii') + rgba[:, :, :3].tobytes()
 
 class GradeVisionUI:
     def __init__(self, root):
@@ -21,6 +46,24 @@ class GradeVisionUI:
         self.data_manager = DataManager()
         self.current_file = None
         
+        # Background file loading state
+        self.load_thread = None
+        self.load_queue = None
+        self.cancel_event = None
+        
+        # Charts render on a worker thread into a cache of RGBA buffers
+        self.render_executor = ThreadPoolExecutor(max_workers=1)
+        self.render_cache = RenderCache()
+        self.pending_render = None
+        self.viz_canvas = None
+        self.viz_photo = None
+        
+        # Spans and counters from loading, computing and drawing are
+        # aggregated for the Timings tab once recording is switched on
+        self.timings = AggregateSink()
+        self.record_timings = tk.BooleanVar(master=self.root, value=False)
+        self.root.bind('<Destroy>', self._on_destroy, add='+')
+        
         # Create UI elements
         self.create_menu_bar()
         self.create_toolbar()
@@ -34,6 +77,9 @@ class GradeVisionUI:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Load CSV File", command=self.load_file)
+        file_menu.add_command(label="Load CSV Folder...", command=self.load_folder)
+        file_menu.add_command(label="Add CSV Files...", command=self.add_files)
+        file_menu.add_command(label="Load Grading Scales...", command=self.load_grading)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
@@ -45,6 +91,16 @@ class GradeVisionUI:
         view_menu.add_command(label="Grade Distribution", command=lambda: self.show_visualization('grade_distribution'))
         view_menu.add_command(label="Weight Distribution", command=lambda: self.show_visualization('weight_distribution'))
         view_menu.add_command(label="GPA Overview", command=lambda: self.show_visualization('gpa'))
+        view_menu.add_command(label="Grade Outlook (Simulated)", command=lambda: self.show_visualization('grade_simulation'))
+        
+        # Diagnostics menu
+        diagnostics_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Diagnostics", menu=diagnostics_menu)
+        diagnostics_menu.add_checkbutton(label="Record Timings", variable=self.record_timings,
+                                         command=self.toggle_timings)
+        diagnostics_menu.add_command(label="Show Timings", command=lambda: self.notebook.select(2))
+        diagnostics_menu.add_command(label="Save Timings...", command=self.save_timings)
+        diagnostics_menu.add_command(label="Reset Timings", command=self.reset_timings)
         
     def create_toolbar(self):
         toolbar = tk.Frame(self.root, bg='#e0e0e0', relief=tk.RAISED, bd=2)
@@ -82,6 +138,12 @@ class GradeVisionUI:
                                      font=('Arial', 9), fg='#666')
         self.status_label.pack(side=tk.RIGHT, padx=10)
         
+        # Load progress widgets, only shown while a file is loading
+        self.cancel_button = tk.Button(toolbar, text="Cancel", command=self.cancel_load,
+                                       bg='red', fg='white', font=('Arial', 9),
+                                       padx=8, pady=2, cursor='hand2')
+        self.progress_bar = ttk.Progressbar(toolbar, length=160, mode='determinate', maximum=100)
+        
     def create_main_area(self):
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -97,19 +159,52 @@ class GradeVisionUI:
         self.notebook.add(self.viz_frame, text="📊 Visualizations")
         self.create_viz_tab()
         
-    def create_info_tab(self):
-        # Scrollable text area
-        scrollbar = tk.Scrollbar(self.info_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Timings tab
+        self.timing_frame = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(self.timing_frame, text="⏱ Timings")
+        self.create_timing_tab()
         
-        self.info_text = tk.Text(self.info_frame, wrap=tk.WORD, yscrollcommand=scrollbar.set,
+    def create_info_tab(self):
+        # Summary above a tree of courses. The tree only ever holds the
+        # lines that fit in it; the scrollbar moves that window over the
+        # InfoRowModel's lines, so large datasets never block the Tk loop
+        self.info_text = tk.Text(self.info_frame, height=7, wrap=tk.WORD,
                                  font=('Consolas', 10), bg='#fafafa', padx=10, pady=10)
-        self.info_text.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.info_text.yview)
+        self.info_text.pack(fill=tk.X)
+        
+        tree_frame = tk.Frame(self.info_frame, bg='white')
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.info_scrollbar = tk.Scrollbar(tree_frame, command=self._scroll_info)
+        self.info_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.info_tree = ttk.Treeview(tree_frame, columns=('weight', 'score', 'grade'))
+        self.info_tree.heading('#0', text="Course / Assignment", anchor=tk.W)
+        self.info_tree.heading('weight', text="Weight", anchor=tk.W)
+        self.info_tree.heading('score', text="Score", anchor=tk.W)
+        self.info_tree.heading('grade', text="Grade", anchor=tk.W)
+        self.info_tree.column('#0', width=420)
+        self.info_tree.tag_configure('course', foreground='blue')
+        self.info_tree.pack(fill=tk.BOTH, expand=True)
+        self.info_tree.bind('<<TreeviewOpen>>', self._on_info_open)
+        self.info_tree.bind('<<TreeviewClose>>', self._on_info_close)
+        self.info_tree.bind('<Configure>', self._on_info_resize)
+        self.info_tree.bind('<MouseWheel>', lambda event: self._scroll_info('scroll', -event.delta // 120, 'units'))
+        self.info_tree.bind('<Button-4>', lambda event: self._scroll_info('scroll', -1, 'units'))
+        self.info_tree.bind('<Button-5>', lambda event: self._scroll_info('scroll', 1, 'units'))
+        
+        self.info_rows = None
+        self.info_first = 0
+        self.info_height = INFO_WINDOW
         
         # Initial message
         self.update_info_display()
         
+    def create_timing_tab(self):
+        self.timing_text = tk.Text(self.timing_frame, wrap=tk.NONE, font=('Consolas', 10),
+                                   bg='#fafafa', padx=10, pady=10)
+        self.timing_text.pack(fill=tk.BOTH, expand=True)
+        self.update_timing_display()
+        
     def create_viz_tab(self):
         self.viz_canvas_frame = tk.Frame(self.viz_frame, bg='white')
         self.viz_canvas_frame.pack(fill=tk.BOTH, expand=True)
@@ -122,129 +217,374 @@ class GradeVisionUI:
         
     def load_file(self):
         file_path = filedialog.askopenfilename(
-            title="Select CSV File",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            title="Select Grade File",
+            filetypes=[("CSV files", "*.csv"),
+                       ("GradeVision snapshot", "*.gvs"),
+                       ("GradeVision binary", "*.npz *.parquet *.feather"),
+                       ("All files", "*.*")]
         )
         
         if file_path:
-            try:
-                self.data_manager = DataManager()
-                success = self.data_manager.load_from_csv(file_path)
-                
-                if success:
-                    self.current_file = file_path
-                    self.status_label.config(text=f"Loaded: {os.path.basename(file_path)}", fg='green')
-                    self.update_info_display()
-                    messagebox.showinfo("Success", f"File loaded successfully!\n{len(self.data_manager.courses)} course(s) found.")
+            self.start_load(file_path)
+    
+    def load_folder(self):
+        folder = filedialog.askdirectory(title="Select Folder of Grade Files")
+        if folder:
+            self.start_load(folder, many=True)
+    
+    def add_files(self):
+        """Merge more CSV files into the courses already loaded"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Grade Files to Add",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if file_paths:
+            self.start_load(list(file_paths), many=True, base=self.data_manager)
+    
+    def load_grading(self):
+        """Grade courses on the scales and credit hours of a JSON file"""
+        file_path = filedialog.askopenfilename(
+            title="Select Grading Scales",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            self.apply_grading(file_path)
+    
+    def apply_grading(self, file_path):
+        try:
+            policy = load_policy(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Error loading grading scales:\n{e}")
+            return False
+        self.data_manager.set_grading(policy)
+        if self.data_manager.courses:
+            self.update_info_display()
+        messagebox.showinfo("Success", f"Grading scales loaded: {len(policy.scales)} scale(s), "
+                                       f"{len(policy.course_scales)} course(s) assigned.")
+        return True
+    
+    def start_load(self, file_path, many=False, base=None):
+        """Load a file on a worker thread; the current data stays usable until
+        the new DataManager is handed back through the queue.
+        
+        With ``many``, ``file_path`` is a folder, glob or list of CSV files
+        merged by DataManager.load_many (on top of ``base``, if given).
+        """
+        if self.load_thread is not None:
+            messagebox.showwarning("Busy", "A file is already loading.")
+            return
+        
+        self.load_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.load_thread = threading.Thread(
+            target=self._load_worker,
+            args=(file_path, self.load_queue, self.cancel_event, many, base),
+            daemon=True
+        )
+        
+        if isinstance(file_path, (list, tuple)):
+            description = f"{len(file_path)} files"
+        else:
+            description = os.path.basename(file_path)
+        self.progress_bar['value'] = 0
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        self.status_label.config(text=f"Loading {description}...", fg='#666')
+        
+        self.load_thread.start()
+        self.root.after(LOAD_POLL_MS, self._poll_load_queue)
+    
+    @staticmethod
+    def _load_worker(file_path, load_queue, cancel_event, many=False, base=None):
+        """Runs off the Tk thread: never touch widgets here, only the queue"""
+        try:
+            data_manager = DataManager()
+            progress = lambda rows, fraction: load_queue.put(('progress', rows, fraction))
+            if many:
+                # base is only read here, so the UI can keep showing it
+                success = data_manager.load_many(file_path, progress=progress,
+                                                 cancel=cancel_event, base=base)
+            else:
+                success = data_manager.load(file_path, progress=progress, cancel=cancel_event)
+            if cancel_event.is_set():
+                load_queue.put(('cancelled',))
+            else:
+                load_queue.put(('done', data_manager, file_path, success))
+        except Exception as e:
+            load_queue.put(('error', str(e)))
+    
+    def _poll_load_queue(self):
+        finished = False
+        try:
+            while True:
+                message = self.load_queue.get_nowait()
+                if message[0] == 'progress':
+                    _, rows, fraction = message
+                    self.progress_bar['value'] = fraction * 100
+                    self.status_label.config(text=f"Loading... {rows:,} rows")
                 else:
-                    messagebox.showerror("Error", "Failed to load file. Please check the file format.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error loading file:\n{str(e)}")
+                    finished = True
+                    self._finish_load(message)
+                    break
+        except queue.Empty:
+            pass
+        
+        if not finished:
+            self.root.after(LOAD_POLL_MS, self._poll_load_queue)
+    
+    def _finish_load(self, message):
+        self.load_thread = None
+        self.progress_bar.pack_forget()
+        self.cancel_button.pack_forget()
+        
+        loaded = message[0] == 'done' and message[3]
+        if loaded:
+            grading = self.data_manager.grading
+            _, self.data_manager, self.current_file, _ = message
+            # Grading scales apply to whatever data is loaded next
+            self.data_manager.set_grading(grading)
+            self.render_cache.clear()
+            with instrumentation.span('update_info_display'):
+                self.update_info_display()
+        self._restore_status()
+        self.update_timing_display()
+        
+        if loaded:
+            message = f"File loaded successfully!\n{len(self.data_manager.courses)} course(s) found."
+            if self.data_manager.merge_conflicts:
+                message += (f"\n{len(self.data_manager.merge_conflicts)} assignment(s) differed between "
+                            "files; the first file's values were kept.")
+            messagebox.showinfo("Success", message)
+        elif message[0] == 'done':
+            messagebox.showerror("Error", "Failed to load file. Please check the file format.")
+        elif message[0] == 'error':
+            messagebox.showerror("Error", f"Error loading file:\n{message[1]}")
+    
+    def _restore_status(self):
+        if isinstance(self.current_file, (list, tuple)):
+            self.status_label.config(text=f"Loaded: {len(self.current_file)} files", fg='green')
+        elif self.current_file:
+            self.status_label.config(text=f"Loaded: {os.path.basename(self.current_file)}", fg='green')
+        else:
+            self.status_label.config(text="No file loaded", fg='#666')
+    
+    def cancel_load(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
     
     def update_info_display(self):
         self.info_text.delete(1.0, tk.END)
+        self.info_tree.delete(*self.info_tree.get_children())
+        self.info_first = 0
         
         if not self.data_manager.courses:
+            self.info_rows = None
+            self.info_scrollbar.set(0, 1)
             self.info_text.insert(tk.END, "No data loaded. Please load a CSV file.\n\n")
             self.info_text.insert(tk.END, "Expected CSV format:\n")
             self.info_text.insert(tk.END, "course,assignment,weight,score,max_score\n")
-            self.info_text.insert(tk.END, "CPSC 3720,Midterm 1,25,85,100\n")
+            self.info_text.insert(tk.END, "CPSC 3720,Midterm 1,25,85,100\n\n")
+            self.info_text.insert(tk.END, "Multi-student files may add a student_id column.\n")
             return
         
-        # Display course information
+        self.info_rows = InfoRowModel(self.data_manager)
+        summary = self.info_rows.summary()
         self.info_text.insert(tk.END, "=" * 60 + "\n")
-        self.info_text.insert(tk.END, "GRADE INFORMATION\n")
-        self.info_text.insert(tk.END, "=" * 60 + "\n\n")
-        
-        for course in self.data_manager.courses:
-            course_name = course['name']
-            assignments = course['assignments']
-            grade = GradeCalculator.calculate_course_grade(assignments)
-            
-            self.info_text.insert(tk.END, f"Course: {course_name}\n", 'heading')
-            self.info_text.insert(tk.END, f"Current Grade: {grade:.2f}%\n\n")
-            
-            self.info_text.insert(tk.END, "Assignments:\n", 'subheading')
-            self.info_text.insert(tk.END, "-" * 60 + "\n")
-            
-            for assignment in assignments:
-                if assignment['score'] is not None:
-                    percentage = GradeVisualizer.calculate_percentage(assignment['score'], assignment['max_score'])
-                    self.info_text.insert(tk.END, 
-                        f"  {assignment['name']:30s} "
-                        f"Weight: {assignment['weight']:5.1f}%  "
-                        f"Score: {assignment['score']:5.1f}/{assignment['max_score']:5.1f}  "
-                        f"({percentage:5.1f}%)\n")
-                else:
-                    self.info_text.insert(tk.END, 
-                        f"  {assignment['name']:30s} "
-                        f"Weight: {assignment['weight']:5.1f}%  "
-                        f"Score: Not yet graded\n")
-            
-            self.info_text.insert(tk.END, "\n")
-        
-        # Overall GPA
-        gpa = GradeCalculator.calculate_gpa(self.data_manager.courses)
-        self.info_text.insert(tk.END, "=" * 60 + "\n")
-        self.info_text.insert(tk.END, f"Overall GPA: {gpa:.2f}\n", 'gpa')
+        self.info_text.insert(tk.END, "GRADE INFORMATION\n", 'heading')
+        self.info_text.insert(tk.END, f"{summary['courses']:,} course(s), {summary['assignments']:,} "
+                                      f"assignment(s), {summary['graded']:,} graded\n")
+        self.info_text.insert(tk.END, f"Overall GPA: {summary['gpa']:.2f}\n", 'gpa')
         self.info_text.insert(tk.END, "=" * 60 + "\n")
+        self.info_text.insert(tk.END, "Open a course below to list its assignments.\n")
         
         # Configure text tags for styling
         self.info_text.tag_config('heading', font=('Consolas', 12, 'bold'), foreground='blue')
-        self.info_text.tag_config('subheading', font=('Consolas', 10, 'bold'), foreground='purple')
         self.info_text.tag_config('gpa', font=('Consolas', 12, 'bold'), foreground='green')
+        
+        self._show_info_window()
+    
+    def _show_info_window(self):
+        """Replace the tree's items with the lines of the current window"""
+        focus = self.info_tree.focus()
+        self.info_tree.delete(*self.info_tree.get_children())
+        model = self.info_rows
+        if model is None:
+            return
+        total = model.line_count()
+        # Closing a course can leave the window past the last line
+        self.info_first = max(0, min(self.info_first, total - self.info_height))
+        for course, assignment in model.lines(self.info_first, self.info_height):
+            item = str(course)
+            if not self.info_tree.exists(item):
+                # A window starting inside a course's assignments repeats its row
+                label, count, graded, grade = model.course_row(course)
+                self.info_tree.insert('', tk.END, iid=item, text=label, values=(count, graded, grade),
+                                      tags=('course',), open=course in model.open_courses)
+                if course not in model.open_courses and model.assignment_count(course):
+                    # Placeholder child, so the course can be opened before it is filled
+                    self.info_tree.insert(item, tk.END, iid=f'{item}/', text="…")
+            if assignment is not None:
+                name, weight, score, percentage = model.assignment_rows(course)[assignment]
+                self.info_tree.insert(item, tk.END, text=name, values=(weight, score, percentage))
+        if focus and self.info_tree.exists(focus):
+            self.info_tree.focus(focus)
+        self.info_scrollbar.set(self.info_first / total, min(1.0, (self.info_first + self.info_height) / total))
+    
+    def _scroll_info(self, action, amount, unit=None):
+        """Scrollbar command: move the window by units or pages, or to a fraction"""
+        if self.info_rows is None:
+            return
+        total = self.info_rows.line_count()
+        if action == 'moveto':
+            first = int(float(amount) * total)
+        else:
+            first = self.info_first + int(amount) * (self.info_height if unit == 'pages' else 1)
+        first = max(0, min(first, total - self.info_height))
+        if first != self.info_first:
+            self.info_first = first
+            self._show_info_window()
+    
+    def _on_info_resize(self, event):
+        height = max(1, event.height // INFO_ROW_HEIGHT - 1)
+        if height != self.info_height:
+            self.info_height = height
+            self._show_info_window()
+    
+    def _on_info_open(self, event):
+        item = self.info_tree.focus()
+        if self.info_rows is not None and self.info_tree.exists(f'{item}/'):
+            self.info_rows.open_courses.add(int(item))
+            self._show_info_window()
+    
+    def _on_info_close(self, event):
+        item = self.info_tree.focus()
+        if self.info_rows is not None and item.isdigit():
+            self.info_rows.open_courses.discard(int(item))
+            self._show_info_window()
     
     def show_visualization(self, viz_type):
         if not self.data_manager.courses:
             messagebox.showwarning("No Data", "Please load a CSV file first.")
             return
         
-        # Clear previous visualization
-        plt.close('all')
-        for widget in self.viz_canvas_frame.winfo_children():
-            widget.destroy()
+        # Ask for course selection if multiple courses
+        course_name = None
+        if viz_type in COURSE_PLOT_TYPES and len(self.data_manager.courses) > 1:
+            course_name = self.select_course()
+            if course_name == "CANCEL":
+                return
+        
+        width, height = self._viz_size()
+        # version only counts changes within one DataManager, and every
+        # freshly loaded file starts from the same count
+        key = (viz_type, course_name, id(self.data_manager), self.data_manager.version, width, height)
+        rgba = self.render_cache.get(key)
+        if rgba is not None:
+            self._show_rendered(rgba)
+            return
+        
+        # Render off the Tk thread; the result is picked up by _poll_render
+        self.status_label.config(text="Rendering...", fg='#666')
+        future = self.render_executor.submit(
+            GradeVisualizer.render_rgba, self.data_manager, viz_type, course_name,
+            (width / VIZ_DPI, height / VIZ_DPI), VIZ_DPI
+        )
+        self.pending_render = (key, future)
+        self.root.after(RENDER_POLL_MS, self._poll_render, key, future, self.data_manager)
+    
+    def _poll_render(self, key, future, data_manager=None):
+        if not future.done():
+            self.root.after(RENDER_POLL_MS, self._poll_render, key, future, data_manager)
+            return
         
-        # Create figure
-        fig = plt.Figure(figsize=(10, 6), dpi=100)
+        # A newer request may have replaced this one; still cache the result
+        latest = self.pending_render == (key, future)
+        if latest:
+            self.pending_render = None
+            self._restore_status()
         
         try:
-            if viz_type == 'course_grades':
-                GradeVisualizer.plot_course_grades(self.data_manager, fig)
-            elif viz_type == 'assignment_performance':
-                course_name = None
-                if len(self.data_manager.courses) > 1:
-                    course_name = self.select_course()
-                    if course_name == "CANCEL":
-                        return
-                
-                GradeVisualizer.plot_assignment_performance(self.data_manager, course_name, fig)
-            elif viz_type == 'grade_distribution':
-                GradeVisualizer.plot_grade_distribution(self.data_manager, fig)
-            elif viz_type == 'weight_distribution':
-                # Ask for course selection if multiple courses
-                course_name = None
-                if len(self.data_manager.courses) > 1:
-                    course_name = self.select_course()
-                    if course_name == "CANCEL":
-                        return
-
-                GradeVisualizer.plot_weight_distribution(self.data_manager, course_name, fig)
-            elif viz_type == 'gpa':
-                GradeVisualizer.plot_gpa_trend(self.data_manager, fig)
-            
-            # Embed in tkinter
-            canvas = FigureCanvasTkAgg(fig, self.viz_canvas_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            # Switch to visualization tab
-            self.notebook.select(1)
-            
+            rgba = future.result()
         except Exception as e:
-            messagebox.showerror("Error", f"Error creating visualization:\n{str(e)}")
+            if latest:
+                messagebox.showerror("Error", f"Error creating visualization:\n{str(e)}")
+            return
+        
+        if data_manager is not None and data_manager is not self.data_manager:
+            # Rendered from data replaced by a load since; never cache it
+            return
+        self.render_cache.put(key, rgba)
+        if latest:
+            self._show_rendered(rgba)
+    
+    def _viz_size(self):
+        width = self.viz_canvas_frame.winfo_width()
+        height = self.viz_canvas_frame.winfo_height()
+        if width < 100 or height < 100:
+            # Not laid out yet: fall back to the default 10x6 inch figure
+            return 10 * VIZ_DPI, 6 * VIZ_DPI
+        return width, height
+    
+    def _show_rendered(self, rgba):
+        """Copy a rendered RGBA buffer into the reusable chart canvas"""
+        height, width = rgba.shape[:2]
+        if self.viz_canvas is None:
+            for widget in self.viz_canvas_frame.winfo_children():
+                widget.destroy()
+            self.viz_canvas = tk.Canvas(self.viz_canvas_frame, bg='white', highlightthickness=0)
+            self.viz_canvas.pack(fill=tk.BOTH, expand=True)
+            self.viz_photo = tk.PhotoImage(master=self.viz_canvas, width=width, height=height)
+            self.viz_canvas.create_image(0, 0, image=self.viz_photo, anchor=tk.NW)
+        
+        self.viz_photo.configure(width=width, height=height)
+        with instrumentation.span('blit_to_screen'):
+            self.viz_photo.configure(data=ppm_bytes(rgba), format='PPM')
+        self.update_timing_display()
+        
+        # Switch to visualization tab
+        self.notebook.select(1)
+    
+    def update_timing_display(self):
+        self.timing_text.delete(1.0, tk.END)
+        if not self.record_timings.get():
+            self.timing_text.insert(tk.END, "Timing recording is off (Diagnostics > Record Timings).\n")
+            return
+        if not self.timings.spans and not self.timings.counters:
+            self.timing_text.insert(tk.END, "No timings recorded yet. Load a file or open a chart.\n")
+            return
+        self.timing_text.insert(tk.END, self.timings.format_table() + "\n")
+    
+    def toggle_timings(self):
+        if self.record_timings.get():
+            instrumentation.add_sink(self.timings)
+        else:
+            instrumentation.remove_sink(self.timings)
+        self.update_timing_display()
+    
+    def reset_timings(self):
+        self.timings.reset()
+        self.update_timing_display()
+    
+    def save_timings(self):
+        file_path = filedialog.asksaveasfilename(
+            title="Save Timings", defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            self.timings.dump(file_path)
+    
+    def _on_destroy(self, event):
+        # <Destroy> on the root also fires for every child widget
+        if event.widget is self.root:
+            instrumentation.remove_sink(self.timings)
     
     def select_course(self):
-        course_names = self.data_manager.get_course_names()
+        """Ask for a course; returns its name, None for all courses or "CANCEL".
+        
+        Typing filters the list through the data's prefix index, showing at
+        most COURSE_MATCH_LIMIT names once keystrokes pause.
+        """
+        index = self.data_manager.metrics.course_index()
         
         dialog = tk.Toplevel(self.root)
         dialog.title("Select Course")
@@ -253,25 +593,60 @@ class GradeVisionUI:
         dialog.grab_set()
         
         result = ["CANCEL"]
+        pending = [None]
         
         tk.Label(dialog, text="Select a course:", font=('Arial', 10, 'bold')).pack(pady=10)
         
+        query = tk.StringVar(master=dialog)
+        entry = tk.Entry(dialog, textvariable=query, font=('Arial', 10))
+        entry.pack(padx=20, fill=tk.X)
+        match_label = tk.Label(dialog, font=('Arial', 9), fg='#666')
+        match_label.pack(padx=20, anchor=tk.W)
+        
         listbox = tk.Listbox(dialog, font=('Arial', 10), height=6)
         listbox.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
         
-        for course_name in course_names:
-            listbox.insert(tk.END, course_name)
-        
-        def on_select():
+        def refresh():
+            pending[0] = None
+            names, total = index.matches(query.get(), COURSE_MATCH_LIMIT)
+            listbox.delete(0, tk.END)
+            if names:
+                listbox.insert(tk.END, *names)
+                listbox.selection_set(0)
+            match_label.config(text=f"Showing {len(names):,} of {total:,} course(s)")
+        
+        def on_type(*args):
+            if pending[0] is not None:
+                dialog.after_cancel(pending[0])
+            pending[0] = dialog.after(COURSE_SEARCH_DEBOUNCE_MS, refresh)
+        
+        def on_select(event=None):
+            if pending[0] is not None:
+                dialog.after_cancel(pending[0])
+                refresh()
             selection = listbox.curselection()
             if selection:
-                result[0] = course_names[selection[0]]
+                result[0] = listbox.get(selection[0])
             dialog.destroy()
         
         def on_all():
             result[0] = None
             dialog.destroy()
         
+        def on_destroy(event):
+            if event.widget is dialog and pending[0] is not None:
+                dialog.after_cancel(pending[0])
+                pending[0] = None
+        
+        dialog.bind('<Destroy>', on_destroy)
+        query.trace_add('write', on_type)
+        entry.bind('<Return>', on_select)
+        entry.bind('<Down>', lambda event: listbox.focus_set())
+        listbox.bind('<Double-Button-1>', on_select)
+        listbox.bind('<Return>', on_select)
+        refresh()
+        entry.focus_set()
+        
         button_frame = tk.Frame(dialog)
         button_frame.pack(pady=10)
         